@@ -117,7 +117,7 @@ class SecureExecTool(Tool):
         )
 
         # Analyze command first (for logging)
-        analysis = analyze_command(command)
+        analysis = analyze_command(command, self.config.max_command_chars)
         logger.info(f"Exec request: {command[:50]}... (safe_bin={analysis.is_safe_bin}, resolved={analysis.resolved_path})")
 
         # Execute with security checks
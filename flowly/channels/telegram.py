@@ -13,7 +13,7 @@ from flowly.bus.events import InboundMessage, OutboundMessage
 from flowly.bus.queue import MessageBus
 from flowly.channels.base import BaseChannel
 from flowly.config.schema import TelegramConfig
-from flowly.pairing import upsert_pairing_request, read_allow_from_store
+from flowly.pairing import upsert_pairing_request, read_allow_from_set
 
 
 # Supported image MIME types for Telegram photos
@@ -544,28 +544,17 @@ class TelegramChannel(BaseChannel):
         config_allow = self.config.allow_from or []
 
         # Check pairing store allow_from
-        store_allow = read_allow_from_store("telegram")
-
-        # Combine both lists
-        all_allowed = set(config_allow) | set(store_allow)
+        store_allow = read_allow_from_set("telegram")
 
         # For pairing/allowlist mode, empty list means no one is allowed yet
-        if not all_allowed:
+        if not config_allow and not store_allow:
             return False
 
-        # Check if user_id or username matches
-        if user_id in all_allowed:
-            return True
-        if username and username in all_allowed:
-            return True
-        if username and f"@{username}" in all_allowed:
-            return True
-
-        # Check with telegram: prefix
-        if f"telegram:{user_id}" in all_allowed:
-            return True
-
-        return False
+        # user_id, username, @username, or user_id with telegram: prefix
+        candidates = [user_id, f"telegram:{user_id}"]
+        if username:
+            candidates += [username, f"@{username}"]
+        return any(c in store_allow or c in config_allow for c in candidates)
 
     async def _handle_pairing(self, chat_id: int, user) -> bool:
         """
@@ -1176,20 +1176,7 @@ def gateway(
     cron = CronService(cron_store_path)
 
     # Build compaction config from settings
-    from flowly.compaction.types import CompactionConfig, MemoryFlushConfig
-    compaction_cfg = config.agents.defaults.compaction
-    compaction_config = CompactionConfig(
-        mode=compaction_cfg.mode,
-        reserve_tokens_floor=compaction_cfg.reserve_tokens_floor,
-        max_history_share=compaction_cfg.max_history_share,
-        context_window=compaction_cfg.context_window,
-        memory_flush=MemoryFlushConfig(
-            enabled=compaction_cfg.memory_flush.enabled,
-            soft_threshold_tokens=compaction_cfg.memory_flush.soft_threshold_tokens,
-            prompt=compaction_cfg.memory_flush.prompt,
-            system_prompt=compaction_cfg.memory_flush.system_prompt,
-        ),
-    )
+    compaction_config = config.agents.defaults.compaction
 
     # Build exec config
     from flowly.exec.types import ExecConfig
@@ -1200,6 +1187,7 @@ def gateway(
         ask=exec_cfg.ask,
         timeout_seconds=exec_cfg.timeout_seconds,
         max_output_chars=exec_cfg.max_output_chars,
+        max_command_chars=exec_cfg.max_command_chars,
         approval_timeout_seconds=exec_cfg.approval_timeout_seconds,
     )
 
@@ -1587,20 +1575,7 @@ def agent(
     cron = CronService(cron_store_path)
 
     # Build compaction config
-    from flowly.compaction.types import CompactionConfig, MemoryFlushConfig
-    compaction_cfg = config.agents.defaults.compaction
-    compaction_config = CompactionConfig(
-        mode=compaction_cfg.mode,
-        reserve_tokens_floor=compaction_cfg.reserve_tokens_floor,
-        max_history_share=compaction_cfg.max_history_share,
-        context_window=compaction_cfg.context_window,
-        memory_flush=MemoryFlushConfig(
-            enabled=compaction_cfg.memory_flush.enabled,
-            soft_threshold_tokens=compaction_cfg.memory_flush.soft_threshold_tokens,
-            prompt=compaction_cfg.memory_flush.prompt,
-            system_prompt=compaction_cfg.memory_flush.system_prompt,
-        ),
-    )
+    compaction_config = config.agents.defaults.compaction
 
     # Build exec config
     from flowly.exec.types import ExecConfig
@@ -1611,6 +1586,7 @@ def agent(
         ask=exec_cfg.ask,
         timeout_seconds=exec_cfg.timeout_seconds,
         max_output_chars=exec_cfg.max_output_chars,
+        max_command_chars=exec_cfg.max_command_chars,
         approval_timeout_seconds=exec_cfg.approval_timeout_seconds,
     )
 
@@ -1,5 +1,6 @@
 """Message pruning and chunking utilities."""
 
+from collections import deque
 from typing import Any
 
 from flowly.compaction.estimator import estimate_messages_tokens, estimate_message_tokens
@@ -189,28 +190,32 @@ def prune_history_for_context_share(
             - budget_tokens: Token budget
     """
     budget_tokens = max(1, int(max_context_tokens * max_history_share))
-    kept_messages = list(messages)
+    # Deque so dropping the oldest chunk is O(1) per message instead of
+    # rebuilding the kept list on every iteration.
+    kept: deque[dict[str, Any]] = deque(messages)
     all_dropped_messages: list[dict[str, Any]] = []
     dropped_chunks = 0
     dropped_messages_count = 0
     dropped_tokens = 0
 
-    normalized_parts = normalize_parts(parts, len(kept_messages))
+    normalized_parts = normalize_parts(parts, len(kept))
 
-    while kept_messages and estimate_messages_tokens(kept_messages) > budget_tokens:
-        chunks = split_messages_by_token_share(kept_messages, normalized_parts)
+    while kept and estimate_messages_tokens(kept) > budget_tokens:
+        chunks = split_messages_by_token_share(kept, normalized_parts)
         if len(chunks) <= 1:
             break
 
         # Drop oldest chunk
-        dropped, *rest = chunks
+        dropped = chunks[0]
         dropped_chunks += 1
         dropped_messages_count += len(dropped)
         dropped_tokens += estimate_messages_tokens(dropped)
         all_dropped_messages.extend(dropped)
 
-        # Flatten remaining chunks
-        kept_messages = [msg for chunk in rest for msg in chunk]
+        for _ in range(len(dropped)):
+            kept.popleft()
+
+    kept_messages = list(kept)
 
     return {
         "messages": kept_messages,
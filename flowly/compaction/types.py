@@ -1,45 +1,9 @@
 """Types for compaction system."""
 
-from dataclasses import dataclass, field
-from typing import Literal
+from dataclasses import dataclass
 
-
-@dataclass
-class MemoryFlushConfig:
-    """Configuration for pre-compaction memory flush."""
-
-    enabled: bool = True
-    soft_threshold_tokens: int = 4000
-    prompt: str = (
-        "Pre-compaction memory flush. "
-        "Store durable memories now (use memory/YYYY-MM-DD.md). "
-        "If nothing to store, reply with NO_REPLY."
-    )
-    system_prompt: str = (
-        "Pre-compaction memory flush turn. "
-        "The session is near auto-compaction; capture durable memories to disk. "
-        "You may reply, but usually NO_REPLY is correct."
-    )
-
-
-@dataclass
-class CompactionConfig:
-    """Configuration for compaction."""
-
-    # Mode: "default" (simple) or "safeguard" (robust with pruning)
-    mode: Literal["default", "safeguard"] = "safeguard"
-
-    # Reserve tokens for output + prompts (floor)
-    reserve_tokens_floor: int = 20_000
-
-    # Max share of context window for history (safeguard mode)
-    max_history_share: float = 0.5
-
-    # Context window size (model-specific, will be auto-detected)
-    context_window: int = 128_000
-
-    # Memory flush settings
-    memory_flush: MemoryFlushConfig = field(default_factory=MemoryFlushConfig)
+# Compaction settings are defined once, as config sections, and re-exported here
+from flowly.config.schema import CompactionConfig, MemoryFlushConfig  # noqa: F401
 
 
 @dataclass
@@ -1,6 +1,15 @@
 """Configuration module for flowly."""
 
+from typing import Any
+
 from flowly.config.loader import load_config, get_config_path
-from flowly.config.schema import Config
 
 __all__ = ["Config", "load_config", "get_config_path"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolve the schema lazily; importing it builds the pydantic models.
+    if name == "Config":
+        from flowly.config.schema import Config
+        return Config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
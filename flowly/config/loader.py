@@ -1,11 +1,14 @@
 """Configuration loading utilities."""
 
-import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from flowly.config.schema import Config
+import orjson
+
+if TYPE_CHECKING:
+    from flowly.config.schema import Config
 
 
 def get_config_path() -> Path:
@@ -19,7 +22,7 @@ def get_data_dir() -> Path:
     return get_data_path()
 
 
-def load_config(config_path: Path | None = None) -> Config:
+def load_config(config_path: Path | None = None) -> "Config":
     """
     Load configuration from file or create default.
     
@@ -29,21 +32,36 @@ def load_config(config_path: Path | None = None) -> Config:
     Returns:
         Loaded configuration object.
     """
+    # Imported here so path helpers like get_data_dir() don't pull in pydantic
+    from flowly.config.schema import Config
+
     path = config_path or get_config_path()
     
     if path.exists():
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-            return Config.model_validate(convert_keys(data))
-        except (json.JSONDecodeError, ValueError) as e:
+            st = path.stat()
+            data = _read_config_data(path, st.st_mtime_ns, st.st_size)
+            return Config.model_validate(data)
+        except (orjson.JSONDecodeError, ValueError) as e:
             print(f"Warning: Failed to load config from {path}: {e}")
             print("Using default configuration.")
     
     return Config()
 
 
-def save_config(config: Config, config_path: Path | None = None) -> None:
+@lru_cache(maxsize=4)
+def _read_config_data(path: Path, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a config file and convert its keys to snake_case.
+
+    Keyed on the file's mtime and size so an edited or re-saved file is
+    parsed again. Callers must not mutate the returned data; validation
+    builds a fresh Config from it each time.
+    """
+    return convert_keys(orjson.loads(path.read_bytes()))
+
+
+def save_config(config: "Config", config_path: Path | None = None) -> None:
     """
     Save configuration to file.
     
@@ -58,8 +76,8 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
     data = config.model_dump()
     data = convert_to_camel(data)
     
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    _read_config_data.cache_clear()
 
     # Restrict permissions: owner read/write only (config contains API keys)
     try:
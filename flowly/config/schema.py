@@ -1,12 +1,38 @@
 """Configuration schema using Pydantic."""
 
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Literal
-from pydantic import BaseModel, Field, field_validator
-from pydantic_settings import BaseSettings
+from typing import Any, Literal
 
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
-class MemoryFlushConfig(BaseModel):
+
+# Shared by every section and the root Config. Unknown keys are ignored so a
+# config written by a newer version still loads; section instances passed to
+# a parent (e.g. Config(gateway=GatewayConfig(...))) are kept, not re-validated.
+_MODEL_CONFIG = ConfigDict(
+    extra="ignore",
+    validate_default=False,
+    revalidate_instances="never",
+    defer_build=True,
+)
+
+
+class ConfigModel(BaseModel):
+    """Base for config sections.
+
+    Core schemas are built on first validation instead of at import, so
+    modules that only import a section for type hints don't pay for it.
+    Leaf sections that are plain bags of strings are stdlib dataclasses
+    instead: pydantic still validates them as fields, but creating one
+    with defaults is a plain __init__.
+    """
+    model_config = _MODEL_CONFIG
+
+
+class MemoryFlushConfig(ConfigModel):
     """Pre-compaction memory flush configuration."""
     enabled: bool = True
     soft_threshold_tokens: int = 4000
@@ -21,7 +47,7 @@ class MemoryFlushConfig(BaseModel):
     )
 
 
-class CompactionConfig(BaseModel):
+class CompactionConfig(ConfigModel):
     """Context compaction configuration."""
     mode: Literal["default", "safeguard"] = "safeguard"
     reserve_tokens_floor: int = 20000
@@ -30,14 +56,14 @@ class CompactionConfig(BaseModel):
     memory_flush: MemoryFlushConfig = Field(default_factory=MemoryFlushConfig)
 
 
-class WhatsAppConfig(BaseModel):
+class WhatsAppConfig(ConfigModel):
     """WhatsApp channel configuration."""
     enabled: bool = False
     bridge_url: str = "ws://localhost:3001"
     allow_from: list[str] = Field(default_factory=list)  # Allowed phone numbers
 
 
-class TelegramConfig(BaseModel):
+class TelegramConfig(ConfigModel):
     """Telegram channel configuration."""
     enabled: bool = False
     token: str = ""  # Bot token from @BotFather
@@ -45,7 +71,7 @@ class TelegramConfig(BaseModel):
     dm_policy: Literal["open", "pairing", "allowlist"] = "pairing"  # DM access policy
 
 
-class DiscordConfig(BaseModel):
+class DiscordConfig(ConfigModel):
     """Discord channel configuration."""
     enabled: bool = False
     token: str = ""  # Bot token from Discord Developer Portal
@@ -54,25 +80,26 @@ class DiscordConfig(BaseModel):
     intents: int = 37377  # GUILDS + GUILD_MESSAGES + DIRECT_MESSAGES + MESSAGE_CONTENT
 
 
-class SlackDMConfig(BaseModel):
+@dataclass(slots=True)
+class SlackDMConfig:
     """Slack DM policy configuration."""
     enabled: bool = True
-    policy: str = "open"  # "open" or "allowlist"
-    allow_from: list[str] = Field(default_factory=list)  # Allowed Slack user IDs
+    policy: Literal["open", "allowlist"] = "open"
+    allow_from: list[str] = field(default_factory=list)  # Allowed Slack user IDs
 
 
-class SlackConfig(BaseModel):
+class SlackConfig(ConfigModel):
     """Slack channel configuration."""
     enabled: bool = False
-    mode: str = "socket"  # "socket" supported
+    mode: Literal["socket"] = "socket"  # only socket mode is supported
     bot_token: str = ""  # xoxb-...
     app_token: str = ""  # xapp-...
-    group_policy: str = "mention"  # "mention", "open", "allowlist"
+    group_policy: Literal["mention", "open", "allowlist"] = "mention"
     group_allow_from: list[str] = Field(default_factory=list)  # Allowed channel IDs if allowlist
     dm: SlackDMConfig = Field(default_factory=SlackDMConfig)
 
 
-class ChannelsConfig(BaseModel):
+class ChannelsConfig(ConfigModel):
     """Configuration for chat channels."""
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
@@ -80,7 +107,7 @@ class ChannelsConfig(BaseModel):
     slack: SlackConfig = Field(default_factory=SlackConfig)
 
 
-class AgentDefaults(BaseModel):
+class AgentDefaults(ConfigModel):
     """Default agent configuration."""
     workspace: str = "~/.flowly/workspace"
     model: str = "moonshotai/kimi-k2.5"
@@ -94,36 +121,38 @@ class AgentDefaults(BaseModel):
     compaction: CompactionConfig = Field(default_factory=CompactionConfig)
 
 
-class MultiAgentConfig(BaseModel):
+class MultiAgentConfig(ConfigModel):
     """Single agent configuration for multi-agent orchestration."""
     name: str = ""
     provider: str = "anthropic"  # "anthropic", "openai", "flowly"
     model: str = ""  # Short name ("sonnet", "opus") or full model ID
     working_directory: str = ""  # Default: ~/.flowly/agents/{id}/
     persona: str = ""
+    cache_enabled: bool = False  # Reuse the reply to an identical message for 10 minutes
 
 
-class MultiAgentTeamConfig(BaseModel):
+class MultiAgentTeamConfig(ConfigModel):
     """Team of agents for chain collaboration."""
     name: str = ""
     agents: list[str] = Field(default_factory=list)
     leader_agent: str = ""
 
 
-class AgentsConfig(BaseModel):
+class AgentsConfig(ConfigModel):
     """Agent configuration."""
     defaults: AgentDefaults = Field(default_factory=AgentDefaults)
     agents: dict[str, MultiAgentConfig] = Field(default_factory=dict)
     teams: dict[str, MultiAgentTeamConfig] = Field(default_factory=dict)
 
 
-class ProviderConfig(BaseModel):
+@dataclass(slots=True)
+class ProviderConfig:
     """LLM provider configuration."""
     api_key: str = ""
     api_base: str | None = None
 
 
-class ProvidersConfig(BaseModel):
+class ProvidersConfig(ConfigModel):
     """Configuration for LLM providers."""
     anthropic: ProviderConfig = Field(default_factory=ProviderConfig)
     openai: ProviderConfig = Field(default_factory=ProviderConfig)
@@ -135,7 +164,7 @@ class ProvidersConfig(BaseModel):
     xai: ProviderConfig = Field(default_factory=ProviderConfig)  # xAI Grok models
 
 
-class GatewayConfig(BaseModel):
+class GatewayConfig(ConfigModel):
     """Gateway/server configuration."""
     host: str = "127.0.0.1"
     port: int = 18790
@@ -148,24 +177,26 @@ class GatewayConfig(BaseModel):
         return v
 
 
-class WebSearchConfig(BaseModel):
+@dataclass(slots=True)
+class WebSearchConfig:
     """Web search tool configuration."""
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
 
 
-class WebToolsConfig(BaseModel):
+class WebToolsConfig(ConfigModel):
     """Web tools configuration."""
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
 
 
-class ExecToolConfig(BaseModel):
+class ExecToolConfig(ConfigModel):
     """Command execution tool configuration."""
     enabled: bool = False  # Disabled by default for security
     security: Literal["deny", "allowlist", "full"] = "deny"  # Security mode
     ask: Literal["off", "on-miss", "always"] = "on-miss"  # Approval mode
     timeout_seconds: int = 300  # 5 minutes default
     max_output_chars: int = 200000  # 200KB
+    max_command_chars: int = 8192  # Longer commands are rejected
     approval_timeout_seconds: int = 120  # 2 minutes to approve
 
     @field_validator("timeout_seconds")
@@ -176,13 +207,15 @@ class ExecToolConfig(BaseModel):
         return v
 
 
-class TrelloConfig(BaseModel):
+@dataclass(slots=True)
+class TrelloConfig:
     """Trello integration configuration."""
     api_key: str = ""  # Get at https://trello.com/app-key
     token: str = ""  # Generate from the same page
 
 
-class XConfig(BaseModel):
+@dataclass(slots=True)
+class XConfig:
     """X (Twitter) API configuration."""
     bearer_token: str = ""  # App-only Bearer Token (read operations)
     api_key: str = ""  # OAuth 1.0a Consumer Key (write operations)
@@ -191,14 +224,14 @@ class XConfig(BaseModel):
     access_token_secret: str = ""  # OAuth 1.0a Access Token Secret
 
 
-class VoiceWebhookSecurityConfig(BaseModel):
+class VoiceWebhookSecurityConfig(ConfigModel):
     """Voice webhook security configuration."""
     allowed_hosts: list[str] = Field(default_factory=list)
     trust_forwarding_headers: bool = False
     trusted_proxy_ips: list[str] = Field(default_factory=list)
 
 
-class VoiceLiveCallConfig(BaseModel):
+class VoiceLiveCallConfig(ConfigModel):
     """Live-call tool sandbox policy."""
     strict_tool_sandbox: bool = True
     allow_tools: list[str] = Field(
@@ -206,7 +239,7 @@ class VoiceLiveCallConfig(BaseModel):
     )
 
 
-class VoiceBridgeConfig(BaseModel):
+class VoiceBridgeConfig(ConfigModel):
     """Integrated voice plugin configuration for Twilio calls."""
     enabled: bool = False
     # Legacy bridge fallback API URL (optional, disabled by default)
@@ -241,27 +274,103 @@ class VoiceBridgeConfig(BaseModel):
     ngrok_authtoken: str = ""  # ngrok authtoken from https://dashboard.ngrok.com
 
 
-class IntegrationsConfig(BaseModel):
+class IntegrationsConfig(ConfigModel):
     """External integrations configuration."""
     trello: TrelloConfig = Field(default_factory=TrelloConfig)
     voice: VoiceBridgeConfig = Field(default_factory=VoiceBridgeConfig)
     x: XConfig = Field(default_factory=XConfig)
 
 
-class ToolsConfig(BaseModel):
+class ToolsConfig(ConfigModel):
     """Tools configuration."""
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
 
 
-class Config(BaseSettings):
-    """Root configuration for flowly."""
+# Providers consulted by Config.get_api_key(), highest priority first
+_API_KEY_PRIORITY = ("openrouter", "anthropic", "openai", "xai", "gemini", "zhipu", "vllm")
+
+# Providers whose API key selects the API base, with their default base URL
+_API_BASE_DEFAULTS: tuple[tuple[str, str | None], ...] = (
+    ("openrouter", "https://openrouter.ai/api/v1"),
+    ("xai", "https://api.x.ai/v1"),
+    ("zhipu", None),
+)
+
+
+# Environment overrides: FLOWLY_GATEWAY__PORT=9000 sets gateway.port
+_ENV_PREFIX = "FLOWLY_"
+_ENV_NESTED_DELIMITER = "__"
+
+
+def _env_overrides(fields: dict[str, Any]) -> dict[str, Any]:
+    """
+    Collect FLOWLY_* environment variables into a nested dict.
+
+    Names are case-insensitive and split on ``__``. Values that look like
+    JSON objects or arrays are decoded so list and dict fields can be set
+    from the environment; everything else is left for validation to coerce.
+    """
+    overrides: dict[str, Any] = {}
+    prefix_len = len(_ENV_PREFIX)
+    for name, value in os.environ.items():
+        if name[:prefix_len].upper() != _ENV_PREFIX:
+            continue
+        keys = name[prefix_len:].lower().split(_ENV_NESTED_DELIMITER)
+        if keys[0] not in fields or not all(keys):
+            continue
+
+        if value[:1] in ("{", "["):
+            try:
+                value = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                pass
+
+        target = overrides
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+            if not isinstance(target, dict):
+                break
+        else:
+            target[keys[-1]] = value
+    return overrides
+
+
+def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    """Recursively merge ``override`` into a copy of ``base``."""
+    merged = dict(base)
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = _deep_merge(current, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class Config(ConfigModel):
+    """
+    Root configuration for flowly.
+
+    FLOWLY_* environment variables fill in values not given explicitly;
+    ``__`` separates nested keys (e.g. FLOWLY_PROVIDERS__OPENROUTER__API_KEY).
+    """
+
     agents: AgentsConfig = Field(default_factory=AgentsConfig)
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     integrations: IntegrationsConfig = Field(default_factory=IntegrationsConfig)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _apply_env(cls, data: Any) -> Any:
+        # One pass over os.environ; explicit values win over the environment
+        if not isinstance(data, dict):
+            return data
+        overrides = _env_overrides(cls.model_fields)
+        return _deep_merge(overrides, data) if overrides else data
     
     @property
     def workspace_path(self) -> Path:
@@ -270,29 +379,17 @@ class Config(BaseSettings):
     
     def get_api_key(self) -> str | None:
         """Get API key in priority order: OpenRouter > Anthropic > OpenAI > xAI > Gemini > Zhipu > vLLM."""
-        return (
-            self.providers.openrouter.api_key or
-            self.providers.anthropic.api_key or
-            self.providers.openai.api_key or
-            self.providers.xai.api_key or
-            self.providers.gemini.api_key or
-            self.providers.zhipu.api_key or
-            self.providers.vllm.api_key or
-            None
-        )
+        for name in _API_KEY_PRIORITY:
+            api_key = getattr(self.providers, name).api_key
+            if api_key:
+                return api_key
+        return None
     
     def get_api_base(self) -> str | None:
         """Get API base URL if using OpenRouter, xAI, Zhipu or vLLM."""
-        if self.providers.openrouter.api_key:
-            return self.providers.openrouter.api_base or "https://openrouter.ai/api/v1"
-        if self.providers.xai.api_key:
-            return self.providers.xai.api_base or "https://api.x.ai/v1"
-        if self.providers.zhipu.api_key:
-            return self.providers.zhipu.api_base
-        if self.providers.vllm.api_base:
-            return self.providers.vllm.api_base
-        return None
-    
-    class Config:
-        env_prefix = "FLOWLY_"
-        env_nested_delimiter = "__"
+        for name, default_base in _API_BASE_DEFAULTS:
+            provider = getattr(self.providers, name)
+            if provider.api_key:
+                return provider.api_base or default_base
+        # vLLM is selected by its base URL alone; local servers need no key
+        return self.providers.vllm.api_base or None
@@ -5,7 +5,6 @@ import json
 import os
 import secrets
 import time
-import uuid
 from pathlib import Path
 from typing import Any, Callable, Coroutine, Literal
 
@@ -300,7 +299,7 @@ class CronService:
         now = _now_ms()
         
         job = CronJob(
-            id=str(uuid.uuid4())[:8],
+            id=secrets.token_hex(4),
             name=name,
             enabled=True,
             schedule=schedule,
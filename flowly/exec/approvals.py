@@ -1,14 +1,19 @@
 """Exec approval store and allowlist management."""
 
+import atexit
 import fnmatch
-import json
+import heapq
+import os
+import re
 import secrets
 import time
-from dataclasses import asdict, dataclass, field
+import weakref
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Awaitable
 
-from filelock import FileLock
+import orjson
 from loguru import logger
 
 from flowly.exec.types import (
@@ -23,7 +28,7 @@ from flowly.exec.types import (
 from flowly.exec.safety import analyze_command, DEFAULT_SAFE_BINS
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecApprovalsConfig:
     """Stored exec approvals configuration."""
     version: int = 1
@@ -33,8 +38,44 @@ class ExecApprovalsConfig:
     allowlist: list[AllowlistEntry] = field(default_factory=list)
 
 
+# Allowlist hits only refresh usage metadata; persist it at most this often
+_USAGE_FLUSH_INTERVAL_S = 30.0
+
+
+def _now_ms() -> int:
+    """Wall-clock time in integer milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+@lru_cache(maxsize=512)
+def _glob_regex(pattern: str) -> str:
+    """Translate an allowlist glob to regex source, expanding ~ once per pattern."""
+    # Expand home directory
+    if pattern.startswith("~"):
+        pattern = str(Path(pattern).expanduser())
+    return fnmatch.translate(os.path.normcase(pattern))
+
+
+# Stores whose pending usage updates are flushed at exit. Held weakly so a
+# store that is dropped can still be freed; one atexit hook serves them all.
+_live_stores: "weakref.WeakSet[ExecApprovalStore]" = weakref.WeakSet()
+
+
+def _flush_live_stores() -> None:
+    """Flush every store that is still alive (registered with atexit)."""
+    for store in list(_live_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.warning(f"Error saving exec approvals at exit: {e}")
+
+
+atexit.register(_flush_live_stores)
+
+
+@lru_cache(maxsize=1)
 def _get_approvals_path() -> Path:
-    """Get path to exec approvals file."""
+    """Get path to exec approvals file (resolved once per process)."""
     return Path.home() / ".flowly" / "credentials" / "exec-approvals.json"
 
 
@@ -51,7 +92,15 @@ class ExecApprovalStore:
     def __init__(self):
         self._config: ExecApprovalsConfig | None = None
         self._pending: dict[str, PendingApproval] = {}
+        # Min-heap of (expires_at, approval_id) so pruning only touches expired entries
+        self._expiry_heap: list[tuple[float, str]] = []
+        # Allowlist globs compiled into one alternation; rebuilt lazily
+        self._allowlist_re: re.Pattern[str] | None = None
+        self._allowlist_entries: list[AllowlistEntry] = []
+        self._usage_dirty = False
+        self._last_save = 0.0
         self._approval_callback: Callable[[PendingApproval], Awaitable[ExecApprovalDecision | None]] | None = None
+        _live_stores.add(self)
 
     def set_approval_callback(
         self,
@@ -69,24 +118,23 @@ class ExecApprovalStore:
             return self._config
 
         try:
-            with FileLock(path.with_suffix(".lock"), timeout=10):
-                data = json.loads(path.read_text(encoding="utf-8"))
-                allowlist = [
-                    AllowlistEntry(
-                        pattern=e.get("pattern", ""),
-                        last_used_at=e.get("last_used_at"),
-                        last_used_command=e.get("last_used_command"),
-                        last_resolved_path=e.get("last_resolved_path"),
-                    )
-                    for e in data.get("allowlist", [])
-                ]
-                self._config = ExecApprovalsConfig(
-                    version=data.get("version", 1),
-                    security=data.get("security", "deny"),
-                    ask=data.get("ask", "on-miss"),
-                    ask_fallback=data.get("ask_fallback", "deny"),
-                    allowlist=allowlist,
+            data = orjson.loads(path.read_bytes())
+            allowlist = [
+                AllowlistEntry(
+                    pattern=e.get("pattern", ""),
+                    last_used_at=e.get("last_used_at"),
+                    last_used_command=e.get("last_used_command"),
+                    last_resolved_path=e.get("last_resolved_path"),
                 )
+                for e in data.get("allowlist", [])
+            ]
+            self._config = ExecApprovalsConfig(
+                version=data.get("version", 1),
+                security=data.get("security", "deny"),
+                ask=data.get("ask", "on-miss"),
+                ask_fallback=data.get("ask_fallback", "deny"),
+                allowlist=allowlist,
+            )
         except Exception as e:
             logger.warning(f"Error loading exec approvals: {e}")
             self._config = ExecApprovalsConfig()
@@ -101,24 +149,28 @@ class ExecApprovalStore:
         path = _get_approvals_path()
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        data = {
-            "version": self._config.version,
-            "security": self._config.security,
-            "ask": self._config.ask,
-            "ask_fallback": self._config.ask_fallback,
-            "allowlist": [
-                {
-                    "pattern": e.pattern,
-                    "last_used_at": e.last_used_at,
-                    "last_used_command": e.last_used_command,
-                    "last_resolved_path": e.last_resolved_path,
-                }
-                for e in self._config.allowlist
-            ],
-        }
-
-        with FileLock(path.with_suffix(".lock"), timeout=10):
-            path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        # orjson serializes the (slotted) dataclasses field-for-field, which is
+        # exactly the on-disk layout, without building per-entry dicts
+        payload = orjson.dumps(
+            self._config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        )
+
+        # Atomic replace: readers never see a partially written file
+        tmp_path = path.with_suffix(f".{secrets.token_hex(4)}.tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        self._usage_dirty = False
+        self._last_save = time.monotonic()
+
+    def flush(self) -> None:
+        """Persist allowlist usage updates that have not been saved yet."""
+        if self._usage_dirty:
+            self.save()
 
     @property
     def config(self) -> ExecApprovalsConfig:
@@ -134,7 +186,7 @@ class ExecApprovalStore:
         # Check if pattern already exists
         for entry in config.allowlist:
             if entry.pattern == pattern:
-                entry.last_used_at = int(time.time() * 1000)
+                entry.last_used_at = _now_ms()
                 if command:
                     entry.last_used_command = command
                 if resolved_path:
@@ -145,10 +197,11 @@ class ExecApprovalStore:
         # Add new entry
         config.allowlist.append(AllowlistEntry(
             pattern=pattern,
-            last_used_at=int(time.time() * 1000),
+            last_used_at=_now_ms(),
             last_used_command=command,
             last_resolved_path=resolved_path,
         ))
+        self._allowlist_re = None
         self.save()
 
     def remove_from_allowlist(self, pattern: str) -> bool:
@@ -168,23 +221,38 @@ class ExecApprovalStore:
             return False
 
         config = self.config
+        if self._allowlist_re is None or self._allowlist_entries is not config.allowlist:
+            self._compile_allowlist(config.allowlist)
 
-        for entry in config.allowlist:
-            pattern = entry.pattern
-
-            # Expand home directory
-            if pattern.startswith("~"):
-                pattern = str(Path(pattern).expanduser())
+        # Same semantics as fnmatch.fnmatch: normcase both sides, first entry wins
+        match = self._allowlist_re.match(os.path.normcase(resolved_path))
+        if not match:
+            return False
 
-            # Use fnmatch for glob matching
-            if fnmatch.fnmatch(resolved_path, pattern):
-                # Update last used
-                entry.last_used_at = int(time.time() * 1000)
-                entry.last_resolved_path = resolved_path
-                self.save()
-                return True
+        entry = config.allowlist[int(match.lastgroup[1:])]
+        # Update last used; written out lazily since hits are frequent
+        entry.last_used_at = _now_ms()
+        entry.last_resolved_path = resolved_path
+        self._usage_dirty = True
+        if time.monotonic() - self._last_save >= _USAGE_FLUSH_INTERVAL_S:
+            self.save()
+        return True
 
-        return False
+    def _compile_allowlist(self, allowlist: list[AllowlistEntry]) -> None:
+        """Compile allowlist globs into a single regex with one group per entry."""
+        parts = []
+        seen: set[str] = set()
+        for i, entry in enumerate(allowlist):
+            # A repeated pattern can never beat its first occurrence, and its
+            # cached translation would redefine the same regex group names
+            if entry.pattern in seen:
+                continue
+            seen.add(entry.pattern)
+            parts.append(f"(?P<e{i}>{_glob_regex(entry.pattern)})")
+
+        # An empty alternation would match everything; (?!) never matches
+        self._allowlist_re = re.compile("|".join(parts) or "(?!)")
+        self._allowlist_entries = allowlist
 
     def create_pending(self, request: ExecRequest, timeout_seconds: int = 120) -> PendingApproval:
         """Create a pending approval request."""
@@ -203,16 +271,15 @@ class ExecApprovalStore:
             resolved_path=analysis.resolved_path,
         )
 
+        self.prune_expired()
         self._pending[approval_id] = pending
+        heapq.heappush(self._expiry_heap, (pending.expires_at, approval_id))
         return pending
 
     def get_pending(self, approval_id: str) -> PendingApproval | None:
         """Get a pending approval by ID."""
-        pending = self._pending.get(approval_id)
-        if pending and time.time() > pending.expires_at:
-            del self._pending[approval_id]
-            return None
-        return pending
+        self.prune_expired()
+        return self._pending.get(approval_id)
 
     def resolve_pending(self, approval_id: str, decision: ExecApprovalDecision) -> bool:
         """Resolve a pending approval."""
@@ -233,10 +300,14 @@ class ExecApprovalStore:
     def prune_expired(self) -> int:
         """Remove expired pending approvals."""
         now = time.time()
-        expired = [k for k, v in self._pending.items() if now > v.expires_at]
-        for k in expired:
-            del self._pending[k]
-        return len(expired)
+        heap = self._expiry_heap
+        removed = 0
+        while heap and now > heap[0][0]:
+            _, approval_id = heapq.heappop(heap)
+            # Resolved approvals leave a stale heap entry behind; skip those
+            if self._pending.pop(approval_id, None) is not None:
+                removed += 1
+        return removed
 
     async def request_approval(self, pending: PendingApproval) -> ExecApprovalDecision | None:
         """Request approval via callback (e.g., Telegram)."""
@@ -254,10 +325,8 @@ def check_allowlist(store: ExecApprovalStore, resolved_path: str | None, executa
     Returns True if allowed.
     """
     # Check safe bins (always allowed for stdin-only operations)
-    if executable:
-        name = Path(executable).name if '/' in executable else executable
-        if name in DEFAULT_SAFE_BINS:
-            return True
+    if executable and os.path.basename(executable) in DEFAULT_SAFE_BINS:
+        return True
 
     # Check allowlist
     return store.check_allowlist(resolved_path)
@@ -1,6 +1,8 @@
 """Command executor with security checks."""
 
 import asyncio
+import codecs
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -12,13 +14,54 @@ from flowly.exec.types import (
     ExecResult,
     ExecConfig,
 )
-from flowly.exec.safety import analyze_command
+from flowly.exec.safety import analyze_command, needs_shell, resolve_exec_path
 from flowly.exec.approvals import (
     ExecApprovalStore,
     check_allowlist,
     requires_approval,
 )
 
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int) -> tuple[str, int, bool]:
+    """
+    Read a stream to EOF, decoding at most ``limit`` chars of UTF-8.
+
+    Decoding is incremental, so multi-byte chars split across reads are kept
+    intact, and only the bytes needed for ``limit`` chars are decoded. The rest
+    is drained and discarded so the process never blocks on a full pipe.
+
+    Returns (text, total bytes read, truncated).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts: list[str] = []
+    kept = 0
+    total = 0
+    truncated = False
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        total += len(chunk)
+        if truncated:
+            continue
+        # A char is at most 4 bytes, so this slice always covers `room` chars
+        room = limit - kept
+        text = decoder.decode(chunk[:room * 4 + 4])
+        if len(text) > room:
+            text = text[:room]
+            truncated = True
+        parts.append(text)
+        kept += len(text)
+
+    if not truncated:
+        # Flush a trailing partial char as U+FFFD
+        tail = decoder.decode(b"", final=True)
+        if kept + len(tail) > limit:
+            tail = tail[:limit - kept]
+            truncated = True
+        parts.append(tail)
+
+    return "".join(parts), total, truncated
+
 
 async def execute_command(
     request: ExecRequest,
@@ -45,7 +88,7 @@ async def execute_command(
         )
 
     # Analyze command
-    analysis = analyze_command(request.command)
+    analysis = analyze_command(request.command, config.max_command_chars)
 
     # Check for dangerous patterns
     if analysis.has_dangerous_chars:
@@ -110,28 +153,52 @@ async def execute_command(
     cwd = request.cwd or str(Path.home())
 
     try:
-        # Build environment
+        # Build environment (None lets the child inherit ours unchanged)
         env = None
         if request.env:
-            import os
-            env = os.environ.copy()
-            env.update(request.env)
-
-        # Run command
-        process = await asyncio.create_subprocess_shell(
-            request.command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=cwd,
-            env=env,
-        )
+            env = {**os.environ, **request.env}
+
+        # Run command, skipping the shell when it wouldn't change the argv
+        exec_path = None
+        if (
+            analysis.ok
+            and not analysis.is_pipeline
+            and analysis.resolved_path
+            and not needs_shell(request.command)
+        ):
+            exec_path = resolve_exec_path(analysis.executable, cwd, (env or os.environ).get("PATH", ""))
+            # Only when that runs the same file the policy checks above looked at
+            if exec_path and os.path.realpath(exec_path) != os.path.realpath(analysis.resolved_path):
+                exec_path = None
+
+        if exec_path:
+            process = await asyncio.create_subprocess_exec(
+                exec_path,
+                *analysis.args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+            )
+        else:
+            process = await asyncio.create_subprocess_shell(
+                request.command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+            )
+
+        max_output = config.max_output_chars
 
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(timeout):
+                stdout, stderr, _ = await asyncio.gather(
+                    _read_capped(process.stdout, max_output),
+                    _read_capped(process.stderr, max_output),
+                    process.wait(),
+                )
+        except TimeoutError:
             process.kill()
             await process.wait()
             return ExecResult(
@@ -141,22 +208,19 @@ async def execute_command(
                 timed_out=True
             )
 
-        # Decode output
-        stdout_str = stdout.decode('utf-8', errors='replace')
-        stderr_str = stderr.decode('utf-8', errors='replace')
-
-        # Truncate if too long
-        max_output = config.max_output_chars
-        if len(stdout_str) > max_output:
-            stdout_str = stdout_str[:max_output] + f"\n... (truncated, {len(stdout_str)} total chars)"
-        if len(stderr_str) > max_output:
-            stderr_str = stderr_str[:max_output] + f"\n... (truncated, {len(stderr_str)} total chars)"
+        stdout_str, stdout_total, stdout_truncated = stdout
+        stderr_str, stderr_total, stderr_truncated = stderr
+        if stdout_truncated:
+            stdout_str += f"\n... (truncated, {stdout_total} total bytes)"
+        if stderr_truncated:
+            stderr_str += f"\n... (truncated, {stderr_total} total bytes)"
 
         return ExecResult(
             success=process.returncode == 0,
             exit_code=process.returncode,
             stdout=stdout_str,
             stderr=stderr_str,
+            truncated=stdout_truncated or stderr_truncated,
         )
 
     except Exception as e:
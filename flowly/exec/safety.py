@@ -1,9 +1,12 @@
 """Command safety analysis and validation."""
 
+import os
 import platform
 import re
 import shlex
 import shutil
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 
 from flowly.exec.types import CommandAnalysis
@@ -17,23 +20,42 @@ DEFAULT_SAFE_BINS = frozenset([
 # Dangerous shell metacharacters
 SHELL_METACHARS = re.compile(r'[;&|`$<>]')
 CONTROL_CHARS = re.compile(r'[\r\n\x00]')
+# SHELL_METACHARS and CONTROL_CHARS combined, for a single scan of executable names
+BAD_EXEC_CHARS = re.compile(r'[;&|`$<>\r\n\x00]')
 QUOTE_CHARS = re.compile(r'["\']')
+# Anything the shell would expand, redirect or chain (quotes are handled by shlex).
+# Backslashes are included: escape handling differs between shlex and the shell's echo.
+SHELL_SYNTAX_CHARS = re.compile(r'[;&|`$<>*?\[\]{}()~#!=\\]')
+# Commands the shell runs itself; exec'ing a same-named binary behaves differently
+SHELL_BUILTINS = frozenset([
+    ".", ":", "[", "alias", "bg", "break", "cd", "command", "continue", "echo", "eval",
+    "exec", "exit", "export", "false", "fc", "fg", "getopts", "hash", "jobs", "kill",
+    "printf", "pwd", "read", "readonly", "return", "set", "shift", "source", "test",
+    "times", "trap", "true", "type", "ulimit", "umask", "unalias", "unset", "wait",
+])
+# Characters shlex treats specially, plus whitespace str.split() would split on but shlex doesn't
+SHLEX_SPECIAL_CHARS = re.compile(r'["\'\\]|[^\S \t\r\n]')
+
+# Patterns for dangerous commands. Each must match in linear time: where a
+# keyword is followed by an unbounded gap, the gap stops at the next occurrence
+# of the keyword (which starts its own attempt), so repeated keywords can't make
+# the backtracking engine rescan the rest of the input from every one of them.
 
-# Patterns for dangerous commands (Unix)
+# Unix
 _UNIX_DANGEROUS_PATTERNS = [
-    re.compile(r'\brm\s+(-[rf]+\s+)*/', re.IGNORECASE),  # rm -rf /
+    re.compile(r'\brm\s+(?:-[rf]+\s+)*/', re.IGNORECASE),  # rm -rf /
     re.compile(r'\bsudo\b', re.IGNORECASE),
     re.compile(r'\bchmod\s+777', re.IGNORECASE),
-    re.compile(r'\bchown\b.*root', re.IGNORECASE),
+    re.compile(r'\bchown\b(?:(?!\bchown\b).)*root', re.IGNORECASE),
     re.compile(r'\bmkfs\b', re.IGNORECASE),
-    re.compile(r'\bdd\b.*of=/', re.IGNORECASE),
+    re.compile(r'\bdd\b(?:(?!\bdd\b).)*of=/', re.IGNORECASE),
     re.compile(r'>\s*/dev/', re.IGNORECASE),
-    re.compile(r'\bcurl\b.*\|\s*(ba)?sh', re.IGNORECASE),  # curl | sh
-    re.compile(r'\bwget\b.*\|\s*(ba)?sh', re.IGNORECASE),  # wget | sh
-    re.compile(r':(){.*};:', re.IGNORECASE),  # Fork bomb
+    re.compile(r'\bcurl\b(?:(?!\bcurl\b).)*\|\s*(?:ba)?sh', re.IGNORECASE),  # curl | sh
+    re.compile(r'\bwget\b(?:(?!\bwget\b).)*\|\s*(?:ba)?sh', re.IGNORECASE),  # wget | sh
+    re.compile(r':\(\)\s*\{[^{}]*\}\s*;\s*:', re.IGNORECASE),  # Fork bomb
 ]
 
-# Patterns for dangerous commands (Windows)
+# Windows
 _WINDOWS_DANGEROUS_PATTERNS = [
     re.compile(r'\bformat\b\s+[a-z]:', re.IGNORECASE),  # format C:
     re.compile(r'\bdiskpart\b', re.IGNORECASE),
@@ -42,7 +64,7 @@ _WINDOWS_DANGEROUS_PATTERNS = [
     re.compile(r'\bdel\b\s+/[sfq]', re.IGNORECASE),  # del /s /f /q
     re.compile(r'\brd\b\s+/s', re.IGNORECASE),  # rd /s (recursive delete)
     re.compile(r'\brmdir\b\s+/s', re.IGNORECASE),  # rmdir /s
-    re.compile(r'\bnet\b\s+user\b.*\b/delete\b', re.IGNORECASE),  # net user /delete
+    re.compile(r'\bnet\b\s+user\b(?:(?!\bnet\b).)*/delete\b', re.IGNORECASE),  # net user /delete
     re.compile(r'\bbcdedit\b', re.IGNORECASE),  # boot config
     re.compile(r'\brunas\b\s+/user:administrator', re.IGNORECASE),
 ]
@@ -53,9 +75,28 @@ DANGEROUS_PATTERNS = (
     else _UNIX_DANGEROUS_PATTERNS
 )
 
+# All dangerous patterns fused into one alternation so a command is scanned
+# in a single pass; DANGEROUS_PATTERNS is kept for introspection.
+DANGEROUS_RE = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in DANGEROUS_PATTERNS),
+    re.IGNORECASE,
+)
+
+# Commands longer than this are rejected before any regex runs over them
+MAX_COMMAND_CHARS = 8192
+
+# Memoized shutil.which results, keyed by (name, PATH)
+_WHICH_CACHE: dict[tuple[str, str], str] = {}
+_WHICH_CACHE_MAX = 1024
+
 # Pipeline operators that are not allowed in allowlist mode
 DISALLOWED_PIPELINE_OPS = {'||', '|&', '`', '$(', '\n', '\r', '(', ')'}
 
+# Single scan for all of the above (longest first, so matches report the full operator)
+DISALLOWED_PIPELINE_RE = re.compile("|".join(
+    re.escape(op) for op in sorted(DISALLOWED_PIPELINE_OPS, key=lambda op: (-len(op), op))
+))
+
 
 def is_safe_executable(value: str | None) -> bool:
     """Check if a string is safe to use as an executable name."""
@@ -63,24 +104,11 @@ def is_safe_executable(value: str | None) -> bool:
         return False
 
     trimmed = value.strip()
-    if not trimmed:
-        return False
-
-    # Check for dangerous characters
-    if '\0' in trimmed:
-        return False
-    if CONTROL_CHARS.search(trimmed):
-        return False
-    if SHELL_METACHARS.search(trimmed):
-        return False
-
-    return True
+    return bool(trimmed) and BAD_EXEC_CHARS.search(trimmed) is None
 
 
 def resolve_executable(name: str) -> str | None:
     """Resolve an executable name to its full path."""
-    import os
-
     # If it's already a path (check both Unix and Windows separators)
     if '/' in name or '\\' in name or os.sep in name:
         path = Path(name).expanduser().resolve()
@@ -88,18 +116,58 @@ def resolve_executable(name: str) -> str | None:
             return str(path)
         return None
 
-    # Use shutil.which to find in PATH
-    return shutil.which(name)
+    return _which(name, os.environ.get("PATH", ""))
 
 
-def is_safe_bin(executable: str, args: list[str]) -> bool:
-    """Check if command is a safe stdin-only binary with safe args."""
-    import os
+def resolve_exec_path(name: str, cwd: str, path: str) -> str | None:
+    """
+    Find the file the shell would run for ``name`` in a child process.
+
+    Unlike resolve_executable, relative paths are taken against the child's
+    ``cwd`` and bare names are looked up on the child's ``path`` (its PATH).
+    Symlinks are not followed, so programs that dispatch on argv[0] (busybox)
+    still see the name they were invoked by. Shell builtins return None, as
+    they only exist inside the shell.
+    """
+    if name in SHELL_BUILTINS:
+        return None
+    if '/' in name:
+        candidate = os.path.join(cwd, name)
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+        return None
+    return _which(name, path)
+
 
-    # Get basename (handle both Unix and Windows paths)
-    name = Path(executable).name if ('/' in executable or '\\' in executable or os.sep in executable) else executable
+def _which(name: str, path: str) -> str | None:
+    """shutil.which for a bare name on the given PATH, memoized."""
+    # PATH lookups are memoized per (name, PATH). A hit is re-checked with a
+    # single access() call so a removed binary isn't reported; misses are not
+    # cached so newly installed tools are picked up.
+    key = (name, path)
+    cached = _WHICH_CACHE.get(key)
+    if cached is not None and os.access(cached, os.X_OK):
+        return cached
 
-    if name not in DEFAULT_SAFE_BINS:
+    resolved = shutil.which(name, path=path)
+    if resolved is not None:
+        if len(_WHICH_CACHE) >= _WHICH_CACHE_MAX:
+            _WHICH_CACHE.clear()
+        _WHICH_CACHE[key] = resolved
+    else:
+        _WHICH_CACHE.pop(key, None)
+    return resolved
+
+
+def clear_resolve_cache() -> None:
+    """Forget memoized PATH lookups made by resolve_executable."""
+    _WHICH_CACHE.clear()
+
+
+def is_safe_bin(executable: str, args: list[str]) -> bool:
+    """Check if command is a safe stdin-only binary with safe args."""
+    # Get basename (os.path handles both separators on Windows)
+    if os.path.basename(executable) not in DEFAULT_SAFE_BINS:
         return False
 
     # Check args don't reference files
@@ -117,12 +185,19 @@ def is_safe_bin(executable: str, args: list[str]) -> bool:
     return True
 
 
+def needs_shell(command: str) -> bool:
+    """
+    Check if a command relies on shell syntax.
+
+    Commands that don't can be exec'd directly from their parsed argv with
+    the same result, skipping the intermediate /bin/sh.
+    """
+    return SHELL_SYNTAX_CHARS.search(command) is not None
+
+
 def has_dangerous_pattern(command: str) -> bool:
     """Check if command matches any dangerous patterns."""
-    for pattern in DANGEROUS_PATTERNS:
-        if pattern.search(command):
-            return True
-    return False
+    return DANGEROUS_RE.search(command) is not None
 
 
 def split_pipeline(command: str) -> tuple[bool, str | None, list[str]]:
@@ -132,9 +207,9 @@ def split_pipeline(command: str) -> tuple[bool, str | None, list[str]]:
     Returns (ok, reason, segments).
     """
     # Check for disallowed operators
-    for op in DISALLOWED_PIPELINE_OPS:
-        if op in command:
-            return False, f"Disallowed operator: {op}", []
+    match = DISALLOWED_PIPELINE_RE.search(command)
+    if match:
+        return False, f"Disallowed operator: {match.group()}", []
 
     # Check for command substitution
     if '$(' in command or '`' in command:
@@ -157,6 +232,13 @@ def split_pipeline(command: str) -> tuple[bool, str | None, list[str]]:
 
 def parse_command(command: str) -> tuple[str | None, list[str]]:
     """Parse a command into executable and arguments."""
+    # Without quotes or escapes shlex.split is equivalent to a plain split
+    if not SHLEX_SPECIAL_CHARS.search(command):
+        parts = command.split()
+        if not parts:
+            return None, []
+        return parts[0], parts[1:]
+
     try:
         parts = shlex.split(command)
         if not parts:
@@ -166,14 +248,15 @@ def parse_command(command: str) -> tuple[str | None, list[str]]:
         return None, []
 
 
-def analyze_command(command: str) -> CommandAnalysis:
+@lru_cache(maxsize=1024)
+def _analyze_text(command: str) -> CommandAnalysis:
     """
-    Analyze a shell command for safety.
+    The string-only part of analyze_command, cached per command.
 
-    Returns a CommandAnalysis with details about the command.
+    Everything here depends on the command text alone. Executable resolution
+    and the safe-bin file checks touch the filesystem and are done by the
+    caller on every call.
     """
-    command = command.strip()
-
     if not command:
         return CommandAnalysis(ok=False, reason="Empty command")
 
@@ -208,16 +291,13 @@ def analyze_command(command: str) -> CommandAnalysis:
 
         # For pipelines, analyze the first segment
         executable, args = parse_command(segments[0])
-        resolved = resolve_executable(executable) if executable else None
 
         return CommandAnalysis(
             ok=True,
             executable=executable,
-            resolved_path=resolved,
             args=args,
             is_pipeline=True,
             segments=segments,
-            is_safe_bin=is_safe_bin(executable, args) if executable else False
         )
 
     # Single command
@@ -234,14 +314,39 @@ def analyze_command(command: str) -> CommandAnalysis:
             has_dangerous_chars=True
         )
 
-    # Resolve the executable path
-    resolved = resolve_executable(executable)
-
     return CommandAnalysis(
         ok=True,
         executable=executable,
-        resolved_path=resolved,
         args=args,
         is_pipeline=False,
-        is_safe_bin=is_safe_bin(executable, args)
+    )
+
+
+def analyze_command(command: str, max_length: int = MAX_COMMAND_CHARS) -> CommandAnalysis:
+    """
+    Analyze a shell command for safety.
+
+    Commands over ``max_length`` chars are rejected up front, which bounds the
+    cost of every later check and keeps oversized input out of the cache.
+
+    Returns a CommandAnalysis with details about the command.
+    """
+    command = command.strip()
+    if len(command) > max_length:
+        return CommandAnalysis(
+            ok=False,
+            reason=f"Command too long ({len(command)} chars, max {max_length})",
+            has_dangerous_chars=True
+        )
+
+    cached = _analyze_text(command)
+    executable = cached.executable if cached.ok else None
+
+    # Fresh lists so callers never mutate the cached analysis
+    return replace(
+        cached,
+        args=list(cached.args),
+        segments=list(cached.segments),
+        resolved_path=resolve_executable(executable) if executable else None,
+        is_safe_bin=is_safe_bin(executable, cached.args) if executable else False,
     )
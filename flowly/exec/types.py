@@ -16,7 +16,7 @@ ExecHost = Literal["local", "sandbox"]
 ExecApprovalDecision = Literal["allow-once", "allow-always", "deny"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecConfig:
     """Configuration for command execution."""
     enabled: bool = False
@@ -26,10 +26,11 @@ class ExecConfig:
     host: ExecHost = "local"
     timeout_seconds: int = 300  # 5 minutes default
     max_output_chars: int = 200_000  # 200KB
+    max_command_chars: int = 8192
     approval_timeout_seconds: int = 120  # 2 minutes to approve
 
 
-@dataclass
+@dataclass(slots=True)
 class AllowlistEntry:
     """An entry in the exec allowlist."""
     pattern: str
@@ -38,7 +39,7 @@ class AllowlistEntry:
     last_resolved_path: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecRequest:
     """A request to execute a command."""
     command: str
@@ -48,7 +49,7 @@ class ExecRequest:
     session_key: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecResult:
     """Result of command execution."""
     success: bool
@@ -57,11 +58,12 @@ class ExecResult:
     stderr: str = ""
     error: str | None = None
     timed_out: bool = False
+    truncated: bool = False
     denied: bool = False
     approval_required: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CommandAnalysis:
     """Analysis of a shell command for safety."""
     ok: bool
@@ -75,7 +77,7 @@ class CommandAnalysis:
     is_safe_bin: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PendingApproval:
     """A pending approval request."""
     id: str
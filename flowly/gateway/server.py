@@ -1,15 +1,23 @@
 """HTTP API server for gateway integrations."""
 
 import asyncio
-import json
-from typing import Callable, Awaitable
+from typing import Any, Callable, Awaitable
 
+import orjson
 from aiohttp import web
 from loguru import logger
 
 # Maximum allowed request body size (1MB)
 _MAX_BODY_SIZE = 1024 * 1024
 
+# Health responses never change, so the body is encoded once
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
+def _json_response(data: Any, status: int = 200) -> web.Response:
+    """Build a JSON response encoded with orjson."""
+    return web.Response(body=orjson.dumps(data), status=status, content_type="application/json")
+
 
 class GatewayServer:
     """
@@ -40,6 +48,7 @@ class GatewayServer:
         self._app: web.Application | None = None
         self._runner: web.AppRunner | None = None
         self._site: web.TCPSite | None = None
+        self._inflight: dict[tuple[str, str], asyncio.Task[str]] = {}
 
     def _create_app(self) -> web.Application:
         """Create the aiohttp application."""
@@ -51,7 +60,17 @@ class GatewayServer:
 
     async def _handle_health(self, request: web.Request) -> web.Response:
         """Health check endpoint."""
-        return web.json_response({"status": "ok"})
+        return web.Response(
+            body=_HEALTH_BODY,
+            content_type="application/json",
+            headers={"Cache-Control": "no-store"},
+        )
+
+    def _forget_inflight(self, key: tuple[str, str], task: asyncio.Task[str]) -> None:
+        """Drop a finished voice call and mark its exception as retrieved."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
 
     async def _handle_voice_message(self, request: web.Request) -> web.Response:
         """
@@ -70,48 +89,59 @@ class GatewayServer:
         }
         """
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
             call_sid = data.get("call_sid", "")
             from_number = data.get("from", "")
             text = data.get("text", "")
 
             # Input validation
             if not call_sid or len(call_sid) > 128:
-                return web.json_response({"error": "Invalid call_sid"}, status=400)
+                return _json_response({"error": "Invalid call_sid"}, status=400)
             if len(text) > 50000:
-                return web.json_response({"error": "Message too large"}, status=413)
+                return _json_response({"error": "Message too large"}, status=413)
 
             logger.info(f"Voice message from {from_number}: {text[:50]}...")
 
             if not self.on_voice_message:
-                return web.json_response(
+                return _json_response(
                     {"error": "Voice handler not configured"},
                     status=500
                 )
 
-            # Get response from agent with timeout
-            response = await asyncio.wait_for(
-                self.on_voice_message(call_sid, from_number, text),
-                timeout=30.0,
-            )
-
-            return web.json_response({"response": response})
-
-        except json.JSONDecodeError:
-            return web.json_response(
+            # Retried or duplicated deliveries join the in-flight agent call.
+            # The call runs as its own task so a disconnecting client doesn't
+            # cancel it for the others waiting on it.
+            key = (call_sid, text)
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(asyncio.wait_for(
+                    self.on_voice_message(call_sid, from_number, text),
+                    timeout=30.0,
+                ))
+                self._inflight[key] = task
+                task.add_done_callback(lambda t: self._forget_inflight(key, t))
+            else:
+                logger.info(f"Joining in-flight voice message for {call_sid}")
+
+            response = await asyncio.shield(task)
+
+            return _json_response({"response": response})
+
+        except orjson.JSONDecodeError:
+            return _json_response(
                 {"error": "Invalid JSON"},
                 status=400
             )
         except asyncio.TimeoutError:
             logger.error("Voice message handler timeout")
-            return web.json_response(
+            return _json_response(
                 {"error": "Handler timeout"},
                 status=504
             )
         except Exception as e:
             logger.error(f"Error handling voice message: {e}")
             # Don't expose internal error details to client
-            return web.json_response(
+            return _json_response(
                 {"error": "Internal server error"},
                 status=500
             )
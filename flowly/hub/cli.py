@@ -260,10 +260,11 @@ def check():
     """
     with _get_manager() as manager:
         skills = manager.list_installed(include_workspace=False)
+        infos = manager.info_many([skill.slug for skill in skills])
 
     updates = []
     for skill in skills:
-        info = manager.info(skill.slug)
+        info = infos.get(skill.slug)
         if info and info.get("update_available"):
             updates.append((skill.slug, skill.version, info["update_available"]))
 
@@ -1,13 +1,21 @@
 """Hub client for fetching skills from registry."""
 
+import asyncio
 import hashlib
-import json
+import os
 import re
+import secrets
+import shutil
+import tarfile
+import tempfile
+import time
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable
 
 import httpx
+import orjson
 from loguru import logger
 
 
@@ -17,8 +25,69 @@ DEFAULT_REGISTRY = "https://hub.flowly.ai"
 # GitHub raw content base URL for fallback
 GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
 
+# GitHub REST API, used to list a repository's files in one request
+GITHUB_API_BASE = "https://api.github.com"
 
-@dataclass
+# Skill subdirectories fetched alongside SKILL.md from GitHub
+_GITHUB_EXTRA_DIRS = frozenset(["scripts", "references", "assets"])
+
+# Local path prefixes understood by parse_skill_source
+_LOCAL_PREFIXES = ("./", "/", "~")
+
+# Shared pool settings; connect failures are retried before surfacing
+_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_CONNECT_RETRIES = 2
+
+# How long registry lookups are reused before being fetched again
+_CACHE_TTL_S = 60.0
+
+# Downloads are hashed while streamed into a scratch file that stays in memory
+# up to this size and spills to disk beyond it
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# HTTP/2 multiplexes requests over one connection, but needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+def _scratch_file(resp: httpx.Response) -> BinaryIO:
+    """
+    Get a scratch file for a download body.
+
+    Bodies announced as larger than the spool limit go straight to an unnamed
+    temporary file rather than filling memory and being copied over on rollover.
+    """
+    length = resp.headers.get("content-length", "")
+    if length.isdigit() and int(length) > _SPOOL_MAX_SIZE:
+        return tempfile.TemporaryFile()
+    return tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+
+
+def _replace_dir(src: Path, dst: Path) -> None:
+    """
+    Move a directory into place, replacing any existing one.
+
+    A directory can't be renamed over a non-empty one, so the old directory is
+    first renamed aside and only deleted once the new one is in place.
+    """
+    if not dst.exists():
+        os.replace(src, dst)
+        return
+    old = dst.with_name(f".{dst.name}.{secrets.token_hex(4)}.old")
+    os.replace(dst, old)
+    try:
+        os.replace(src, dst)
+    except OSError:
+        os.replace(old, dst)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+
+
+@dataclass(slots=True, frozen=True)
 class SkillInfo:
     """Information about a skill from the registry."""
 
@@ -49,6 +118,48 @@ class SkillInfo:
         )
 
 
+def _parse_github_source(source: str, raw: str) -> tuple[str, dict]:
+    """Parse github:owner/repo[/custom/path]/skill-name[@branch]."""
+    # Handle branch suffix
+    branch = "main"
+    if "@" in raw:
+        raw, branch = raw.rsplit("@", 1)
+
+    parts = raw.split("/")
+    if len(parts) < 3:
+        raise ValueError(f"Invalid GitHub source: {source} (need owner/repo/skill)")
+
+    owner, repo = parts[0], parts[1]
+    skill_name = parts[-1]
+
+    # If more than 3 parts, use intermediate parts as path
+    if len(parts) > 3:
+        path = "/".join(parts[2:-1])
+    else:
+        path = "skills"  # Default path
+
+    return "github", {
+        "repo": f"{owner}/{repo}@{branch}",
+        "path": path,
+        "skill_name": skill_name,
+    }
+
+
+def _parse_url_source(source: str, rest: str) -> tuple[str, dict] | None:
+    """Parse http(s)://... URLs; anything else after the scheme isn't a URL source."""
+    if rest.startswith("//"):
+        return "url", {"url": source}
+    return None
+
+
+# Source scheme (before the first ":") -> parser taking (source, rest after ":")
+_SOURCE_SCHEMES: dict[str, Callable[[str, str], tuple[str, dict] | None]] = {
+    "github": _parse_github_source,
+    "http": _parse_url_source,
+    "https": _parse_url_source,
+}
+
+
 class HubClient:
     """
     Client for interacting with the Flowly Hub registry.
@@ -67,7 +178,34 @@ class HubClient:
             registry_url: Custom registry URL (default: hub.flowly.ai)
         """
         self.registry_url = (registry_url or DEFAULT_REGISTRY).rstrip("/")
-        self._client = httpx.Client(timeout=30.0)
+        self._client = httpx.Client(
+            timeout=30.0,
+            transport=httpx.HTTPTransport(http2=_HTTP2, limits=_POOL_LIMITS, retries=_CONNECT_RETRIES),
+        )
+        # Registry lookups are cached briefly: (slug, version) / (query, limit) -> (time, result)
+        self._skill_cache: dict[tuple[str, str | None], tuple[float, SkillInfo]] = {}
+        self._search_cache: dict[tuple[str, int], tuple[float, list[SkillInfo]]] = {}
+        # (repo, branch) -> (time, blobs in the branch's tree)
+        self._tree_cache: dict[tuple[str, str], tuple[float, list[dict]]] = {}
+        # Created on first async use; bound to the event loop that made it
+        self._aclient: httpx.AsyncClient | None = None
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Get the async client, creating it on first use."""
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                timeout=30.0,
+                transport=httpx.AsyncHTTPTransport(
+                    http2=_HTTP2, limits=_POOL_LIMITS, retries=_CONNECT_RETRIES
+                ),
+            )
+        return self._aclient
+
+    def fetch(self, url: str) -> httpx.Response:
+        """GET an arbitrary URL through the shared connection pool."""
+        resp = self._client.get(url)
+        resp.raise_for_status()
+        return resp
 
     def search(self, query: str, limit: int = 20) -> list[SkillInfo]:
         """
@@ -80,14 +218,21 @@ class HubClient:
         Returns:
             List of matching skills.
         """
+        key = (query, limit)
+        cached = self._search_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _CACHE_TTL_S:
+            return list(cached[1])
+
         try:
             resp = self._client.get(
                 f"{self.registry_url}/api/skills/search",
                 params={"q": query, "limit": limit}
             )
             resp.raise_for_status()
-            data = resp.json()
-            return [SkillInfo.from_dict(s) for s in data.get("skills", [])]
+            data = orjson.loads(resp.content)
+            results = [SkillInfo.from_dict(s) for s in data.get("skills", [])]
+            self._search_cache[key] = (time.monotonic(), results)
+            return list(results)
         except httpx.HTTPError as e:
             logger.warning(f"Registry search failed: {e}")
             return []
@@ -103,18 +248,56 @@ class HubClient:
         Returns:
             Skill info or None if not found.
         """
+        cached = self._cached_skill(slug, version)
+        if cached:
+            return cached
+
         try:
-            url = f"{self.registry_url}/api/skills/{slug}"
-            if version:
-                url += f"?version={version}"
+            resp = self._client.get(self._skill_url(slug, version))
+            resp.raise_for_status()
+            return self._cache_skill(slug, version, SkillInfo.from_dict(orjson.loads(resp.content)))
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to get skill {slug}: {e}")
+            return None
+
+    async def aget_skill(self, slug: str, version: str | None = None) -> SkillInfo | None:
+        """Async variant of get_skill, for fetching several skills concurrently."""
+        cached = self._cached_skill(slug, version)
+        if cached:
+            return cached
 
-            resp = self._client.get(url)
+        try:
+            resp = await self._async_client().get(self._skill_url(slug, version))
             resp.raise_for_status()
-            return SkillInfo.from_dict(resp.json())
+            return self._cache_skill(slug, version, SkillInfo.from_dict(orjson.loads(resp.content)))
         except httpx.HTTPError as e:
             logger.warning(f"Failed to get skill {slug}: {e}")
             return None
 
+    def _cached_skill(self, slug: str, version: str | None) -> SkillInfo | None:
+        """Get a fresh cached registry entry, if any."""
+        cached = self._skill_cache.get((slug, version))
+        if cached and time.monotonic() - cached[0] < _CACHE_TTL_S:
+            return cached[1]
+        return None
+
+    def _cache_skill(self, slug: str, version: str | None, skill: SkillInfo) -> SkillInfo:
+        """Remember a registry entry and return it."""
+        self._skill_cache[(slug, version)] = (time.monotonic(), skill)
+        return skill
+
+    def invalidate(self, slug: str) -> None:
+        """Drop cached registry entries for a skill so the next lookup refetches it."""
+        for key in [k for k in self._skill_cache if k[0] == slug]:
+            del self._skill_cache[key]
+
+    def _skill_url(self, slug: str, version: str | None) -> str:
+        """Build the registry URL for a skill."""
+        url = f"{self.registry_url}/api/skills/{slug}"
+        if version:
+            url += f"?version={version}"
+        return url
+
     def download_skill(self, skill: SkillInfo, target_dir: Path) -> Path | None:
         """
         Download a skill to the target directory.
@@ -126,60 +309,114 @@ class HubClient:
         Returns:
             Path to downloaded skill directory, or None on failure.
         """
-        skill_dir = target_dir / skill.slug
-        skill_dir.mkdir(parents=True, exist_ok=True)
-
         try:
-            # Download skill content
-            resp = self._client.get(skill.download_url)
-            resp.raise_for_status()
+            with self._client.stream("GET", skill.download_url) as resp:
+                resp.raise_for_status()
+                with _scratch_file(resp) as body:
+                    digest = hashlib.sha256()
+                    for chunk in resp.iter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                        body.write(chunk)
+                    return self._save_skill(skill, body, digest.hexdigest(), resp, target_dir)
+        except Exception as e:
+            logger.error(f"Failed to download {skill.slug}: {e}")
+            return None
 
-            # Verify hash if provided
-            if skill.hash:
-                content_hash = hashlib.sha256(resp.content).hexdigest()
-                if content_hash != skill.hash:
-                    logger.error(f"Hash mismatch for {skill.slug}")
-                    return None
-
-            # Check if it's a tarball or single file
-            content_type = resp.headers.get("content-type", "")
-
-            if "application/gzip" in content_type or skill.download_url.endswith(".tar.gz"):
-                # Extract tarball with path traversal protection
-                import sys
-                import tarfile
-                import io
-
-                with tarfile.open(fileobj=io.BytesIO(resp.content), mode="r:gz") as tar:
-                    if sys.version_info >= (3, 12):
-                        tar.extractall(skill_dir, filter="data")
-                    else:
-                        # Manual safety check for Python < 3.12
-                        for member in tar.getmembers():
-                            member_path = (skill_dir / member.name).resolve()
-                            if not str(member_path).startswith(str(skill_dir.resolve())):
-                                raise ValueError(f"Tar member {member.name} escapes target dir")
-                        tar.extractall(skill_dir)
-            else:
-                # Single SKILL.md file
-                (skill_dir / "SKILL.md").write_bytes(resp.content)
+    async def adownload_skill(self, skill: SkillInfo, target_dir: Path) -> Path | None:
+        """Async variant of download_skill, for downloading several skills concurrently."""
+        try:
+            async with self._async_client().stream("GET", skill.download_url) as resp:
+                resp.raise_for_status()
+                with _scratch_file(resp) as body:
+                    digest = hashlib.sha256()
+                    async for chunk in resp.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                        body.write(chunk)
+                    return self._save_skill(skill, body, digest.hexdigest(), resp, target_dir)
+        except Exception as e:
+            logger.error(f"Failed to download {skill.slug}: {e}")
+            return None
 
-            # Write metadata
-            meta_path = skill_dir / ".flowly-skill.json"
-            meta_path.write_text(json.dumps({
-                "slug": skill.slug,
-                "version": skill.version,
-                "installed_from": skill.download_url,
-                "hash": skill.hash,
-            }, indent=2), encoding="utf-8")
+    def _save_skill(
+        self,
+        skill: SkillInfo,
+        body: BinaryIO,
+        content_hash: str,
+        resp: httpx.Response,
+        target_dir: Path,
+    ) -> Path | None:
+        """
+        Verify a downloaded skill and write it into the target directory.
 
-            logger.info(f"Downloaded skill: {skill.slug} v{skill.version}")
-            return skill_dir
+        Args:
+            skill: Skill info from registry.
+            body: The downloaded payload, positioned at its end.
+            content_hash: SHA-256 of the payload, computed while downloading.
+            resp: The download response (for its headers).
+            target_dir: Directory to install into.
 
-        except Exception as e:
-            logger.error(f"Failed to download {skill.slug}: {e}")
+        Returns:
+            Path to the skill directory, or None if verification failed.
+        """
+        # Verify hash if provided
+        if skill.hash and content_hash != skill.hash:
+            logger.error(f"Hash mismatch for {skill.slug}")
             return None
 
+        # Unpack into a staging directory next to the skill and move it into place
+        # only once complete, so a rejected archive or a failed reinstall never
+        # leaves a partial (or half old, half new) skill behind
+        target_dir.mkdir(parents=True, exist_ok=True)
+        skill_dir = target_dir / skill.slug
+        staging = target_dir / f".{skill.slug}.{secrets.token_hex(4)}.tmp"
+        staging.mkdir()
+        try:
+            self._unpack_skill(skill, body, resp, staging)
+            _replace_dir(staging, skill_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Downloaded skill: {skill.slug} v{skill.version}")
+        return skill_dir
+
+    @staticmethod
+    def _unpack_skill(skill: SkillInfo, body: BinaryIO, resp: httpx.Response, skill_dir: Path) -> None:
+        """Write a downloaded skill and its metadata into an (empty) directory."""
+        body.seek(0)
+
+        # Check if it's a tarball or single file
+        content_type = resp.headers.get("content-type", "")
+
+        if "application/gzip" in content_type or skill.download_url.endswith(".tar.gz"):
+            # Extract tarball with path traversal protection, in one pass over
+            # the stream (no seeking back for a member index)
+            with tarfile.open(fileobj=body, mode="r|gz") as tar:
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(skill_dir, filter="data")
+                else:
+                    # Manual safety check where extraction filters are unavailable
+                    root = skill_dir.resolve()
+                    for member in tar:
+                        if not (root / member.name).resolve().is_relative_to(root):
+                            raise ValueError(f"Tar member {member.name} escapes target dir")
+                        tar.extract(member, skill_dir)
+        else:
+            # Single SKILL.md file
+            with open(skill_dir / "SKILL.md", "wb") as f:
+                shutil.copyfileobj(body, f)
+
+        # Write metadata (source lets update() find the skill in the registry again)
+        meta_path = skill_dir / ".flowly-skill.json"
+        meta_path.write_bytes(orjson.dumps({
+            "slug": skill.slug,
+            "version": skill.version,
+            "source": skill.slug,
+            "installed_from": skill.download_url,
+            "installed_at": datetime.now().isoformat(),
+            "hash": skill.hash,
+        }))
+
     def download_from_github(
         self,
         repo: str,
@@ -243,16 +480,77 @@ class HubClient:
         skill_name: str,
         skill_dir: Path
     ) -> None:
-        """Try to download extra files from GitHub skill."""
-        extras = ["scripts", "references", "assets"]
+        """
+        Download the extra directories (scripts/, references/, assets/) of a GitHub skill.
+
+        The files are found with a single Trees API listing instead of probing
+        each directory, then fetched concurrently. Failures are logged and
+        skipped; SKILL.md alone is a usable skill.
+        """
+        prefix = f"{path.strip('/')}/{skill_name}/" if path.strip("/") else f"{skill_name}/"
+        try:
+            tree = self._list_github_tree(repo, branch)
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not list files in github:{repo}@{branch}: {e}")
+            return
+
+        # Relative path -> file mode, for files under one of the extra directories
+        files: dict[str, str] = {}
+        for entry in tree:
+            if not entry["path"].startswith(prefix):
+                continue
+            rel = entry["path"][len(prefix):]
+            parts = rel.split("/")
+            if len(parts) > 1 and parts[0] in _GITHUB_EXTRA_DIRS and ".." not in parts:
+                files[rel] = entry.get("mode", "100644")
+
+        if files:
+            asyncio.run(self._fetch_github_files(f"{repo}/{branch}/{prefix}", files, skill_dir))
+
+    def _list_github_tree(self, repo: str, branch: str) -> list[dict]:
+        """List every file in a GitHub branch with one recursive Trees API request."""
+        cached = self._tree_cache.get((repo, branch))
+        if cached and time.monotonic() - cached[0] < _CACHE_TTL_S:
+            return cached[1]
+
+        resp = self._client.get(
+            f"{GITHUB_API_BASE}/repos/{repo}/git/trees/{branch}",
+            params={"recursive": "1"},
+            headers={"Accept": "application/vnd.github+json"},
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        if data.get("truncated"):
+            logger.warning(f"File listing for github:{repo}@{branch} is truncated")
+
+        tree = [entry for entry in data.get("tree", []) if entry.get("type") == "blob"]
+        self._tree_cache[(repo, branch)] = (time.monotonic(), tree)
+        return tree
+
+    async def _fetch_github_files(self, base: str, files: dict[str, str], skill_dir: Path) -> None:
+        """Fetch raw files under ``base`` into ``skill_dir`` concurrently."""
+        client = self._async_client()
+
+        async def fetch(rel: str, mode: str) -> None:
+            resp = await client.get(f"{GITHUB_RAW_BASE}/{base}{rel}")
+            resp.raise_for_status()
+            dest = skill_dir / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_bytes(resp.content)
+            if mode == "100755":
+                dest.chmod(0o755)
 
-        for extra in extras:
-            try:
-                # Try to get directory listing via GitHub API
-                # For now, just try common file names
-                pass
-            except Exception:
-                pass
+        try:
+            results = await asyncio.gather(
+                *(fetch(rel, mode) for rel, mode in files.items()),
+                return_exceptions=True,
+            )
+        finally:
+            await self.aclose()
+
+        for rel, result in zip(files, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to download {rel}: {result}")
 
     def parse_skill_source(self, source: str) -> tuple[str, dict]:
         """
@@ -268,54 +566,35 @@ class HubClient:
         Returns:
             Tuple of (source_type, params)
         """
-        if source.startswith("github:"):
-            # github:owner/repo/skill-name[@branch]
-            # or github:owner/repo/custom/path/skill-name[@branch]
-            raw = source[7:]
-
-            # Handle branch suffix
-            branch = "main"
-            if "@" in raw:
-                raw, branch = raw.rsplit("@", 1)
-
-            parts = raw.split("/")
-            if len(parts) < 3:
-                raise ValueError(f"Invalid GitHub source: {source} (need owner/repo/skill)")
-
-            owner, repo = parts[0], parts[1]
-            skill_name = parts[-1]
-
-            # If more than 3 parts, use intermediate parts as path
-            if len(parts) > 3:
-                path = "/".join(parts[2:-1])
-            else:
-                path = "skills"  # Default path
-
-            return "github", {
-                "repo": f"{owner}/{repo}@{branch}",
-                "path": path,
-                "skill_name": skill_name,
-            }
-
-        elif source.startswith(("http://", "https://")):
-            return "url", {"url": source}
-
-        elif source.startswith(("./", "/", "~")):
+        # "scheme:rest" sources are dispatched on the scheme with one lookup
+        scheme, sep, rest = source.partition(":")
+        parse = _SOURCE_SCHEMES.get(scheme) if sep else None
+        if parse:
+            parsed = parse(source, rest)
+            if parsed:
+                return parsed
+
+        if source.startswith(_LOCAL_PREFIXES):
             return "local", {"path": source}
 
-        else:
-            # Registry skill
-            # Handle version: skill-name@1.2.3
-            version = None
-            if "@" in source and not source.startswith("@"):
-                source, version = source.rsplit("@", 1)
+        # Registry skill
+        # Handle version: skill-name@1.2.3
+        version = None
+        if "@" in source and not source.startswith("@"):
+            source, version = source.rsplit("@", 1)
 
-            return "registry", {"slug": source, "version": version}
+        return "registry", {"slug": source, "version": version}
 
     def close(self):
         """Close the HTTP client."""
         self._client.close()
 
+    async def aclose(self) -> None:
+        """Close the async client; the next async call creates a fresh one."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
     def __enter__(self):
         return self
 
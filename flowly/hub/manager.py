@@ -1,20 +1,62 @@
 """Skill manager for installing, updating, and managing skills."""
 
+import asyncio
 import hashlib
-import json
+import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
 from loguru import logger
 
 from flowly.hub.client import HubClient, SkillInfo
 
+# Frontmatter block, and its flat `key: value` lines (split at the first colon).
+# Deliberately not a YAML parser: values such as unquoted descriptions containing
+# ": " or single-line JSON metadata must come back as the raw strings.
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+_FRONTMATTER_LINE_RE = re.compile(r"^([^:\n]*):(.*)$", re.MULTILINE)
 
-@dataclass
+# Characters not allowed in a slug derived from a URL
+_SLUG_UNSAFE_RE = re.compile(r"[^a-z0-9-]")
+
+# Skill directories are loaded on a thread pool once there are at least this many
+_PARALLEL_LOAD_MIN = 8
+_LOAD_WORKERS = 8
+
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+
+def _copy_file(src: str, dst: str) -> str:
+    """
+    Copy one file for copytree, letting the kernel move the data where it can.
+
+    copy_file_range() copies without a round trip through userspace and shares
+    extents on filesystems that support reflinks. If it is unavailable or
+    refused (e.g. across filesystems on older kernels), fall back to copy2.
+    """
+    if _HAS_COPY_FILE_RANGE:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
+@dataclass(slots=True, frozen=True)
 class InstalledSkill:
     """Information about an installed skill."""
 
@@ -91,6 +133,8 @@ class SkillManager:
         self.managed_dir.mkdir(parents=True, exist_ok=True)
 
         self._client = HubClient(registry_url)
+        # (skill_dir, source) -> (file stat signature, loaded skill)
+        self._skill_cache: dict[tuple[Path, str], tuple[tuple, InstalledSkill]] = {}
 
     def list_installed(self, include_workspace: bool = True) -> list[InstalledSkill]:
         """
@@ -102,39 +146,38 @@ class SkillManager:
         Returns:
             List of installed skills.
         """
-        skills = []
+        dirs = [(path, "managed") for path in self._skill_dirs(self.managed_dir)]
+        if include_workspace and self.workspace_dir:
+            dirs += [(path, "workspace") for path in self._skill_dirs(self.workspace_dir / "skills")]
 
-        # Managed skills
-        for skill_dir in self.managed_dir.iterdir():
-            if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists():
-                skill = self._load_installed_skill(skill_dir)
-                if skill:
-                    skills.append(skill)
+        if len(dirs) < _PARALLEL_LOAD_MIN:
+            loaded = [self._load_installed_skill(path, source) for path, source in dirs]
+        else:
+            # Loading is mostly stat() and file reads, which release the GIL
+            with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as pool:
+                loaded = list(pool.map(lambda item: self._load_installed_skill(*item), dirs))
 
-        # Workspace skills
-        if include_workspace and self.workspace_dir:
-            ws_skills = self.workspace_dir / "skills"
-            if ws_skills.exists():
-                for skill_dir in ws_skills.iterdir():
-                    if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists():
-                        skill = self._load_installed_skill(skill_dir, source="workspace")
-                        if skill:
-                            skills.append(skill)
+        return [skill for skill in loaded if skill]
 
-        return skills
+    @staticmethod
+    def _skill_dirs(parent: Path) -> list[Path]:
+        """List candidate skill directories, using the type info from scandir."""
+        try:
+            with os.scandir(parent) as it:
+                return [Path(entry.path) for entry in it if entry.is_dir()]
+        except FileNotFoundError:
+            return []
 
     def get_installed(self, slug: str) -> InstalledSkill | None:
         """Get an installed skill by slug."""
-        # Check managed first
-        skill_dir = self.managed_dir / slug
-        if skill_dir.exists() and (skill_dir / "SKILL.md").exists():
-            return self._load_installed_skill(skill_dir)
+        # Check managed first; a missing directory or SKILL.md loads as None
+        skill = self._load_installed_skill(self.managed_dir / slug)
+        if skill:
+            return skill
 
         # Check workspace
         if self.workspace_dir:
-            ws_dir = self.workspace_dir / "skills" / slug
-            if ws_dir.exists() and (ws_dir / "SKILL.md").exists():
-                return self._load_installed_skill(ws_dir, source="workspace")
+            return self._load_installed_skill(self.workspace_dir / "skills" / slug, source="workspace")
 
         return None
 
@@ -194,6 +237,8 @@ class SkillManager:
         if existing and not force:
             logger.warning(f"Skill {slug} already installed (use --force to reinstall)")
             return existing
+        if force:
+            self._client.invalidate(slug)
 
         # Get skill info from registry
         skill_info = self._client.get_skill(slug, version)
@@ -206,6 +251,7 @@ class SkillManager:
         if not skill_dir:
             return None
 
+        self._forget_skill(skill_dir)
         return self._load_installed_skill(skill_dir)
 
     def _install_from_github(
@@ -251,13 +297,11 @@ class SkillManager:
         force: bool,
     ) -> InstalledSkill | None:
         """Install from direct URL."""
-        import httpx
-
         # Extract skill name from URL
         slug = url.rstrip("/").split("/")[-1]
         if slug.endswith(".md"):
             slug = slug[:-3]
-        slug = re.sub(r"[^a-z0-9-]", "-", slug.lower())
+        slug = _SLUG_UNSAFE_RE.sub("-", slug.lower())
 
         # Check if already installed
         existing = self.get_installed(slug)
@@ -266,8 +310,7 @@ class SkillManager:
             return existing
 
         try:
-            resp = httpx.get(url, timeout=30.0)
-            resp.raise_for_status()
+            resp = self._client.fetch(url)
 
             skill_dir = target_dir / slug
             skill_dir.mkdir(parents=True, exist_ok=True)
@@ -324,7 +367,7 @@ class SkillManager:
         if target_skill.exists():
             shutil.rmtree(target_skill)
 
-        shutil.copytree(source_dir, target_skill)
+        shutil.copytree(source_dir, target_skill, copy_function=_copy_file)
 
         # Create metadata
         self._write_meta(target_skill, {
@@ -352,13 +395,12 @@ class SkillManager:
         Returns:
             List of updated skills.
         """
-        updated = []
-
         if slug:
-            skills = [self.get_installed(slug)] if self.get_installed(slug) else []
+            skills = [self.get_installed(slug)]
         else:
             skills = self.list_installed(include_workspace=False)
 
+        pending = []
         for skill in skills:
             if not skill:
                 continue
@@ -374,13 +416,47 @@ class SkillManager:
                 )
                 continue
 
-            # Re-install from source
-            result = self.install(skill.source, force=True)
+            pending.append(skill)
+
+        # Registry skills are fetched concurrently; other sources re-install one by one
+        registry_slugs = [
+            skill.slug for skill in pending
+            if self._client.parse_skill_source(skill.source)[0] == "registry"
+        ]
+        reinstalled = asyncio.run(self._reinstall_from_registry(registry_slugs)) if registry_slugs else {}
+
+        updated = []
+        for skill in pending:
+            if skill.slug in reinstalled:
+                result = reinstalled[skill.slug]
+            else:
+                result = self.install(skill.source, force=True)
             if result:
                 updated.append(result)
 
         return updated
 
+    async def _reinstall_from_registry(self, slugs: list[str]) -> dict[str, InstalledSkill | None]:
+        """Fetch and re-install the latest registry version of each slug concurrently."""
+
+        async def reinstall(slug: str) -> InstalledSkill | None:
+            self._client.invalidate(slug)
+            skill_info = await self._client.aget_skill(slug)
+            if not skill_info:
+                logger.error(f"Skill {slug} not found in registry")
+                return None
+            skill_dir = await self._client.adownload_skill(skill_info, self.managed_dir)
+            if not skill_dir:
+                return None
+            self._forget_skill(skill_dir)
+            return self._load_installed_skill(skill_dir)
+
+        try:
+            results = await asyncio.gather(*(reinstall(slug) for slug in slugs))
+        finally:
+            await self._client.aclose()
+        return dict(zip(slugs, results))
+
     def remove(self, slug: str, from_workspace: bool = False) -> bool:
         """
         Remove an installed skill.
@@ -403,6 +479,8 @@ class SkillManager:
 
         try:
             shutil.rmtree(skill_dir)
+            self._forget_skill(skill_dir)
+            self._client.invalidate(slug)
             logger.info(f"Removed skill: {slug}")
             return True
         except Exception as e:
@@ -419,12 +497,39 @@ class SkillManager:
 
         Checks both installed and registry.
         """
-        # Check installed
-        installed = self.get_installed(slug)
+        return self._build_info(slug, self.get_installed(slug), self._client.get_skill(slug))
 
-        # Check registry
-        registry_info = self._client.get_skill(slug)
+    def info_many(self, slugs: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get info for several skills at once.
+
+        Installed skills are scanned once and each distinct slug is looked up
+        in the registry once. Slugs unknown to both are left out.
+
+        Args:
+            slugs: Skill slugs to look up.
 
+        Returns:
+            Mapping of slug to the same dict that info() returns.
+        """
+        installed = {}
+        for skill in self.list_installed():
+            installed.setdefault(skill.slug, skill)
+
+        results: dict[str, dict[str, Any]] = {}
+        for slug in dict.fromkeys(slugs):
+            data = self._build_info(slug, installed.get(slug), self._client.get_skill(slug))
+            if data:
+                results[slug] = data
+        return results
+
+    def _build_info(
+        self,
+        slug: str,
+        installed: InstalledSkill | None,
+        registry_info: SkillInfo | None,
+    ) -> dict[str, Any] | None:
+        """Combine local and registry state into an info dict."""
         if not installed and not registry_info:
             return None
 
@@ -456,7 +561,40 @@ class SkillManager:
         skill_dir: Path,
         source: str = "managed",
     ) -> InstalledSkill | None:
-        """Load installed skill info from directory."""
+        """
+        Load installed skill info from directory.
+
+        The result is memoized per directory and reused for as long as the
+        mtime and size of SKILL.md and the metadata file are unchanged.
+        """
+        try:
+            skill_stat = (skill_dir / "SKILL.md").stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        try:
+            meta_stat = (skill_dir / self.META_FILE).stat()
+            meta_sig = (meta_stat.st_mtime_ns, meta_stat.st_size)
+        except FileNotFoundError:
+            meta_sig = None
+        signature = (skill_stat.st_mtime_ns, skill_stat.st_size, meta_sig)
+
+        key = (skill_dir, source)
+        cached = self._skill_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        skill = self._read_installed_skill(skill_dir, source)
+        if skill:
+            self._skill_cache[key] = (signature, skill)
+        return skill
+
+    def _forget_skill(self, skill_dir: Path) -> None:
+        """Drop memoized info for a skill directory after writing to it."""
+        self._skill_cache.pop((skill_dir, "managed"), None)
+        self._skill_cache.pop((skill_dir, "workspace"), None)
+
+    def _read_installed_skill(self, skill_dir: Path, source: str) -> InstalledSkill | None:
+        """Read and parse an installed skill from disk."""
         skill_file = skill_dir / "SKILL.md"
         meta_file = skill_dir / self.META_FILE
 
@@ -467,16 +605,19 @@ class SkillManager:
         meta = {}
         if meta_file.exists():
             try:
-                meta = json.loads(meta_file.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
+                meta = orjson.loads(meta_file.read_bytes())
+            except orjson.JSONDecodeError:
                 pass
 
-        # Parse frontmatter from SKILL.md
-        content = skill_file.read_text(encoding="utf-8")
-        frontmatter = self._parse_frontmatter(content)
+        # Hash the file as stored, the same bytes URL installs record in meta
+        raw = skill_file.read_bytes()
+        local_hash = hashlib.sha256(raw).hexdigest()
 
-        # Calculate current hash
-        local_hash = hashlib.sha256(content.encode()).hexdigest()
+        # Parse frontmatter from SKILL.md (with newlines translated like read_text)
+        content = raw.decode("utf-8")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        frontmatter = self._parse_frontmatter(content)
 
         return InstalledSkill(
             name=frontmatter.get("name", skill_dir.name),
@@ -492,25 +633,20 @@ class SkillManager:
 
     def _parse_frontmatter(self, content: str) -> dict:
         """Parse YAML frontmatter from SKILL.md content."""
-        if not content.startswith("---"):
-            return {}
-
-        match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+        match = _FRONTMATTER_RE.match(content)
         if not match:
             return {}
 
-        result = {}
-        for line in match.group(1).split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                result[key.strip()] = value.strip().strip("\"'")
-
-        return result
+        return {
+            key.strip(): value.strip().strip("\"'")
+            for key, value in _FRONTMATTER_LINE_RE.findall(match.group(1))
+        }
 
     def _write_meta(self, skill_dir: Path, meta: dict) -> None:
         """Write skill metadata file."""
         meta_file = skill_dir / self.META_FILE
-        meta_file.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        meta_file.write_bytes(orjson.dumps(meta))
+        self._forget_skill(skill_dir)
 
     def close(self):
         """Close the hub client."""
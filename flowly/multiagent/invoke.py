@@ -1,9 +1,11 @@
 """Agent invocation via CLI subprocess delegation."""
 
 import asyncio
-import json
+import os
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
 from loguru import logger
 
 from flowly.config.schema import MultiAgentConfig
@@ -41,29 +43,90 @@ def resolve_codex_model(short_name: str) -> str:
     return CODEX_MODELS.get(short_name, short_name)
 
 
+_NO_RESPONSE = "Sorry, I could not generate a response."
+
+# Subprocess output is read in chunks of this size
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Working directories already created by invoke_agent in this process
+_ENSURED_DIRS: set[str] = set()
+
+
+def _codex_agent_message(line: str | bytes) -> str | None:
+    """Get the text of a Codex JSONL event if it is a completed agent_message."""
+    # Cheap substring tests first; most events are tool calls and progress
+    if isinstance(line, bytes):
+        if b"agent_message" not in line or b"item.completed" not in line:
+            return None
+    elif "agent_message" not in line or "item.completed" not in line:
+        return None
+    try:
+        data = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or data.get("type") != "item.completed":
+        return None
+    item = data.get("item")
+    if isinstance(item, dict) and item.get("type") == "agent_message":
+        return item.get("text", "")
+    return None
+
+
 def parse_codex_jsonl(output: str) -> str:
     """Parse Codex JSONL output and extract the final agent_message."""
+    # Only the last agent_message counts, so scan from the end
+    for line in reversed(output.split("\n")):
+        text = _codex_agent_message(line)
+        if text is not None:
+            return text or _NO_RESPONSE
+    return _NO_RESPONSE
+
+
+async def _read_codex_stream(stream: asyncio.StreamReader) -> str:
+    """
+    Read Codex JSONL output as it arrives and return the final agent_message.
+
+    Only the last message and the current partial line are kept, so memory
+    stays flat however long the session runs. Lines may be of any length.
+    """
     response = ""
-    for line in output.strip().split("\n"):
-        try:
-            data = json.loads(line)
-            if data.get("type") == "item.completed" and data.get("item", {}).get("type") == "agent_message":
-                response = data["item"].get("text", "")
-        except (json.JSONDecodeError, KeyError):
+    buf = bytearray()
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        buf += chunk
+        # The carried-over partial line has no newline; only search the new chunk
+        end = buf.rfind(b"\n", len(buf) - len(chunk))
+        if end < 0:
             continue
-    return response or "Sorry, I could not generate a response."
+        for line in reversed(bytes(buf[:end]).split(b"\n")):
+            text = _codex_agent_message(line)
+            if text is not None:
+                response = text
+                break
+        del buf[:end + 1]
+
+    text = _codex_agent_message(bytes(buf))
+    if text is not None:
+        response = text
+    return response or _NO_RESPONSE
 
 
-def _build_system_context(agent_id: str, workspace_path: Path) -> str:
+def _build_system_context(agents_md_path: str) -> str:
     """Build system prompt context from agent's AGENTS.md file.
 
     Reads the AGENTS.md from the agent directory and returns it as
     system prompt context for the subprocess.
     """
-    agents_md = workspace_path / agent_id / "AGENTS.md"
-    if agents_md.exists():
-        return agents_md.read_text()
-    return ""
+    try:
+        stat = os.stat(agents_md_path)
+    except OSError:
+        return ""
+    return _read_agents_md(agents_md_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=64)
+def _read_agents_md(path: str, mtime_ns: int, size: int) -> str:
+    """Read an AGENTS.md file; cached until its mtime or size changes."""
+    return Path(path).read_text()
 
 
 async def invoke_agent(
@@ -97,22 +160,24 @@ async def invoke_agent(
     else:
         working_dir = str(Path.home())
 
-    # Ensure working directory exists
-    Path(working_dir).mkdir(parents=True, exist_ok=True)
+    # Ensure working directory exists (once per process; see run_subprocess)
+    if working_dir not in _ENSURED_DIRS:
+        Path(working_dir).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(working_dir)
 
     # Agent config directory (holds AGENTS.md and .claude/CLAUDE.md)
-    agent_dir = str(workspace_path / agent_id)
+    agent_dir = os.path.join(workspace_path, agent_id)
 
     if provider == "anthropic":
         args = ["claude", "--dangerously-skip-permissions"]
-        model_id = resolve_claude_model(agent.model) if agent.model else None
+        model_id = CLAUDE_MODELS.get(agent.model, agent.model) if agent.model else None
         if model_id:
             args.extend(["--model", model_id])
         if continue_conversation:
             args.append("-c")
 
         # Inject teammate context via --append-system-prompt
-        system_context = _build_system_context(agent_id, workspace_path)
+        system_context = _build_system_context(os.path.join(agent_dir, "AGENTS.md"))
         if system_context:
             args.extend(["--append-system-prompt", system_context])
 
@@ -125,7 +190,7 @@ async def invoke_agent(
         args = ["codex", "exec"]
         if continue_conversation:
             args.extend(["resume", "--last"])
-        model_id = resolve_codex_model(agent.model) if agent.model else None
+        model_id = CODEX_MODELS.get(agent.model, agent.model) if agent.model else None
         if model_id:
             args.extend(["--model", model_id])
         args.extend([
@@ -188,23 +253,42 @@ async def run_subprocess(
             stderr=asyncio.subprocess.PIPE,
         )
     except FileNotFoundError:
+        if not os.path.isdir(cwd):
+            # Removed since it was ensured; the next invocation recreates it
+            _ENSURED_DIRS.discard(cwd)
+            raise RuntimeError(f"Working directory not found: {cwd}")
         cmd = args[0]
         hint = INSTALL_HINTS.get(cmd, f"install '{cmd}' and make sure it's in your PATH")
         raise RuntimeError(f"Command '{cmd}' not found. Install it first: {hint}")
 
+    async def read_stdout() -> str:
+        if provider == "openai":
+            return await _read_codex_stream(proc.stdout)
+        output = (await proc.stdout.read()).decode("utf-8", "replace")
+        # CLIs usually end with a single newline; skip the copy when there is nothing to strip
+        if output and (output[0].isspace() or output[-1].isspace()):
+            output = output.strip()
+        return output
+
+    # stderr is drained alongside stdout so neither pipe can fill up and stall the child
     try:
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        output, stderr, _ = await asyncio.wait_for(
+            asyncio.gather(read_stdout(), proc.stderr.read(), proc.wait()),
+            timeout=timeout,
+        )
     except asyncio.TimeoutError:
         proc.kill()
+        # Reap it now rather than leaving a zombie until the loop notices
+        await proc.wait()
         raise RuntimeError(f"Agent subprocess timed out after {timeout}s")
+    except asyncio.CancelledError:
+        # Don't leave the CLI running when the chain is cancelled upstream
+        if proc.returncode is None:
+            proc.kill()
+        raise
 
     if proc.returncode != 0:
         error_msg = stderr.decode().strip() or f"Process exited with code {proc.returncode}"
         raise RuntimeError(f"Agent process failed: {error_msg}")
 
-    output = stdout.decode()
-
-    if provider == "openai":
-        return parse_codex_jsonl(output)
-
-    return output.strip()
+    return output
@@ -1,6 +1,9 @@
 """Team chain orchestrator — sequential and fan-out execution."""
 
 import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -13,15 +16,23 @@ from flowly.multiagent.router import AgentRouter, TeamContext
 
 MAX_CHAIN_DEPTH = 10
 
+# Fan-out invocations running at once, across all chains on this orchestrator
+MAX_CONCURRENT_FANOUT = 6
 
-@dataclass
+# Replies of agents with cache_enabled, kept per (agent, message digest)
+_RESPONSE_CACHE_MAX = 256
+_RESPONSE_CACHE_TTL_S = 600.0
+_clock = time.monotonic
+
+
+@dataclass(slots=True)
 class ChainStep:
     """A single step in a team chain."""
     agent_id: str
     response: str
 
 
-@dataclass
+@dataclass(slots=True)
 class OrchestratorResult:
     """Result of orchestrating an agent or team chain."""
     steps: list[ChainStep] = field(default_factory=list)
@@ -50,6 +61,9 @@ class TeamOrchestrator:
 
     def __init__(self, router: AgentRouter):
         self.router = router
+        self._fanout_sem = asyncio.Semaphore(MAX_CONCURRENT_FANOUT)
+        # (agent_id, message digest) -> (time, response), least recently used first
+        self._response_cache: OrderedDict[tuple[str, bytes], tuple[float, str]] = OrderedDict()
 
     async def execute(
         self,
@@ -113,7 +127,7 @@ class TeamOrchestrator:
                     f"{[m.agent_id for m in mentions]}"
                 )
                 fan_tasks = [
-                    self._invoke_safe(
+                    self._invoke_fanout(
                         agents,
                         m.agent_id,
                         f"[Message from teammate @{current_agent_id}]:\n{m.message}",
@@ -137,6 +151,17 @@ class TeamOrchestrator:
 
         return OrchestratorResult(steps=steps)
 
+    async def _invoke_fanout(
+        self,
+        agents: dict[str, MultiAgentConfig],
+        agent_id: str,
+        message: str,
+        workspace: Path,
+    ) -> str:
+        """Invoke a fan-out target, waiting for a free slot first."""
+        async with self._fanout_sem:
+            return await self._invoke_safe(agents, agent_id, message, workspace)
+
     async def _invoke_safe(
         self,
         agents: dict[str, MultiAgentConfig],
@@ -149,8 +174,25 @@ class TeamOrchestrator:
         if not agent:
             return f"Error: Agent '{agent_id}' not found."
 
+        key = None
+        if agent.cache_enabled:
+            key = (agent_id, hashlib.blake2b(message.encode(), digest_size=16).digest())
+            cached = self._response_cache.get(key)
+            if cached and _clock() - cached[0] < _RESPONSE_CACHE_TTL_S:
+                self._response_cache.move_to_end(key)
+                logger.info(f"Reusing cached response from @{agent_id}")
+                return cached[1]
+
         try:
-            return await invoke_agent(agent, agent_id, message, workspace)
+            response = await invoke_agent(agent, agent_id, message, workspace)
         except Exception as e:
             logger.error(f"Agent @{agent_id} invocation failed: {e}")
             return f"Error invoking @{agent_id}: {e}"
+
+        # Only successful replies are cached
+        if key is not None:
+            self._response_cache[key] = (_clock(), response)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > _RESPONSE_CACHE_MAX:
+                self._response_cache.popitem(last=False)
+        return response
@@ -5,8 +5,14 @@ from dataclasses import dataclass, field
 
 from flowly.config.schema import MultiAgentConfig, MultiAgentTeamConfig
 
+# "@target message" prefix on an incoming message
+_ROUTE_RE = re.compile(r"^@(\S+)\s+([\s\S]*)")
+# Teammate mentions in an agent response: "[@agent_id: message]" tags, or bare "@agent_id"
+_TAG_RE = re.compile(r"\[@(\S+?):\s*([\s\S]*?)\]")
+_BARE_RE = re.compile(r"@(\S+)")
 
-@dataclass
+
+@dataclass(slots=True)
 class RoutingResult:
     """Result of routing a message to an agent."""
     agent_id: str
@@ -14,14 +20,14 @@ class RoutingResult:
     is_team: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class TeammateMention:
     """A teammate mention extracted from agent response."""
     agent_id: str
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamContext:
     """Team context for chain execution."""
     team_id: str
@@ -46,6 +52,22 @@ class AgentRouter:
         self.agents = agents
         self.teams = teams
 
+        # Lowercased name -> id, and agent id -> its first team; the first entry wins,
+        # matching a scan in config order
+        self._agent_by_name: dict[str, str] = {}
+        for agent_id, config in agents.items():
+            self._agent_by_name.setdefault(config.name.lower(), agent_id)
+        self._team_by_name: dict[str, str] = {}
+        self._team_by_agent: dict[str, TeamContext] = {}
+        # Team id -> its members that are configured agents
+        self._teammates: dict[str, frozenset[str]] = {}
+        for team_id, team in teams.items():
+            self._teammates[team_id] = frozenset(a for a in team.agents if a in agents)
+            self._team_by_name.setdefault(team.name.lower(), team_id)
+            context = TeamContext(team_id=team_id, team=team)
+            for agent_id in team.agents:
+                self._team_by_agent.setdefault(agent_id, context)
+
     def route(self, message: str) -> RoutingResult:
         """Parse @agent_id or @team_id prefix from message.
 
@@ -55,7 +77,7 @@ class AgentRouter:
         Returns:
             RoutingResult with agent_id, cleaned message, and team flag.
         """
-        match = re.match(r"^@(\S+)\s+([\s\S]*)", message)
+        match = _ROUTE_RE.match(message)
         if not match:
             return RoutingResult(agent_id="default", message=message)
 
@@ -74,16 +96,16 @@ class AgentRouter:
             )
 
         # Agent name match (case-insensitive)
-        for agent_id, config in self.agents.items():
-            if config.name.lower() == candidate:
-                return RoutingResult(agent_id=agent_id, message=clean_message)
+        agent_id = self._agent_by_name.get(candidate)
+        if agent_id is not None:
+            return RoutingResult(agent_id=agent_id, message=clean_message)
 
         # Team name match (case-insensitive)
-        for team_id, team in self.teams.items():
-            if team.name.lower() == candidate:
-                return RoutingResult(
-                    agent_id=team.leader_agent, message=clean_message, is_team=True
-                )
+        team_id = self._team_by_name.get(candidate)
+        if team_id is not None:
+            return RoutingResult(
+                agent_id=self.teams[team_id].leader_agent, message=clean_message, is_team=True
+            )
 
         # No match — default
         return RoutingResult(agent_id="default", message=message)
@@ -97,22 +119,15 @@ class AgentRouter:
         Returns:
             TeamContext if agent belongs to a team, None otherwise.
         """
-        for team_id, team in self.teams.items():
-            if agent_id in team.agents:
-                return TeamContext(team_id=team_id, team=team)
-        return None
+        return self._team_by_agent.get(agent_id)
 
     def is_teammate(
         self, mentioned_id: str, current_agent_id: str, team_id: str
     ) -> bool:
         """Check if mentioned_id is a valid teammate of current_agent in the given team."""
-        team = self.teams.get(team_id)
-        if not team:
-            return False
         return (
             mentioned_id != current_agent_id
-            and mentioned_id in team.agents
-            and mentioned_id in self.agents
+            and mentioned_id in self._teammates.get(team_id, ())
         )
 
     def extract_teammate_mentions(
@@ -132,24 +147,33 @@ class AgentRouter:
         Returns:
             List of TeammateMention objects.
         """
+        # Both formats need an "@"; most final chain steps mention no one
+        if "@" not in response:
+            return []
+
         results: list[TeammateMention] = []
-        seen: set[str] = set()
+        # Candidates already accepted or rejected; a repeat never changes the outcome
+        checked: set[str] = set()
 
         # Try tag format first: [@agent_id: message]
-        tag_pattern = re.compile(r"\[@(\S+?):\s*([\s\S]*?)\]")
-        for match in tag_pattern.finditer(response):
-            candidate = match.group(1).lower()
-            if candidate not in seen and self.is_teammate(candidate, current_agent_id, team_id):
-                results.append(TeammateMention(agent_id=candidate, message=match.group(2).strip()))
-                seen.add(candidate)
-
-        if results:
-            return results
+        if "[@" in response:
+            for match in _TAG_RE.finditer(response):
+                candidate = match.group(1).lower()
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if self.is_teammate(candidate, current_agent_id, team_id):
+                    results.append(TeammateMention(agent_id=candidate, message=match.group(2).strip()))
+
+            if results:
+                return results
 
         # Fallback: bare @mention (first valid match only)
-        bare_pattern = re.compile(r"@(\S+)")
-        for match in bare_pattern.finditer(response):
+        for match in _BARE_RE.finditer(response):
             candidate = match.group(1).lower()
+            if candidate in checked:
+                continue
+            checked.add(candidate)
             if self.is_teammate(candidate, current_agent_id, team_id):
                 return [TeammateMention(agent_id=candidate, message=response)]
 
@@ -1,5 +1,6 @@
 """Agent directory setup — creates working directories and config files."""
 
+import re
 from pathlib import Path
 
 from loguru import logger
@@ -52,6 +53,21 @@ The orchestrator routes messages in real-time until the chain completes.
 <!-- TEAMMATES_END -->
 """
 
+# The generated teammate section sits between these markers
+_TEAMMATES_START = "<!-- TEAMMATES_START -->"
+_TEAMMATES_END = "<!-- TEAMMATES_END -->"
+_TEAMMATES_RE = re.compile(rf"({re.escape(_TEAMMATES_START)})[\s\S]*?({re.escape(_TEAMMATES_END)})")
+
+# AGENTS_MD_TEMPLATE up to and including the start marker, and from the end marker on
+_TEMPLATE_HEAD = AGENTS_MD_TEMPLATE[:AGENTS_MD_TEMPLATE.index(_TEAMMATES_START) + len(_TEAMMATES_START)]
+_TEMPLATE_TAIL = AGENTS_MD_TEMPLATE[AGENTS_MD_TEMPLATE.index(_TEAMMATES_END):]
+
+
+def _replace_teammates(content: str, block: str) -> str | None:
+    """Swap the teammate section of a file for ``block``; None if it has no markers."""
+    new_content, count = _TEAMMATES_RE.subn(lambda m: m.group(1) + block + m.group(2), content, count=1)
+    return new_content if count else None
+
 
 def ensure_agent_directory(
     agent_dir: Path,
@@ -79,11 +95,11 @@ def ensure_agent_directory(
     claude_dir = agent_dir / ".claude"
     claude_dir.mkdir()
 
-    # Write AGENTS.md with team communication instructions
-    (agent_dir / "AGENTS.md").write_text(AGENTS_MD_TEMPLATE)
-
-    # Update CLAUDE.md with teammate info
-    update_agent_teammates(agent_dir, agent_id, agents, teams)
+    # Write both files with teammate info filled in, rather than writing the
+    # template and reading it back to update it
+    block = _teammates_block(agent_id, agents, teams)
+    (agent_dir / "AGENTS.md").write_text(_TEMPLATE_HEAD + block + _TEMPLATE_TAIL)
+    (claude_dir / "CLAUDE.md").write_text(_new_claude_md(agent_id, block))
 
 
 def update_agent_teammates(
@@ -100,6 +116,39 @@ def update_agent_teammates(
         agents: All configured agents.
         teams: All configured teams.
     """
+    block = _teammates_block(agent_id, agents, teams)
+
+    # Update AGENTS.md between markers; files are only rewritten when they change
+    agents_md = agent_dir / "AGENTS.md"
+    if agents_md.exists():
+        content = agents_md.read_text()
+        new_content = _replace_teammates(content, block)
+        if new_content is not None and new_content != content:
+            agents_md.write_text(new_content)
+
+    # Write/update .claude/CLAUDE.md
+    claude_md = agent_dir / ".claude" / "CLAUDE.md"
+    claude_md.parent.mkdir(parents=True, exist_ok=True)
+
+    content = None
+    if claude_md.exists():
+        content = claude_md.read_text()
+        claude_content = _replace_teammates(content, block)
+        if claude_content is None:
+            claude_content = content.rstrip() + "\n\n" + _TEAMMATES_START + block + _TEAMMATES_END + "\n"
+    else:
+        claude_content = _new_claude_md(agent_id, block)
+
+    if claude_content != content:
+        claude_md.write_text(claude_content)
+
+
+def _teammates_block(
+    agent_id: str,
+    agents: dict[str, MultiAgentConfig],
+    teams: dict[str, MultiAgentTeamConfig],
+) -> str:
+    """Build the teammate section for an agent."""
     # Collect teammates from all teams this agent belongs to
     teammates: list[tuple[str, MultiAgentConfig]] = []
     seen: set[str] = set()
@@ -114,58 +163,22 @@ def update_agent_teammates(
 
     # Build teammate section
     self_agent = agents.get(agent_id)
-    block = ""
+    parts: list[str] = []
     if self_agent:
-        block += f"\n### You\n\n- `@{agent_id}` — **{self_agent.name or agent_id}** ({self_agent.model})\n"
+        parts.append(f"\n### You\n\n- `@{agent_id}` — **{self_agent.name or agent_id}** ({self_agent.model})\n")
     if teammates:
-        block += "\n### Your Teammates\n\n"
-        block += "You can message them using `[@agent_id: message]` tag format. This WORKS — the orchestrator delivers it.\n\n"
-        for tid, cfg in teammates:
-            block += f"- `@{tid}` — **{cfg.name or tid}** ({cfg.model})\n"
-
-    # Update AGENTS.md between markers
-    agents_md = agent_dir / "AGENTS.md"
-    if agents_md.exists():
-        content = agents_md.read_text()
-        start_marker = "<!-- TEAMMATES_START -->"
-        end_marker = "<!-- TEAMMATES_END -->"
-        start_idx = content.find(start_marker)
-        end_idx = content.find(end_marker)
-        if start_idx != -1 and end_idx != -1:
-            new_content = (
-                content[: start_idx + len(start_marker)]
-                + block
-                + content[end_idx:]
-            )
-            agents_md.write_text(new_content)
-
-    # Write/update .claude/CLAUDE.md
-    claude_md = agent_dir / ".claude" / "CLAUDE.md"
-    claude_md.parent.mkdir(parents=True, exist_ok=True)
-
-    claude_content = ""
-    start_marker = "<!-- TEAMMATES_START -->"
-    end_marker = "<!-- TEAMMATES_END -->"
-
-    if claude_md.exists():
-        claude_content = claude_md.read_text()
-        start_idx = claude_content.find(start_marker)
-        end_idx = claude_content.find(end_marker)
-        if start_idx != -1 and end_idx != -1:
-            claude_content = (
-                claude_content[: start_idx + len(start_marker)]
-                + block
-                + claude_content[end_idx:]
-            )
-        else:
-            claude_content = claude_content.rstrip() + "\n\n" + start_marker + block + end_marker + "\n"
-    else:
-        claude_content = (
-            f"# Agent: @{agent_id}\n\n"
-            "You are part of a multi-agent team. "
-            "To delegate work to a teammate, use `[@agent_id: message]` in your response. "
-            "The Flowly orchestrator will deliver the message and return their response.\n\n"
-            f"{start_marker}{block}{end_marker}\n"
-        )
-
-    claude_md.write_text(claude_content)
+        parts.append("\n### Your Teammates\n\n")
+        parts.append("You can message them using `[@agent_id: message]` tag format. This WORKS — the orchestrator delivers it.\n\n")
+        parts.extend(f"- `@{tid}` — **{cfg.name or tid}** ({cfg.model})\n" for tid, cfg in teammates)
+    return "".join(parts)
+
+
+def _new_claude_md(agent_id: str, block: str) -> str:
+    """Initial CLAUDE.md for an agent, with its teammate section."""
+    return (
+        f"# Agent: @{agent_id}\n\n"
+        "You are part of a multi-agent team. "
+        "To delegate work to a teammate, use `[@agent_id: message]` in your response. "
+        "The Flowly orchestrator will deliver the message and return their response.\n\n"
+        f"{_TEAMMATES_START}{block}{_TEAMMATES_END}\n"
+    )
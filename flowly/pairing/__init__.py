@@ -6,6 +6,7 @@ from flowly.pairing.store import (
     upsert_pairing_request,
     approve_pairing_code,
     read_allow_from_store,
+    read_allow_from_set,
     add_allow_from_entry,
     remove_allow_from_entry,
 )
@@ -16,6 +17,7 @@ __all__ = [
     "upsert_pairing_request",
     "approve_pairing_code",
     "read_allow_from_store",
+    "read_allow_from_set",
     "add_allow_from_entry",
     "remove_allow_from_entry",
 ]
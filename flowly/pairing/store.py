@@ -1,13 +1,15 @@
 """Pairing store for secure channel authorization."""
 
-import json
 import os
 import secrets
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Literal
+from typing import Iterator, Literal
 
+import orjson
 from filelock import FileLock
 from loguru import logger
 
@@ -17,8 +19,31 @@ PAIRING_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # No ambiguous chars
 PAIRING_TTL = timedelta(hours=1)
 PAIRING_MAX_PENDING = 3
 
+# Maps a random byte to a code character via its low 5 bits; the alphabet has
+# exactly 32 characters, so every character is equally likely
+_CODE_TABLE = bytes(PAIRING_CODE_ALPHABET.encode("ascii")[b & 0x1F] for b in range(256))
+
+# last_seen_at is only used to order pending requests; repeat messages within
+# this window don't rewrite the pairing file just to bump it
+_LAST_SEEN_RESOLUTION = timedelta(minutes=1)
+
 Channel = Literal["telegram", "whatsapp"]
 
+# Parsed file contents keyed by path, valid while (mtime_ns, size, inode) match.
+# Every write replaces the file, so the inode alone changes on each write.
+_parse_cache: dict[Path, tuple[tuple[int, int, int], dict]] = {}
+
+# allow_from entries as a set, keyed by path and tied to the parsed file they came from
+_allow_from_sets: dict[Path, tuple[dict, frozenset[str]]] = {}
+
+# Credentials directories already created in this process; writes recreate a
+# removed one, and the file lock creates its own parent directory
+_created_dirs: set[Path] = set()
+
+# Per store file: a thread lock, so threads of one process queue without polling
+# the file lock, and the FileLock guarding against other processes (the CLI)
+_store_locks: dict[Path, tuple[threading.RLock, FileLock]] = {}
+
 
 @dataclass
 class PairingRequest:
@@ -33,7 +58,9 @@ class PairingRequest:
 def _get_credentials_dir() -> Path:
     """Get the credentials directory."""
     creds_dir = Path.home() / ".flowly" / "credentials"
-    creds_dir.mkdir(parents=True, exist_ok=True)
+    if creds_dir not in _created_dirs:
+        creds_dir.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(creds_dir)
     return creds_dir
 
 
@@ -47,54 +74,133 @@ def _get_allow_from_path(channel: Channel) -> Path:
     return _get_credentials_dir() / f"{channel}-allowFrom.json"
 
 
+@contextmanager
+def _store_lock(path: Path) -> Iterator[None]:
+    """Hold the thread and file locks for a store file."""
+    locks = _store_locks.get(path)
+    if locks is None:
+        locks = _store_locks.setdefault(
+            path, (threading.RLock(), FileLock(path.with_suffix(".lock"), timeout=10))
+        )
+    thread_lock, file_lock = locks
+    with thread_lock, file_lock:
+        yield
+
+
 def _read_json_file(path: Path, default: dict) -> dict:
-    """Safely read a JSON file."""
+    """
+    Safely read a JSON file.
+
+    The parsed result is cached until the file changes and shared between
+    callers, so it must not be mutated.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return default
+    except OSError as e:
+        logger.warning(f"Error reading {path}: {e}")
+        return default
+
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _parse_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
     try:
-        if path.exists():
-            return json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, IOError) as e:
+        data = orjson.loads(path.read_bytes())
+    except (orjson.JSONDecodeError, OSError) as e:
         logger.warning(f"Error reading {path}: {e}")
-    return default
+        return default
+    _parse_cache[path] = (stamp, data)
+    return data
 
 
 def _write_json_file(path: Path, data: dict) -> None:
-    """Safely write a JSON file with atomic rename."""
+    """
+    Safely write a JSON file with atomic rename.
+
+    The written data becomes the cached parse of the file, so it must not be
+    mutated afterwards.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(f".{secrets.token_hex(4)}.tmp")
-    tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     try:
         tmp_path.chmod(0o600)
     except OSError:
         pass  # chmod not effective on Windows NTFS
+    # Stat before the rename: the replaced file keeps this inode and mtime, and
+    # another process may replace it again right after
+    st = tmp_path.stat()
     os.replace(str(tmp_path), str(path))
+    _parse_cache[path] = ((st.st_mtime_ns, st.st_size, st.st_ino), data)
 
 
 def _generate_code(existing_codes: set[str]) -> str:
     """Generate a unique pairing code."""
     for _ in range(500):
-        code = "".join(secrets.choice(PAIRING_CODE_ALPHABET) for _ in range(PAIRING_CODE_LENGTH))
+        code = secrets.token_bytes(PAIRING_CODE_LENGTH).translate(_CODE_TABLE).decode("ascii")
         if code not in existing_codes:
             return code
     raise RuntimeError("Failed to generate unique pairing code")
 
 
-def _is_expired(request: PairingRequest) -> bool:
-    """Check if a pairing request has expired."""
+def _is_expired(created_at: str) -> bool:
+    """Check if a pairing request created at the given time has expired."""
     try:
-        created = datetime.fromisoformat(request.created_at.replace("Z", "+00:00"))
+        created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
         return datetime.now(created.tzinfo) - created > PAIRING_TTL
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, AttributeError):
         return True
 
 
-def _prune_requests(requests: list[PairingRequest]) -> tuple[list[PairingRequest], bool]:
+def _load_requests(path: Path) -> list[dict]:
+    """Read the raw request dicts from a pairing file, skipping malformed entries."""
+    data = _read_json_file(path, {"version": 1, "requests": []})
+    requests = []
+    for r in data.get("requests", []):
+        if isinstance(r, dict) and "id" in r and "code" in r:
+            r = dict(r)  # the parsed file is shared through the cache
+            r.setdefault("last_seen_at", r.get("created_at"))
+            r.setdefault("meta", {})
+            requests.append(r)
+    return requests
+
+
+def _write_requests(path: Path, requests: list[dict]) -> None:
+    """Write raw request dicts back to a pairing file."""
+    _write_json_file(path, {"version": 1, "requests": requests})
+
+
+def _to_request(r: dict) -> PairingRequest:
+    """Build the public PairingRequest for a raw request dict."""
+    return PairingRequest(
+        id=r["id"],
+        code=r["code"],
+        created_at=r["created_at"],
+        last_seen_at=r["last_seen_at"],
+        meta=dict(r["meta"]),
+    )
+
+
+def _seen_since(request: dict, now: datetime) -> bool:
+    """Check if a request's last_seen_at is within _LAST_SEEN_RESOLUTION of now (UTC)."""
+    try:
+        last_seen = datetime.fromisoformat(request["last_seen_at"].removesuffix("Z"))
+    except (ValueError, TypeError, AttributeError):
+        return False
+    return now - last_seen < _LAST_SEEN_RESOLUTION
+
+
+def _prune_requests(requests: list[dict]) -> tuple[list[dict], bool]:
     """Remove expired requests, return (kept, was_modified)."""
-    kept = [r for r in requests if not _is_expired(r)]
+    kept = [r for r in requests if not _is_expired(r.get("created_at"))]
 
     # Also limit to max pending
     if len(kept) > PAIRING_MAX_PENDING:
         # Sort by last_seen_at and keep most recent
-        kept.sort(key=lambda r: r.last_seen_at)
+        kept.sort(key=lambda r: r["last_seen_at"])
         kept = kept[-PAIRING_MAX_PENDING:]
 
     return kept, len(kept) != len(requests)
@@ -103,40 +209,14 @@ def _prune_requests(requests: list[PairingRequest]) -> tuple[list[PairingRequest
 def list_pairing_requests(channel: Channel) -> list[PairingRequest]:
     """List pending pairing requests for a channel."""
     path = _get_pairing_path(channel)
-    lock_path = path.with_suffix(".lock")
-
-    with FileLock(lock_path, timeout=10):
-        data = _read_json_file(path, {"version": 1, "requests": []})
-        requests = [
-            PairingRequest(
-                id=r["id"],
-                code=r["code"],
-                created_at=r["created_at"],
-                last_seen_at=r.get("last_seen_at", r["created_at"]),
-                meta=r.get("meta", {}),
-            )
-            for r in data.get("requests", [])
-            if isinstance(r, dict) and "id" in r and "code" in r
-        ]
-
-        pruned, modified = _prune_requests(requests)
+
+    with _store_lock(path):
+        pruned, modified = _prune_requests(_load_requests(path))
 
         if modified:
-            _write_json_file(path, {
-                "version": 1,
-                "requests": [
-                    {
-                        "id": r.id,
-                        "code": r.code,
-                        "created_at": r.created_at,
-                        "last_seen_at": r.last_seen_at,
-                        "meta": r.meta,
-                    }
-                    for r in pruned
-                ],
-            })
-
-        return sorted(pruned, key=lambda r: r.created_at)
+            _write_requests(path, pruned)
+
+        return [_to_request(r) for r in sorted(pruned, key=lambda r: r["created_at"])]
 
 
 def upsert_pairing_request(
@@ -150,53 +230,25 @@ def upsert_pairing_request(
     Returns (code, created) where created=True if new request.
     """
     path = _get_pairing_path(channel)
-    lock_path = path.with_suffix(".lock")
-
-    with FileLock(lock_path, timeout=10):
-        data = _read_json_file(path, {"version": 1, "requests": []})
-        requests = [
-            PairingRequest(
-                id=r["id"],
-                code=r["code"],
-                created_at=r["created_at"],
-                last_seen_at=r.get("last_seen_at", r["created_at"]),
-                meta=r.get("meta", {}),
-            )
-            for r in data.get("requests", [])
-            if isinstance(r, dict) and "id" in r and "code" in r
-        ]
 
+    with _store_lock(path):
         # Prune expired
-        requests, _ = _prune_requests(requests)
+        requests, pruned = _prune_requests(_load_requests(path))
 
-        now = datetime.utcnow().isoformat() + "Z"
-        existing_codes = {r.code.upper() for r in requests}
+        now_dt = datetime.utcnow()
+        now = now_dt.isoformat() + "Z"
 
         # Check if request already exists
-        for i, r in enumerate(requests):
-            if r.id == id:
+        for r in requests:
+            if r["id"] == id:
+                if not pruned and (not meta or meta == r["meta"]) and _seen_since(r, now_dt):
+                    return r["code"], False
                 # Update last_seen_at
-                requests[i] = PairingRequest(
-                    id=r.id,
-                    code=r.code,
-                    created_at=r.created_at,
-                    last_seen_at=now,
-                    meta=meta or r.meta,
-                )
-                _write_json_file(path, {
-                    "version": 1,
-                    "requests": [
-                        {
-                            "id": req.id,
-                            "code": req.code,
-                            "created_at": req.created_at,
-                            "last_seen_at": req.last_seen_at,
-                            "meta": req.meta,
-                        }
-                        for req in requests
-                    ],
-                })
-                return r.code, False
+                r["last_seen_at"] = now
+                if meta:
+                    r["meta"] = meta
+                _write_requests(path, requests)
+                return r["code"], False
 
         # Check max pending limit
         if len(requests) >= PAIRING_MAX_PENDING:
@@ -204,29 +256,15 @@ def upsert_pairing_request(
             return "", False
 
         # Create new request
-        code = _generate_code(existing_codes)
-        new_request = PairingRequest(
-            id=id,
-            code=code,
-            created_at=now,
-            last_seen_at=now,
-            meta=meta or {},
-        )
-        requests.append(new_request)
-
-        _write_json_file(path, {
-            "version": 1,
-            "requests": [
-                {
-                    "id": r.id,
-                    "code": r.code,
-                    "created_at": r.created_at,
-                    "last_seen_at": r.last_seen_at,
-                    "meta": r.meta,
-                }
-                for r in requests
-            ],
+        code = _generate_code({r["code"].upper() for r in requests})
+        requests.append({
+            "id": id,
+            "code": code,
+            "created_at": now,
+            "last_seen_at": now,
+            "meta": meta or {},
         })
+        _write_requests(path, requests)
 
         return code, True
 
@@ -242,30 +280,16 @@ def approve_pairing_code(channel: Channel, code: str) -> PairingRequest | None:
         return None
 
     path = _get_pairing_path(channel)
-    lock_path = path.with_suffix(".lock")
-
-    with FileLock(lock_path, timeout=10):
-        data = _read_json_file(path, {"version": 1, "requests": []})
-        requests = [
-            PairingRequest(
-                id=r["id"],
-                code=r["code"],
-                created_at=r["created_at"],
-                last_seen_at=r.get("last_seen_at", r["created_at"]),
-                meta=r.get("meta", {}),
-            )
-            for r in data.get("requests", [])
-            if isinstance(r, dict) and "id" in r and "code" in r
-        ]
 
+    with _store_lock(path):
         # Prune expired
-        requests, _ = _prune_requests(requests)
+        requests, _ = _prune_requests(_load_requests(path))
 
         # Find matching request
         approved = None
         remaining = []
         for r in requests:
-            if r.code.upper() == code:
+            if r["code"].upper() == code:
                 approved = r
             else:
                 remaining.append(r)
@@ -274,33 +298,40 @@ def approve_pairing_code(channel: Channel, code: str) -> PairingRequest | None:
             return None
 
         # Remove from pending
-        _write_json_file(path, {
-            "version": 1,
-            "requests": [
-                {
-                    "id": r.id,
-                    "code": r.code,
-                    "created_at": r.created_at,
-                    "last_seen_at": r.last_seen_at,
-                    "meta": r.meta,
-                }
-                for r in remaining
-            ],
-        })
+        _write_requests(path, remaining)
 
         # Add to allow_from store
-        add_allow_from_entry(channel, approved.id)
+        add_allow_from_entry(channel, approved["id"])
 
-        return approved
+        return _to_request(approved)
 
 
 def read_allow_from_store(channel: Channel) -> list[str]:
     """Read the allow_from store for a channel."""
     path = _get_allow_from_path(channel)
+    # No lock: writers replace the file atomically, so a read sees either
+    # the old or the new list, and never waits behind a writer
     data = _read_json_file(path, {"version": 1, "allow_from": []})
     return [str(e).strip() for e in data.get("allow_from", []) if e]
 
 
+def read_allow_from_set(channel: Channel) -> frozenset[str]:
+    """
+    Read the allow_from store for a channel as a set.
+
+    Rebuilt only when the file changes, so checking a sender costs a stat()
+    and a set lookup.
+    """
+    path = _get_allow_from_path(channel)
+    data = _read_json_file(path, {"version": 1, "allow_from": []})
+    cached = _allow_from_sets.get(path)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    entries = frozenset(str(e).strip() for e in data.get("allow_from", []) if e)
+    _allow_from_sets[path] = (data, entries)
+    return entries
+
+
 def add_allow_from_entry(channel: Channel, entry: str) -> bool:
     """Add an entry to the allow_from store. Returns True if added."""
     entry = str(entry).strip()
@@ -308,9 +339,8 @@ def add_allow_from_entry(channel: Channel, entry: str) -> bool:
         return False
 
     path = _get_allow_from_path(channel)
-    lock_path = path.with_suffix(".lock")
 
-    with FileLock(lock_path, timeout=10):
+    with _store_lock(path):
         data = _read_json_file(path, {"version": 1, "allow_from": []})
         allow_from = [str(e).strip() for e in data.get("allow_from", []) if e]
 
@@ -329,9 +359,8 @@ def remove_allow_from_entry(channel: Channel, entry: str) -> bool:
         return False
 
     path = _get_allow_from_path(channel)
-    lock_path = path.with_suffix(".lock")
 
-    with FileLock(lock_path, timeout=10):
+    with _store_lock(path):
         data = _read_json_file(path, {"version": 1, "allow_from": []})
         allow_from = [str(e).strip() for e in data.get("allow_from", []) if e]
 
@@ -1,14 +1,15 @@
 """Session management for conversation history."""
 
-import json
 import os
 import secrets
 from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+import orjson
 from loguru import logger
 
 from flowly.utils.helpers import ensure_dir, safe_filename
@@ -16,6 +17,30 @@ from flowly.utils.helpers import ensure_dir, safe_filename
 # Maximum number of sessions to keep in memory cache (LRU eviction)
 _MAX_CACHED_SESSIONS = 200
 
+# Messages may carry non-string keys (e.g. tool payloads); stringify them like json.dumps did
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS
+_LINE_OPTIONS = _DUMP_OPTIONS | orjson.OPT_APPEND_NEWLINE
+
+
+def _jsonl(records: list[dict[str, Any]]) -> bytes:
+    """Encode records as JSONL in a single buffer."""
+    return b"".join([orjson.dumps(r, option=_LINE_OPTIONS) for r in records])
+
+
+@lru_cache(maxsize=4096)
+def _session_filename(key: str) -> str:
+    """Get the file name for a session key."""
+    return f"{safe_filename(key.replace(':', '_'))}.jsonl"
+
+
+@dataclass(slots=True, frozen=True)
+class _SavedState:
+    """What a session file holds after a save."""
+    messages: list[dict[str, Any]]  # the session's message list object at the time
+    count: int  # messages written
+    header: bytes  # created_at and metadata as written
+    size: int  # file size in bytes
+
 
 @dataclass
 class Session:
@@ -30,6 +55,8 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # State of the file after the last save, for append-only saves (see SessionManager.save)
+    _saved: _SavedState | None = field(default=None, init=False, repr=False, compare=False)
 
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -79,8 +106,7 @@ class SessionManager:
 
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+        return self.sessions_dir / _session_filename(key)
 
     def get_or_create(self, key: str) -> Session:
         """
@@ -122,15 +148,15 @@ class SessionManager:
             created_at = None
             corrupt_lines = 0
 
-            with open(path, encoding="utf-8") as f:
+            with open(path, "rb") as f:
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
                     if not line:
                         continue
 
                     try:
-                        data = json.loads(line)
-                    except json.JSONDecodeError:
+                        data = orjson.loads(line)
+                    except orjson.JSONDecodeError:
                         corrupt_lines += 1
                         if corrupt_lines <= 3:
                             logger.warning(f"Skipped corrupt line {line_num} in session {key}")
@@ -164,26 +190,75 @@ class SessionManager:
             return None
 
     def save(self, session: Session) -> None:
-        """Save a session to disk atomically."""
+        """
+        Save a session to disk.
+
+        When only new messages were added since the last save, they are
+        appended to the file. Otherwise (first save in this process, changed
+        metadata, cleared history, or a file changed behind our back) the
+        whole file is rewritten atomically.
+        """
         path = self._get_session_path(session.key)
+        header = orjson.dumps([session.created_at.isoformat(), session.metadata], option=_DUMP_OPTIONS)
+
+        saved = session._saved
+        if (
+            saved is not None
+            and saved.messages is session.messages
+            and saved.header == header
+            and len(session.messages) >= saved.count
+            and self._file_size(path) == saved.size
+        ):
+            self._append(session, path, saved, header)
+        else:
+            self._rewrite(session, path, header)
+
+        # Update cache
+        self._cache[session.key] = session
+        if session.key in self._cache:
+            self._cache.move_to_end(session.key)
+
+    @staticmethod
+    def _file_size(path: Path) -> int | None:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return None
+
+    @staticmethod
+    def _append(session: Session, path: Path, saved: _SavedState, header: bytes) -> None:
+        """Append the messages added since the last save."""
+        new_messages = session.messages[saved.count:]
+        if not new_messages:
+            return
+        payload = _jsonl(new_messages)
+        # Cleared first: if the write fails midway the size no longer matches
+        # and the next save rewrites the file
+        session._saved = None
+        with open(path, "ab") as f:
+            f.write(payload)
+            size = f.tell()
+        session._saved = _SavedState(session.messages, len(session.messages), header, size)
+
+    @staticmethod
+    def _rewrite(session: Session, path: Path, header: bytes) -> None:
+        """Write the whole session to disk atomically."""
         path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Metadata first, then messages
+        metadata_line = {
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata
+        }
+        payload = _jsonl([metadata_line, *session.messages])
+
         # Write to temp file first, then atomic rename
         tmp_path = path.with_suffix(f".tmp.{secrets.token_hex(4)}")
+        session._saved = None
         try:
-            with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
-                # Write metadata first
-                metadata_line = {
-                    "_type": "metadata",
-                    "created_at": session.created_at.isoformat(),
-                    "updated_at": session.updated_at.isoformat(),
-                    "metadata": session.metadata
-                }
-                f.write(json.dumps(metadata_line) + "\n")
-
-                # Write messages
-                for msg in session.messages:
-                    f.write(json.dumps(msg) + "\n")
+            tmp_path.write_bytes(payload)
 
             # Atomic rename (POSIX guarantees this is atomic on same filesystem)
             os.replace(str(tmp_path), str(path))
@@ -195,10 +270,7 @@ class SessionManager:
                 pass
             raise
 
-        # Update cache
-        self._cache[session.key] = session
-        if session.key in self._cache:
-            self._cache.move_to_end(session.key)
+        session._saved = _SavedState(session.messages, len(session.messages), header, len(payload))
 
     def delete(self, key: str) -> bool:
         """
@@ -232,15 +304,21 @@ class SessionManager:
         for path in self.sessions_dir.glob("*.jsonl"):
             try:
                 # Read just the metadata line
-                with open(path, encoding="utf-8") as f:
+                with open(path, "rb") as f:
                     first_line = f.readline().strip()
                     if first_line:
-                        data = json.loads(first_line)
+                        data = orjson.loads(first_line)
                         if data.get("_type") == "metadata":
+                            # Appending saves don't touch the metadata line;
+                            # the file's mtime is the later update then
+                            updated_at = data.get("updated_at")
+                            modified = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+                            if not updated_at or modified > updated_at:
+                                updated_at = modified
                             sessions.append({
                                 "key": path.stem.replace("_", ":"),
                                 "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
+                                "updated_at": updated_at,
                                 "path": str(path)
                             })
             except Exception:
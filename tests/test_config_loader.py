@@ -124,6 +124,15 @@ class TestLoadConfig:
         assert config.providers.openrouter.api_key == "sk-test"
         assert config.agents.defaults.max_tokens == 4096
 
+    def test_unknown_keys_are_ignored(self, tmp_path: Path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({
+            "gateway": {"port": 9999, "legacyOption": True},
+            "someFutureSection": {"enabled": True},
+        }))
+        config = load_config(config_file)
+        assert config.gateway.port == 9999
+
     def test_invalid_json_returns_default(self, tmp_path: Path):
         config_file = tmp_path / "config.json"
         config_file.write_text("not json{{{")
@@ -137,6 +146,22 @@ class TestLoadConfig:
         config = load_config(config_file)
         assert isinstance(config, Config)
 
+    def test_repeated_loads_are_independent(self, tmp_path: Path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"gateway": {"port": 9999}}))
+        first = load_config(config_file)
+        first.gateway.port = 1234
+        second = load_config(config_file)
+        assert second is not first
+        assert second.gateway.port == 9999
+
+    def test_reload_picks_up_changes(self, tmp_path: Path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"gateway": {"port": 9999}}))
+        assert load_config(config_file).gateway.port == 9999
+        config_file.write_text(json.dumps({"gateway": {"port": 80}}))
+        assert load_config(config_file).gateway.port == 80
+
 
 class TestSaveConfig:
     def test_save_creates_file(self, tmp_path: Path):
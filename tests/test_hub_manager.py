@@ -0,0 +1,558 @@
+"""Tests for the hub skill manager."""
+
+import asyncio
+import hashlib
+import io
+import json
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from flowly.hub import client as client_module
+from flowly.hub import manager as manager_module
+from flowly.hub.client import SkillInfo
+from flowly.hub.manager import SkillManager
+
+
+def _write_skill(directory: Path, slug: str, version: str = "1.0.0", name: str | None = None) -> Path:
+    skill_dir = directory / slug
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(
+        f'---\nname: {name or slug}\ndescription: "The {slug} skill"\n---\n\n# {slug}\n',
+        encoding="utf-8",
+    )
+    (skill_dir / SkillManager.META_FILE).write_text(
+        f'{{"slug": "{slug}", "version": "{version}", "source": "{slug}"}}', encoding="utf-8"
+    )
+    return skill_dir
+
+
+def _registry_skill(slug: str, version: str) -> SkillInfo:
+    return SkillInfo.from_dict({"name": slug, "slug": slug, "version": version})
+
+
+@pytest.fixture
+def manager(tmp_path: Path):
+    manager = SkillManager(managed_dir=tmp_path / "managed", workspace_dir=tmp_path / "workspace")
+    yield manager
+    manager.close()
+
+
+def _tarball(files: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class FakeRegistry:
+    """Serves skill metadata and SKILL.md downloads over httpx mock transports."""
+
+    def __init__(self):
+        self.versions: dict[str, str] = {}
+        self.tarballs: dict[str, bytes] = {}
+        self.hashes: dict[str, str] = {}
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # "owner/repo/branch/path" -> (content, git file mode)
+        self.github: dict[str, tuple[bytes, str]] = {}
+
+    def _github(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.github.com":
+            _, _, repo_owner, repo_name, _, _, branch = request.url.path.split("/")
+            root = f"{repo_owner}/{repo_name}/{branch}/"
+            tree = [
+                {"path": key[len(root):], "type": "blob", "mode": mode}
+                for key, (_, mode) in self.github.items() if key.startswith(root)
+            ]
+            return httpx.Response(200, json={"tree": tree, "truncated": False})
+        key = request.url.path.lstrip("/")
+        if key not in self.github:
+            return httpx.Response(404)
+        return httpx.Response(200, content=self.github[key][0])
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if request.url.host != "hub.test":
+            return self._github(request)
+        if request.url.path == "/api/skills/search":
+            return httpx.Response(200, json={"skills": [{"slug": slug} for slug in self.versions]})
+        if request.url.path.startswith("/raw/"):
+            return httpx.Response(200, text="---\nname: from-url\n---\nbody\n")
+        parts = request.url.path.strip("/").split("/")
+        slug = parts[2]
+        if slug not in self.versions:
+            return httpx.Response(404)
+        if parts[-1] == "download":
+            if slug in self.tarballs:
+                return httpx.Response(200, content=self.tarballs[slug], headers={"content-type": "application/gzip"})
+            return httpx.Response(200, text=f"---\nname: {slug}\n---\nv{self.versions[slug]}\n")
+        return httpx.Response(200, json={
+            "name": slug,
+            "slug": slug,
+            "version": self.versions[slug],
+            "download_url": f"https://hub.test/api/skills/{slug}/download",
+            "hash": self.hashes.get(slug),
+        })
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        return self._respond(request)
+
+    async def ahandler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return self._respond(request)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def hub(manager: SkillManager, monkeypatch) -> FakeRegistry:
+    fake = FakeRegistry()
+    client = manager._client
+    client.registry_url = "https://hub.test"
+    client._client = httpx.Client(transport=httpx.MockTransport(fake.handler))
+
+    def async_client() -> httpx.AsyncClient:
+        if client._aclient is None:
+            client._aclient = httpx.AsyncClient(transport=httpx.MockTransport(fake.ahandler))
+        return client._aclient
+
+    monkeypatch.setattr(client, "_async_client", async_client)
+    return fake
+
+
+@pytest.fixture
+def registry(manager: SkillManager, monkeypatch) -> dict:
+    skills: dict[str, SkillInfo] = {}
+    calls: list[str] = []
+
+    def get_skill(slug: str, version: str | None = None) -> SkillInfo | None:
+        calls.append(slug)
+        return skills.get(slug)
+
+    monkeypatch.setattr(manager._client, "get_skill", get_skill)
+    return {"skills": skills, "calls": calls}
+
+
+# ── Installed skills ────────────────────────────────────────────────
+
+
+class TestInstalled:
+    def test_list_installed(self, manager: SkillManager):
+        _write_skill(manager.managed_dir, "github", "1.2.0")
+        _write_skill(manager.workspace_dir / "skills", "local")
+
+        skills = {s.slug: s for s in manager.list_installed()}
+        assert set(skills) == {"github", "local"}
+        assert skills["github"].version == "1.2.0"
+        assert skills["github"].description == "The github skill"
+        assert [s.slug for s in manager.list_installed(include_workspace=False)] == ["github"]
+
+    def test_list_many_installed(self, manager: SkillManager):
+        for i in range(12):
+            _write_skill(manager.managed_dir, f"skill-{i}", f"1.0.{i}")
+        (manager.managed_dir / "no-skill-md").mkdir()
+        (manager.managed_dir / "stray-file").write_text("x", encoding="utf-8")
+        _write_skill(manager.workspace_dir / "skills", "local")
+
+        skills = manager.list_installed()
+        assert sorted(s.slug for s in skills) == sorted([f"skill-{i}" for i in range(12)] + ["local"])
+        assert {s.slug: s.version for s in skills}["skill-7"] == "1.0.7"
+        assert skills[-1].slug == "local"
+
+    def test_list_installed_without_workspace_dir(self, tmp_path: Path):
+        with SkillManager(managed_dir=tmp_path / "managed", workspace_dir=tmp_path / "missing") as manager:
+            assert manager.list_installed() == []
+
+    def test_get_installed_prefers_managed(self, manager: SkillManager):
+        _write_skill(manager.managed_dir, "github", "1.0.0")
+        _write_skill(manager.workspace_dir / "skills", "github", "2.0.0")
+        assert manager.get_installed("github").version == "1.0.0"
+        assert manager.get_installed("missing") is None
+
+    def test_get_installed_skips_non_skills(self, manager: SkillManager):
+        (manager.managed_dir / "empty").mkdir()
+        _write_skill(manager.workspace_dir / "skills", "empty", "2.0.0")
+        (manager.managed_dir / "stray").write_text("x", encoding="utf-8")
+
+        assert manager.get_installed("empty").version == "2.0.0"
+        assert manager.get_installed("stray") is None
+
+    def test_modified_detection(self, manager: SkillManager):
+        skill_dir = _write_skill(manager.managed_dir, "github")
+        skill = manager.get_installed("github")
+        assert skill.is_modified is False
+
+        meta = skill_dir / SkillManager.META_FILE
+        meta.write_text(
+            f'{{"slug": "github", "version": "1.0.0", "hash": "{skill.local_hash}"}}', encoding="utf-8"
+        )
+        assert manager.get_installed("github").is_modified is False
+
+        (skill_dir / "SKILL.md").write_text("---\nname: github\n---\nchanged\n", encoding="utf-8")
+        assert manager.get_installed("github").is_modified is True
+
+    def test_unchanged_skills_are_not_reread(self, manager: SkillManager, monkeypatch):
+        _write_skill(manager.managed_dir, "github")
+        first = manager.list_installed()
+
+        reads = []
+        original = manager._read_installed_skill
+        monkeypatch.setattr(manager, "_read_installed_skill", lambda *a: reads.append(a) or original(*a))
+        assert manager.list_installed() == first
+        assert manager.get_installed("github") is first[0]
+        assert reads == []
+
+    def test_corrupt_meta_is_ignored(self, manager: SkillManager):
+        skill_dir = _write_skill(manager.managed_dir, "github", "1.2.0")
+        (skill_dir / SkillManager.META_FILE).write_bytes(b'{"slug": "github", \xff')
+        skill = manager.get_installed("github")
+        assert skill.slug == "github"
+        assert skill.version == "unknown"
+
+    def test_cached_skills_are_immutable(self, manager: SkillManager):
+        _write_skill(manager.managed_dir, "github")
+        skill = manager.get_installed("github")
+        with pytest.raises(AttributeError):
+            skill.version = "9.9.9"
+        assert manager.get_installed("github").version == "1.0.0"
+
+    def test_changed_skill_is_reread(self, manager: SkillManager):
+        skill_dir = _write_skill(manager.managed_dir, "github")
+        assert manager.get_installed("github").description == "The github skill"
+
+        (skill_dir / "SKILL.md").write_text('---\nname: github\ndescription: "Updated text"\n---\n', encoding="utf-8")
+        assert manager.get_installed("github").description == "Updated text"
+
+    def test_frontmatter_values_stay_strings(self, manager: SkillManager):
+        content = '---\nname: x\ndescription: Does a: b\nmetadata: {"flowly":{"emoji":"x"}}\nversion: 1.0\n---\nbody'
+        assert manager._parse_frontmatter(content) == {
+            "name": "x",
+            "description": "Does a: b",
+            "metadata": '{"flowly":{"emoji":"x"}}',
+            "version": "1.0",
+        }
+        assert manager._parse_frontmatter("# no frontmatter") == {}
+
+    def test_crlf_skill_from_url_is_not_modified(self, manager: SkillManager):
+        skill_dir = _write_skill(manager.managed_dir, "crlf")
+        raw = b'---\r\nname: Windows\r\ndescription: "crlf"\r\n---\r\nbody\r\n'
+        (skill_dir / "SKILL.md").write_bytes(raw)
+        (skill_dir / SkillManager.META_FILE).write_text(
+            f'{{"slug": "crlf", "hash": "{hashlib.sha256(raw).hexdigest()}"}}', encoding="utf-8"
+        )
+
+        skill = manager.get_installed("crlf")
+        assert skill.name == "Windows"
+        assert skill.description == "crlf"
+        assert skill.is_modified is False
+
+    def test_remove(self, manager: SkillManager):
+        _write_skill(manager.managed_dir, "github")
+        assert manager.remove("github") is True
+        assert manager.get_installed("github") is None
+        assert manager.remove("github") is False
+
+
+# ── Info ────────────────────────────────────────────────────────────
+
+
+class TestInfo:
+    def test_info_update_available(self, manager: SkillManager, registry: dict):
+        _write_skill(manager.managed_dir, "github", "1.0.0")
+        registry["skills"]["github"] = _registry_skill("github", "1.1.0")
+
+        data = manager.info("github")
+        assert data["installed"] is True
+        assert data["registry"]["version"] == "1.1.0"
+        assert data["update_available"] == "1.1.0"
+
+    def test_info_unknown(self, manager: SkillManager, registry: dict):
+        assert manager.info("missing") is None
+
+    def test_info_many_matches_info(self, manager: SkillManager, registry: dict):
+        _write_skill(manager.managed_dir, "github", "1.0.0")
+        _write_skill(manager.managed_dir, "weather", "2.0.0")
+        registry["skills"]["github"] = _registry_skill("github", "1.1.0")
+        registry["skills"]["weather"] = _registry_skill("weather", "2.0.0")
+        registry["skills"]["remote"] = _registry_skill("remote", "0.1.0")
+
+        slugs = ["github", "weather", "remote", "missing"]
+        expected = {slug: manager.info(slug) for slug in slugs if manager.info(slug)}
+        assert manager.info_many(slugs) == expected
+
+    def test_info_many_dedupes_lookups(self, manager: SkillManager, registry: dict):
+        _write_skill(manager.managed_dir, "github")
+        manager.info_many(["github", "github", "weather"])
+        assert registry["calls"] == ["github", "weather"]
+
+
+# ── Install / update ────────────────────────────────────────────────
+
+
+class TestRegistryInstall:
+    def test_install_from_registry(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["github"] = "1.0.0"
+        skill = manager.install("github")
+        assert skill.slug == "github"
+        assert skill.version == "1.0.0"
+        assert skill.source == "github"
+        assert (manager.managed_dir / "github" / "SKILL.md").read_text().endswith("v1.0.0\n")
+
+    def test_install_tarball(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["bundle"] = "1.0.0"
+        hub.tarballs["bundle"] = _tarball({"SKILL.md": b"---\nname: bundle\n---\n", "scripts/run.sh": b"echo hi\n"})
+        skill = manager.install("bundle")
+        assert skill.name == "bundle"
+        assert (skill.path / "scripts" / "run.sh").read_bytes() == b"echo hi\n"
+
+    @pytest.mark.parametrize("has_filter", [True, False])
+    def test_install_tarball_rejects_traversal(
+        self, manager: SkillManager, hub: FakeRegistry, monkeypatch, has_filter: bool
+    ):
+        if not has_filter:
+            monkeypatch.delattr(tarfile, "data_filter", raising=False)
+        hub.versions["evil"] = "1.0.0"
+        hub.tarballs["evil"] = _tarball({"SKILL.md": b"---\nname: evil\n---\n", "../escaped.txt": b"x"})
+
+        assert manager.install("evil") is None
+        assert not (manager.managed_dir / "escaped.txt").exists()
+        assert manager.get_installed("evil") is None
+        assert list(manager.managed_dir.iterdir()) == []
+
+    def test_failed_reinstall_keeps_old_skill(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["bundle"] = "1.0.0"
+        hub.tarballs["bundle"] = _tarball({"SKILL.md": b"---\nname: bundle\n---\n", "old.txt": b"old"})
+        manager.install("bundle")
+
+        hub.tarballs["bundle"] = _tarball({"SKILL.md": b"---\nname: bundle\n---\nnew\n", "../x": b"x"})
+        assert manager.install("bundle", force=True) is None
+        assert [p.name for p in manager.managed_dir.iterdir()] == ["bundle"]
+        assert (manager.managed_dir / "bundle" / "SKILL.md").read_bytes() == b"---\nname: bundle\n---\n"
+
+    def test_reinstall_replaces_whole_tree(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["bundle"] = "1.0.0"
+        hub.tarballs["bundle"] = _tarball({"SKILL.md": b"---\nname: bundle\n---\n", "old.txt": b"old"})
+        manager.install("bundle")
+
+        hub.tarballs["bundle"] = _tarball({"SKILL.md": b"---\nname: bundle\n---\n", "new.txt": b"new"})
+        skill = manager.install("bundle", force=True)
+        assert sorted(p.name for p in skill.path.iterdir()) == [".flowly-skill.json", "SKILL.md", "new.txt"]
+        assert [p.name for p in manager.managed_dir.iterdir()] == ["bundle"]
+
+    def test_install_tarball_without_filter(self, manager: SkillManager, hub: FakeRegistry, monkeypatch):
+        monkeypatch.delattr(tarfile, "data_filter", raising=False)
+        hub.versions["bundle"] = "1.0.0"
+        hub.tarballs["bundle"] = _tarball({"SKILL.md": b"---\nname: bundle\n---\n", "scripts/run.sh": b"echo hi\n"})
+        skill = manager.install("bundle")
+        assert (skill.path / "scripts" / "run.sh").read_bytes() == b"echo hi\n"
+
+    def test_install_verifies_hash(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["github"] = "1.0.0"
+        body = b"---\nname: github\n---\nv1.0.0\n"
+        hub.hashes["github"] = hashlib.sha256(body).hexdigest()
+        assert manager.install("github").hash == hub.hashes["github"]
+
+        hub.hashes["github"] = "0" * 64
+        assert manager.install("github", force=True) is None
+
+    def test_install_missing(self, manager: SkillManager, hub: FakeRegistry):
+        assert manager.install("missing") is None
+
+    def test_install_from_url_uses_shared_client(self, manager: SkillManager, hub: FakeRegistry):
+        skill = manager.install("https://hub.test/raw/My_Skill.md")
+        assert skill.slug == "my-skill"
+        assert skill.source == "https://hub.test/raw/My_Skill.md"
+        assert hub.requests == ["/raw/My_Skill.md"]
+
+    def test_update_all_fetches_concurrently(self, manager: SkillManager, hub: FakeRegistry):
+        for slug in ("github", "weather", "notes"):
+            hub.versions[slug] = "1.0.0"
+            manager.install(slug)
+
+        for slug in hub.versions:
+            hub.versions[slug] = "2.0.0"
+        updated = manager.update()
+
+        assert sorted(s.slug for s in updated) == ["github", "notes", "weather"]
+        assert {s.version for s in updated} == {"2.0.0"}
+        assert {s.version for s in manager.list_installed()} == {"2.0.0"}
+        assert hub.max_in_flight > 1
+        assert manager._client._aclient is None
+
+    def test_update_skips_modified(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["github"] = "1.0.0"
+        manager.install("github")
+        meta = manager.managed_dir / "github" / SkillManager.META_FILE
+        meta.write_text(json.dumps({**json.loads(meta.read_text()), "hash": "stale"}))
+
+        hub.versions["github"] = "2.0.0"
+        assert manager.update("github") == []
+        assert [s.version for s in manager.update("github", force=True)] == ["2.0.0"]
+
+    def test_update_local_source(self, manager: SkillManager, hub: FakeRegistry, tmp_path: Path):
+        source = _write_skill(tmp_path / "src", "mine")
+        manager.install(str(source))
+        (source / "SKILL.md").write_text("---\nname: mine\n---\nnew\n", encoding="utf-8")
+
+        [updated] = manager.update("mine")
+        assert (updated.path / "SKILL.md").read_text().endswith("new\n")
+        assert hub.requests == []
+
+    def test_scratch_file_by_announced_size(self):
+        small = httpx.Response(200, headers={"content-length": "1024"})
+        large = httpx.Response(200, headers={"content-length": str(client_module._SPOOL_MAX_SIZE + 1)})
+        unknown = httpx.Response(200)
+        with client_module._scratch_file(small) as f:
+            assert isinstance(f, tempfile.SpooledTemporaryFile)
+        with client_module._scratch_file(unknown) as f:
+            assert isinstance(f, tempfile.SpooledTemporaryFile)
+        with client_module._scratch_file(large) as f:
+            assert not isinstance(f, tempfile.SpooledTemporaryFile)
+
+
+# ── GitHub install ──────────────────────────────────────────────────
+
+
+class TestGithubInstall:
+    def test_downloads_extras_from_one_listing(self, manager: SkillManager, hub: FakeRegistry):
+        base = "me/repo/main/skills/tool"
+        hub.github = {
+            f"{base}/SKILL.md": (b"---\nname: tool\n---\n", "100644"),
+            f"{base}/scripts/run.sh": (b"#!/bin/sh\n", "100755"),
+            f"{base}/references/a/b.md": (b"ref", "100644"),
+            f"{base}/notes.txt": (b"not an extra", "100644"),
+            "me/repo/main/skills/other/scripts/x.sh": (b"other skill", "100755"),
+        }
+
+        skill = manager.install("github:me/repo/tool")
+        assert skill.name == "tool"
+        assert (skill.path / "scripts" / "run.sh").read_bytes() == b"#!/bin/sh\n"
+        assert (skill.path / "scripts" / "run.sh").stat().st_mode & 0o111
+        assert (skill.path / "references" / "a" / "b.md").read_bytes() == b"ref"
+        assert not (skill.path / "notes.txt").exists()
+        assert [p for p in hub.requests if p.startswith("/repos/")] == ["/repos/me/repo/git/trees/main"]
+
+    def test_missing_extra_does_not_fail_install(self, manager: SkillManager, hub: FakeRegistry):
+        base = "me/repo/main/skills/tool"
+        hub.github = {
+            f"{base}/SKILL.md": (b"---\nname: tool\n---\n", "100644"),
+            f"{base}/assets/logo.png": (b"png", "100644"),
+        }
+        original = hub._github
+
+        def flaky(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("logo.png"):
+                return httpx.Response(500)
+            return original(request)
+
+        hub._github = flaky
+        skill = manager.install("github:me/repo/tool")
+        assert skill is not None
+        assert not (skill.path / "assets" / "logo.png").exists()
+
+
+# ── Local install ───────────────────────────────────────────────────
+
+
+class TestLocalInstall:
+    def test_copies_tree(self, manager: SkillManager, tmp_path: Path):
+        source = _write_skill(tmp_path / "src", "mine")
+        (source / "scripts").mkdir()
+        (source / "scripts" / "run.sh").write_bytes(b"#!/bin/sh\necho hi\n" * 1000)
+        (source / "scripts" / "run.sh").chmod(0o755)
+
+        skill = manager.install(str(source))
+        installed = skill.path / "scripts" / "run.sh"
+        assert installed.read_bytes() == (source / "scripts" / "run.sh").read_bytes()
+        assert installed.stat().st_mode & 0o777 == 0o755
+        assert skill.version == "local"
+        # The source's own metadata is left alone
+        assert '"version": "1.0.0"' in (source / SkillManager.META_FILE).read_text()
+
+    def test_falls_back_when_kernel_copy_fails(self, manager: SkillManager, tmp_path: Path, monkeypatch):
+        def refuse(*args):
+            raise OSError("copy_file_range not supported")
+
+        monkeypatch.setattr(manager_module.os, "copy_file_range", refuse, raising=False)
+        monkeypatch.setattr(manager_module, "_HAS_COPY_FILE_RANGE", True)
+        source = _write_skill(tmp_path / "src", "mine")
+
+        skill = manager.install(str(source))
+        assert (skill.path / "SKILL.md").read_text() == (source / "SKILL.md").read_text()
+
+
+# ── Registry cache ──────────────────────────────────────────────────
+
+
+class TestRegistryCache:
+    def test_get_skill_is_cached(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["github"] = "1.0.0"
+        client = manager._client
+        assert client.get_skill("github").version == "1.0.0"
+        assert client.get_skill("github").version == "1.0.0"
+        assert hub.requests == ["/api/skills/github"]
+
+    def test_misses_are_not_cached(self, manager: SkillManager, hub: FakeRegistry):
+        assert manager._client.get_skill("github") is None
+        hub.versions["github"] = "1.0.0"
+        assert manager._client.get_skill("github").version == "1.0.0"
+
+    def test_expiry(self, manager: SkillManager, hub: FakeRegistry, monkeypatch):
+        hub.versions["github"] = "1.0.0"
+        manager._client.get_skill("github")
+        hub.versions["github"] = "2.0.0"
+        assert manager._client.get_skill("github").version == "1.0.0"
+
+        now = time.monotonic()
+        monkeypatch.setattr(client_module.time, "monotonic", lambda: now + 61)
+        assert manager._client.get_skill("github").version == "2.0.0"
+
+    def test_force_install_refetches(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["github"] = "1.0.0"
+        manager.install("github")
+        hub.versions["github"] = "2.0.0"
+        assert manager.install("github", force=True).version == "2.0.0"
+
+    def test_search_is_cached(self, manager: SkillManager, hub: FakeRegistry):
+        hub.versions["github"] = "1.0.0"
+        first = manager.search("git")
+        first.clear()
+        assert [s.slug for s in manager.search("git")] == ["github"]
+        assert hub.requests == ["/api/skills/search"]
+
+
+# ── Source parsing ──────────────────────────────────────────────────
+
+
+class TestParseSkillSource:
+    @pytest.mark.parametrize("source,expected", [
+        ("github", ("registry", {"slug": "github", "version": None})),
+        ("github@1.2.0", ("registry", {"slug": "github", "version": "1.2.0"})),
+        ("github:me/repo/tool", ("github", {"repo": "me/repo@main", "path": "skills", "skill_name": "tool"})),
+        ("github:me/repo/a/b/tool@dev", ("github", {"repo": "me/repo@dev", "path": "a/b", "skill_name": "tool"})),
+        ("https://x.test/s.md", ("url", {"url": "https://x.test/s.md"})),
+        ("http://x.test/s.md", ("url", {"url": "http://x.test/s.md"})),
+        ("./skills/tool", ("local", {"path": "./skills/tool"})),
+        ("/abs/tool", ("local", {"path": "/abs/tool"})),
+        ("~/tool", ("local", {"path": "~/tool"})),
+        ("/abs/with:colon", ("local", {"path": "/abs/with:colon"})),
+        ("http:tool", ("registry", {"slug": "http:tool", "version": None})),
+    ])
+    def test_sources(self, manager: SkillManager, source: str, expected: tuple):
+        assert manager._client.parse_skill_source(source) == expected
+
+    def test_invalid_github(self, manager: SkillManager):
+        with pytest.raises(ValueError):
+            manager._client.parse_skill_source("github:me/repo")
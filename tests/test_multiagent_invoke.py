@@ -0,0 +1,193 @@
+"""Tests for multi-agent CLI invocation."""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from flowly.config.schema import MultiAgentConfig
+from flowly.multiagent import invoke
+from flowly.multiagent.invoke import (
+    _build_system_context,
+    invoke_agent,
+    parse_codex_jsonl,
+    run_subprocess,
+)
+
+
+def _event(kind: str, text: str) -> str:
+    return json.dumps({"type": "item.completed", "item": {"type": kind, "text": text}})
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+# ── Codex output parsing ────────────────────────────────────────────
+
+
+class TestParseCodexJsonl:
+    def test_last_agent_message_wins(self):
+        output = "\n".join([
+            json.dumps({"type": "thread.started"}),
+            _event("agent_message", "first"),
+            _event("command_execution", "ls"),
+            _event("agent_message", "second"),
+            "not json",
+        ])
+        assert parse_codex_jsonl(output) == "second"
+
+    def test_no_message(self):
+        assert parse_codex_jsonl("") == "Sorry, I could not generate a response."
+        assert parse_codex_jsonl('["agent_message"]\n{"type": "item.completed", "item": "agent_message"}') == (
+            "Sorry, I could not generate a response."
+        )
+
+    def test_empty_last_message(self):
+        assert parse_codex_jsonl("\n".join([_event("agent_message", "first"), _event("agent_message", "")])) == (
+            "Sorry, I could not generate a response."
+        )
+
+    def test_only_completed_messages(self):
+        started = json.dumps({"type": "item.started", "item": {"type": "agent_message", "text": "partial"}})
+        assert parse_codex_jsonl("\n".join([_event("agent_message", "done"), started])) == "done"
+        assert invoke._codex_agent_message(_event("agent_message", "raw").encode()) == "raw"
+
+    def test_line_separator_inside_text(self):
+        text = "a\u2028b"
+        line = json.dumps({"type": "item.completed", "item": {"type": "agent_message", "text": text}},
+                          ensure_ascii=False)
+        assert parse_codex_jsonl(line) == text
+
+
+# ── System context ──────────────────────────────────────────────────
+
+
+class TestBuildSystemContext:
+    def test_missing(self, tmp_path: Path):
+        assert _build_system_context(str(tmp_path / "coder" / "AGENTS.md")) == ""
+
+    def test_cached_until_changed(self, tmp_path: Path, monkeypatch):
+        agents_md = tmp_path / "coder" / "AGENTS.md"
+        agents_md.parent.mkdir()
+        agents_md.write_text("v1", encoding="utf-8")
+        assert _build_system_context(str(agents_md)) == "v1"
+
+        reads = []
+        original = Path.read_text
+        monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or original(self, *a, **k))
+        assert _build_system_context(str(agents_md)) == "v1"
+        assert reads == []
+
+        agents_md.write_text("version 2", encoding="utf-8")
+        assert _build_system_context(str(agents_md)) == "version 2"
+        assert reads == [agents_md]
+
+
+# ── Subprocess ──────────────────────────────────────────────────────
+
+
+class TestRunSubprocess:
+    async def test_plain_output(self, tmp_path: Path):
+        assert await run_subprocess(_python("print('  hello  ')"), cwd=str(tmp_path)) == "hello"
+
+    async def test_output_without_surrounding_whitespace(self, tmp_path: Path):
+        code = "import sys; sys.stdout.buffer.write(b'done \\xff')"
+        assert await run_subprocess(_python(code), cwd=str(tmp_path)) == "done \ufffd"
+
+    async def test_codex_stream(self, tmp_path: Path):
+        big = "x" * 200_000
+        lines = [_event("agent_message", "early"), _event("command_execution", big), _event("agent_message", big)]
+        events = tmp_path / "events.jsonl"
+        events.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        code = f"import sys; sys.stdout.write(open({str(events)!r}).read())"
+        result = await run_subprocess(_python(code), cwd=str(tmp_path), provider="openai")
+        assert result == big
+
+    async def test_codex_last_line_without_newline(self, tmp_path: Path):
+        code = f"import sys; sys.stdout.write({_event('agent_message', 'done')!r})"
+        assert await run_subprocess(_python(code), cwd=str(tmp_path), provider="openai") == "done"
+
+    async def test_codex_stream_small_chunks(self, monkeypatch):
+        monkeypatch.setattr(invoke, "_READ_CHUNK_SIZE", 7)
+        reader = asyncio.StreamReader()
+        lines = [_event("agent_message", "a" * 50), _event("agent_message", "last")]
+        reader.feed_data(("\n".join(lines) + "\n").encode())
+        reader.feed_eof()
+        assert await invoke._read_codex_stream(reader) == "last"
+
+    async def test_large_stderr_does_not_stall(self, tmp_path: Path):
+        code = "import sys; sys.stderr.write('e' * 1_000_000); print('ok')"
+        assert await run_subprocess(_python(code), cwd=str(tmp_path), timeout=10) == "ok"
+
+    async def test_failure(self, tmp_path: Path):
+        code = "import sys; sys.stderr.write('boom'); sys.exit(3)"
+        with pytest.raises(RuntimeError, match="boom"):
+            await run_subprocess(_python(code), cwd=str(tmp_path))
+
+    async def test_timeout(self, tmp_path: Path):
+        with pytest.raises(RuntimeError, match="timed out"):
+            await run_subprocess(_python("import time; time.sleep(5)"), cwd=str(tmp_path), timeout=0.2)
+
+    async def test_cancel_kills_child(self, tmp_path: Path):
+        pid_file = tmp_path / "pid"
+        code = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+        task = asyncio.create_task(run_subprocess(_python(code), cwd=str(tmp_path)))
+        for _ in range(200):
+            if pid_file.exists() and pid_file.read_text():
+                break
+            await asyncio.sleep(0.01)
+        pid = int(pid_file.read_text())
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for _ in range(200):
+            try:
+                os.waitpid(pid, os.WNOHANG)
+                os.kill(pid, 0)
+            except (ChildProcessError, ProcessLookupError):
+                break
+            await asyncio.sleep(0.01)
+        else:
+            pytest.fail("child process still running after cancel")
+
+    async def test_missing_command(self, tmp_path: Path):
+        with pytest.raises(RuntimeError, match="not found"):
+            await run_subprocess(["flowly-no-such-command"], cwd=str(tmp_path))
+
+
+# ── Invocation ──────────────────────────────────────────────────────
+
+
+class TestInvokeAgent:
+    async def test_working_directory_created_once(self, tmp_path: Path, monkeypatch):
+        calls = []
+
+        async def fake_run(args, cwd, timeout, provider):
+            calls.append((args, cwd))
+            return "ok"
+
+        monkeypatch.setattr(invoke, "run_subprocess", fake_run)
+        working_dir = tmp_path / "project"
+        agent = MultiAgentConfig(working_directory=str(working_dir), model="sonnet")
+
+        assert await invoke_agent(agent, "coder", "hi", tmp_path) == "ok"
+        assert working_dir.is_dir()
+        assert calls[0][0][:4] == ["claude", "--dangerously-skip-permissions", "--model", "claude-sonnet-4-5"]
+        assert calls[0][0][-4:] == ["--add-dir", str(tmp_path / "coder"), "-p", "hi"]
+
+        mkdirs = []
+        monkeypatch.setattr(Path, "mkdir", lambda self, *a, **k: mkdirs.append(self))
+        await invoke_agent(agent, "coder", "again", tmp_path)
+        assert mkdirs == []
+
+    async def test_removed_working_directory(self, tmp_path: Path):
+        missing = str(tmp_path / "gone")
+        invoke._ENSURED_DIRS.add(missing)
+        with pytest.raises(RuntimeError, match="Working directory not found"):
+            await run_subprocess(_python("print(1)"), cwd=missing)
+        assert missing not in invoke._ENSURED_DIRS
@@ -0,0 +1,144 @@
+"""Tests for the team chain orchestrator."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from flowly.config.schema import MultiAgentConfig, MultiAgentTeamConfig
+from flowly.multiagent import orchestrator
+from flowly.multiagent.orchestrator import ChainStep, OrchestratorResult, TeamOrchestrator
+from flowly.multiagent.router import AgentRouter
+
+
+class FakeAgents:
+    """Stands in for invoke_agent with scripted replies per agent."""
+
+    def __init__(self, replies: dict[str, str]):
+        self.replies = replies
+        self.calls: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def invoke(self, agent, agent_id: str, message: str, workspace: Path) -> str:
+        self.calls.append((agent_id, message))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            reply = self.replies[agent_id]
+            if reply == "raise":
+                raise RuntimeError(f"{agent_id} crashed")
+            return reply
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def agents() -> dict[str, MultiAgentConfig]:
+    return {f"a{i}": MultiAgentConfig(name=f"A{i}") for i in range(10)}
+
+
+@pytest.fixture
+def router(agents: dict[str, MultiAgentConfig]) -> AgentRouter:
+    team = MultiAgentTeamConfig(name="Team", agents=list(agents), leader_agent="a0")
+    return AgentRouter(agents, {"team": team})
+
+
+def _fake(monkeypatch, replies: dict[str, str]) -> FakeAgents:
+    fake = FakeAgents(replies)
+    monkeypatch.setattr(orchestrator, "invoke_agent", fake.invoke)
+    return fake
+
+
+# ── Results ─────────────────────────────────────────────────────────
+
+
+class TestOrchestratorResult:
+    def test_single_step(self):
+        assert OrchestratorResult(steps=[ChainStep("a0", "hi")]).final_response == "hi"
+
+    def test_multiple_steps(self):
+        result = OrchestratorResult(steps=[ChainStep("a0", "one"), ChainStep("a1", "two")])
+        assert result.final_response == "@a0: one\n\n---\n\n@a1: two"
+
+    def test_no_instance_dict(self):
+        assert not hasattr(ChainStep("a0", "hi"), "__dict__")
+        assert not hasattr(OrchestratorResult(), "__dict__")
+
+
+# ── Execution ───────────────────────────────────────────────────────
+
+
+class TestExecute:
+    async def test_single_agent(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        fake = _fake(monkeypatch, {"a1": "done"})
+        result = await TeamOrchestrator(router).execute("hi", "a1", None, agents, tmp_path)
+        assert result.final_response == "done"
+        assert fake.calls == [("a1", "hi")]
+
+    async def test_sequential_handoff(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        fake = _fake(monkeypatch, {"a0": "[@a1: your turn]", "a1": "finished"})
+        team = router.find_team_for_agent("a0")
+        result = await TeamOrchestrator(router).execute("go", "a0", team, agents, tmp_path)
+        assert [(s.agent_id, s.response) for s in result.steps] == [("a0", "[@a1: your turn]"), ("a1", "finished")]
+        assert fake.calls[1] == ("a1", "[Message from teammate @a0]:\nyour turn")
+
+    async def test_fan_out_is_bounded(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        leader = " ".join(f"[@a{i}: part {i}]" for i in range(1, 10))
+        replies = {"a0": leader, **{f"a{i}": f"r{i}" for i in range(1, 10)}, "a5": "raise"}
+        fake = _fake(monkeypatch, replies)
+        team = router.find_team_for_agent("a0")
+
+        result = await TeamOrchestrator(router).execute("go", "a0", team, agents, tmp_path)
+        assert [s.agent_id for s in result.steps] == [f"a{i}" for i in range(10)]
+        assert result.steps[3].response == "r3"
+        assert result.steps[5].response == "Error invoking @a5: a5 crashed"
+        assert 1 < fake.max_in_flight <= orchestrator.MAX_CONCURRENT_FANOUT
+
+
+# ── Response cache ──────────────────────────────────────────────────
+
+
+class TestResponseCache:
+    async def test_off_by_default(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        fake = _fake(monkeypatch, {"a1": "done"})
+        orch = TeamOrchestrator(router)
+        await orch.execute("hi", "a1", None, agents, tmp_path)
+        await orch.execute("hi", "a1", None, agents, tmp_path)
+        assert len(fake.calls) == 2
+
+    async def test_identical_message_is_reused(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        fake = _fake(monkeypatch, {"a1": "done", "a2": "other"})
+        agents["a1"] = MultiAgentConfig(name="A1", cache_enabled=True)
+        orch = TeamOrchestrator(router)
+
+        for message in ["hi", "hi", "bye"]:
+            assert (await orch.execute(message, "a1", None, agents, tmp_path)).final_response == "done"
+        assert fake.calls == [("a1", "hi"), ("a1", "bye")]
+
+    async def test_expiry_and_errors(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        fake = _fake(monkeypatch, {"a1": "raise"})
+        agents["a1"] = MultiAgentConfig(name="A1", cache_enabled=True)
+        orch = TeamOrchestrator(router)
+
+        await orch.execute("hi", "a1", None, agents, tmp_path)
+        fake.replies["a1"] = "done"
+        assert (await orch.execute("hi", "a1", None, agents, tmp_path)).final_response == "done"
+        assert len(fake.calls) == 2
+
+        now = time.monotonic()
+        monkeypatch.setattr(orchestrator, "_clock", lambda: now + orchestrator._RESPONSE_CACHE_TTL_S + 1)
+        await orch.execute("hi", "a1", None, agents, tmp_path)
+        assert len(fake.calls) == 3
+
+    async def test_lru_eviction(self, monkeypatch, router: AgentRouter, agents, tmp_path: Path):
+        monkeypatch.setattr(orchestrator, "_RESPONSE_CACHE_MAX", 2)
+        fake = _fake(monkeypatch, {"a1": "done"})
+        agents["a1"] = MultiAgentConfig(name="A1", cache_enabled=True)
+        orch = TeamOrchestrator(router)
+
+        for message in ["one", "two", "one", "three", "one", "two"]:
+            await orch.execute(message, "a1", None, agents, tmp_path)
+        assert [m for _, m in fake.calls] == ["one", "two", "three", "two"]
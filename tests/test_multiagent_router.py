@@ -0,0 +1,116 @@
+"""Tests for multi-agent message routing."""
+
+import pytest
+
+from flowly.config.schema import MultiAgentConfig, MultiAgentTeamConfig
+from flowly.multiagent.router import AgentRouter, TeammateMention
+
+
+@pytest.fixture
+def router() -> AgentRouter:
+    agents = {
+        "coder": MultiAgentConfig(name="Coder"),
+        "reviewer": MultiAgentConfig(name="Reviewer"),
+        "writer": MultiAgentConfig(name="Writer"),
+    }
+    teams = {
+        "dev": MultiAgentTeamConfig(name="Dev Team", agents=["coder", "reviewer", "ghost"], leader_agent="coder"),
+        "docs": MultiAgentTeamConfig(name="Docs", agents=["writer"], leader_agent="writer"),
+    }
+    return AgentRouter(agents, teams)
+
+
+# ── Routing ─────────────────────────────────────────────────────────
+
+
+class TestRoute:
+    def test_no_prefix(self, router: AgentRouter):
+        result = router.route("hello there")
+        assert (result.agent_id, result.message, result.is_team) == ("default", "hello there", False)
+
+    def test_agent_id(self, router: AgentRouter):
+        result = router.route("@Coder fix the bug\nplease")
+        assert (result.agent_id, result.message, result.is_team) == ("coder", "fix the bug\nplease", False)
+
+    def test_team_id(self, router: AgentRouter):
+        result = router.route("@dev ship it")
+        assert (result.agent_id, result.message, result.is_team) == ("coder", "ship it", True)
+
+    def test_team_name(self, router: AgentRouter):
+        result = router.route("@DOCS write it up")
+        assert (result.agent_id, result.is_team) == ("writer", True)
+
+    def test_first_name_match_wins(self):
+        router = AgentRouter(
+            {"a": MultiAgentConfig(name="Same"), "b": MultiAgentConfig(name="same")},
+            {},
+        )
+        assert router.route("@same hi").agent_id == "a"
+
+    def test_unknown_mention_is_default(self, router: AgentRouter):
+        result = router.route("@nobody hi")
+        assert (result.agent_id, result.message) == ("default", "@nobody hi")
+
+    def test_mention_without_message(self, router: AgentRouter):
+        assert router.route("@coder").agent_id == "default"
+
+
+# ── Teams ───────────────────────────────────────────────────────────
+
+
+class TestTeams:
+    def test_find_team_for_agent(self, router: AgentRouter):
+        assert router.find_team_for_agent("reviewer").team_id == "dev"
+        assert router.find_team_for_agent("writer").team_id == "docs"
+        assert router.find_team_for_agent("nobody") is None
+
+    def test_first_team_wins(self):
+        teams = {
+            "one": MultiAgentTeamConfig(agents=["a"], leader_agent="a"),
+            "two": MultiAgentTeamConfig(agents=["a", "b"], leader_agent="b"),
+        }
+        router = AgentRouter({"a": MultiAgentConfig(), "b": MultiAgentConfig()}, teams)
+        assert router.find_team_for_agent("a").team_id == "one"
+        assert router.find_team_for_agent("b").team_id == "two"
+
+    def test_is_teammate(self, router: AgentRouter):
+        assert router.is_teammate("reviewer", "coder", "dev") is True
+        assert router.is_teammate("coder", "coder", "dev") is False
+        assert router.is_teammate("writer", "coder", "dev") is False
+        # Listed in the team but not a configured agent
+        assert router.is_teammate("ghost", "coder", "dev") is False
+        assert router.is_teammate("reviewer", "coder", "missing") is False
+
+
+# ── Mentions ────────────────────────────────────────────────────────
+
+
+class TestExtractTeammateMentions:
+    def test_tags(self, router: AgentRouter):
+        response = "Done. [@Reviewer: please check\nthe diff] and [@reviewer: again] [@writer: not mine]"
+        assert router.extract_teammate_mentions(response, "coder", "dev") == [
+            TeammateMention(agent_id="reviewer", message="please check\nthe diff"),
+        ]
+
+    def test_bare_fallback(self, router: AgentRouter):
+        response = "Asking @coder and @reviewer to look"
+        assert router.extract_teammate_mentions(response, "coder", "dev") == [
+            TeammateMention(agent_id="reviewer", message=response),
+        ]
+
+    def test_no_mentions(self, router: AgentRouter):
+        assert router.extract_teammate_mentions("All done.", "coder", "dev") == []
+        assert router.extract_teammate_mentions("[@ghost: hi] @ghost", "coder", "dev") == []
+
+    def test_repeated_mentions_are_checked_once(self, router: AgentRouter, monkeypatch):
+        checks = []
+        original = router.is_teammate
+        monkeypatch.setattr(router, "is_teammate", lambda *a: checks.append(a[0]) or original(*a))
+        response = "[@writer: a] [@Writer: b] [@reviewer: c] @writer @WRITER @reviewer"
+        assert [m.agent_id for m in router.extract_teammate_mentions(response, "coder", "dev")] == ["reviewer"]
+        assert checks == ["writer", "reviewer"]
+
+        checks.clear()
+        response = "@writer @Writer @ghost @reviewer"
+        assert [m.agent_id for m in router.extract_teammate_mentions(response, "coder", "dev")] == ["reviewer"]
+        assert checks == ["writer", "ghost", "reviewer"]
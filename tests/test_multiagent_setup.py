@@ -0,0 +1,120 @@
+"""Tests for agent directory setup."""
+
+from pathlib import Path
+
+import pytest
+
+from flowly.config.schema import MultiAgentConfig, MultiAgentTeamConfig
+from flowly.multiagent.setup import (
+    AGENTS_MD_TEMPLATE,
+    ensure_agent_directory,
+    update_agent_teammates,
+)
+
+START = "<!-- TEAMMATES_START -->"
+END = "<!-- TEAMMATES_END -->"
+
+
+@pytest.fixture
+def agents() -> dict[str, MultiAgentConfig]:
+    return {
+        "coder": MultiAgentConfig(name="Coder", model="sonnet"),
+        "reviewer": MultiAgentConfig(name="Reviewer", model="opus"),
+        "writer": MultiAgentConfig(model="haiku"),
+    }
+
+
+@pytest.fixture
+def teams() -> dict[str, MultiAgentTeamConfig]:
+    return {
+        "dev": MultiAgentTeamConfig(agents=["coder", "reviewer"], leader_agent="coder"),
+        "docs": MultiAgentTeamConfig(agents=["writer", "coder", "reviewer"], leader_agent="writer"),
+    }
+
+
+def _section(text: str) -> str:
+    return text[text.index(START) + len(START):text.index(END)]
+
+
+EXPECTED_CODER_BLOCK = (
+    "\n### You\n\n- `@coder` — **Coder** (sonnet)\n"
+    "\n### Your Teammates\n\n"
+    "You can message them using `[@agent_id: message]` tag format. This WORKS — the orchestrator delivers it.\n\n"
+    "- `@reviewer` — **Reviewer** (opus)\n"
+    "- `@writer` — **writer** (haiku)\n"
+)
+
+
+# ── New directories ─────────────────────────────────────────────────
+
+
+class TestEnsureAgentDirectory:
+    def test_new_directory(self, tmp_path: Path, agents, teams):
+        agent_dir = tmp_path / "coder"
+        ensure_agent_directory(agent_dir, "coder", agents, teams)
+
+        agents_md = (agent_dir / "AGENTS.md").read_text()
+        assert agents_md.startswith(AGENTS_MD_TEMPLATE[:AGENTS_MD_TEMPLATE.index(START)])
+        assert _section(agents_md) == EXPECTED_CODER_BLOCK
+
+        claude_md = (agent_dir / ".claude" / "CLAUDE.md").read_text()
+        assert claude_md.startswith("# Agent: @coder\n\n")
+        assert _section(claude_md) == EXPECTED_CODER_BLOCK
+        assert claude_md.endswith(END + "\n")
+
+    def test_new_directory_is_written_without_reading_back(self, tmp_path: Path, agents, teams, monkeypatch):
+        monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: pytest.fail(f"read {self.name}"))
+        ensure_agent_directory(tmp_path / "coder", "coder", agents, teams)
+
+    def test_agent_without_team(self, tmp_path: Path, agents):
+        ensure_agent_directory(tmp_path / "coder", "coder", agents, {})
+        assert _section((tmp_path / "coder" / "AGENTS.md").read_text()) == (
+            "\n### You\n\n- `@coder` — **Coder** (sonnet)\n"
+        )
+
+
+# ── Updates ─────────────────────────────────────────────────────────
+
+
+class TestUpdateAgentTeammates:
+    def test_replaces_section_and_keeps_user_content(self, tmp_path: Path, agents, teams):
+        agent_dir = tmp_path / "coder"
+        ensure_agent_directory(agent_dir, "coder", agents, {})
+        claude_md = agent_dir / ".claude" / "CLAUDE.md"
+        claude_md.write_text(claude_md.read_text() + "\nMy own notes\n")
+
+        update_agent_teammates(agent_dir, "coder", agents, teams)
+        content = claude_md.read_text()
+        assert _section(content) == EXPECTED_CODER_BLOCK
+        assert content.endswith("\nMy own notes\n")
+        assert _section((agent_dir / "AGENTS.md").read_text()) == EXPECTED_CODER_BLOCK
+
+    def test_appends_markers_to_existing_claude_md(self, tmp_path: Path, agents, teams):
+        agent_dir = tmp_path / "coder"
+        (agent_dir / ".claude").mkdir(parents=True)
+        (agent_dir / ".claude" / "CLAUDE.md").write_text("# Custom\n\n")
+
+        update_agent_teammates(agent_dir, "coder", agents, teams)
+        content = (agent_dir / ".claude" / "CLAUDE.md").read_text()
+        assert content == f"# Custom\n\n{START}{EXPECTED_CODER_BLOCK}{END}\n"
+        assert not (agent_dir / "AGENTS.md").exists()
+
+    def test_block_is_inserted_literally(self, tmp_path: Path, agents):
+        ensure_agent_directory(tmp_path / "coder", "coder", agents, {})
+        name = r"C:\new \1 \g<0>"
+        update_agent_teammates(tmp_path / "coder", "coder", {"coder": MultiAgentConfig(name=name)}, {})
+        assert f"**{name}**" in (tmp_path / "coder" / ".claude" / "CLAUDE.md").read_text()
+        assert f"**{name}**" in (tmp_path / "coder" / "AGENTS.md").read_text()
+
+    def test_unchanged_files_are_not_rewritten(self, tmp_path: Path, agents, teams, monkeypatch):
+        agent_dir = tmp_path / "coder"
+        ensure_agent_directory(agent_dir, "coder", agents, teams)
+
+        writes = []
+        original = Path.write_text
+        monkeypatch.setattr(Path, "write_text", lambda self, *a, **k: writes.append(self.name) or original(self, *a, **k))
+        update_agent_teammates(agent_dir, "coder", agents, teams)
+        assert writes == []
+
+        update_agent_teammates(agent_dir, "coder", agents, {})
+        assert sorted(writes) == ["AGENTS.md", "CLAUDE.md"]
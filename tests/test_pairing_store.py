@@ -0,0 +1,230 @@
+"""Tests for the channel pairing store."""
+
+import shutil
+import threading
+from pathlib import Path
+
+import orjson
+import pytest
+
+from flowly.pairing import store
+from flowly.pairing.store import (
+    add_allow_from_entry,
+    approve_pairing_code,
+    list_pairing_requests,
+    read_allow_from_set,
+    read_allow_from_store,
+    remove_allow_from_entry,
+    upsert_pairing_request,
+)
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def _credentials(home: Path) -> Path:
+    return home / ".flowly" / "credentials"
+
+
+# ── Pairing requests ────────────────────────────────────────────────
+
+
+class TestPairingRequests:
+    def test_upsert_creates_then_reuses(self):
+        code, created = upsert_pairing_request("telegram", "42", {"username": "ada"})
+        assert created is True
+        assert len(code) == store.PAIRING_CODE_LENGTH
+        assert set(code) <= set(store.PAIRING_CODE_ALPHABET)
+
+        assert upsert_pairing_request("telegram", "42") == (code, False)
+        [request] = list_pairing_requests("telegram")
+        assert (request.id, request.code, request.meta) == ("42", code, {"username": "ada"})
+
+    def test_repeat_upserts_are_not_rewritten(self, home: Path, monkeypatch):
+        code, _ = upsert_pairing_request("telegram", "42", {"username": "ada"})
+        writes = []
+        original = Path.write_bytes
+        monkeypatch.setattr(Path, "write_bytes", lambda self, data: writes.append(self) or original(self, data))
+
+        assert upsert_pairing_request("telegram", "42") == (code, False)
+        assert upsert_pairing_request("telegram", "42", {"username": "ada"}) == (code, False)
+        assert writes == []
+
+        upsert_pairing_request("telegram", "42", {"username": "ada2"})
+        assert len(writes) == 1
+
+        path = _credentials(home) / "telegram-pairing.json"
+        data = orjson.loads(path.read_bytes())
+        stale = store.datetime.utcnow() - store._LAST_SEEN_RESOLUTION * 2
+        data["requests"][0]["last_seen_at"] = stale.isoformat() + "Z"
+        original(path, orjson.dumps(data))
+        upsert_pairing_request("telegram", "42")
+        assert len(writes) == 2
+        assert orjson.loads(path.read_bytes())["requests"][0]["last_seen_at"] > stale.isoformat()
+
+    def test_generated_codes_are_unique(self, monkeypatch):
+        assert len(set(store.PAIRING_CODE_ALPHABET)) == 32
+        draws = iter([bytes(8), bytes(8), bytes(range(8))])
+        monkeypatch.setattr(store.secrets, "token_bytes", lambda n: next(draws))
+        assert store._generate_code({"AAAAAAAA"}) == "ABCDEFGH"
+
+    def test_max_pending(self):
+        for i in range(store.PAIRING_MAX_PENDING):
+            assert upsert_pairing_request("telegram", str(i))[1] is True
+        assert upsert_pairing_request("telegram", "extra") == ("", False)
+
+    def test_expired_requests_are_pruned(self, home: Path):
+        path = _credentials(home) / "telegram-pairing.json"
+        path.parent.mkdir(parents=True)
+        old = {"id": "1", "code": "AAAAAAAA", "created_at": "2020-01-01T00:00:00Z"}
+        path.write_bytes(orjson.dumps({"version": 1, "requests": [old]}))
+
+        assert list_pairing_requests("telegram") == []
+        assert orjson.loads(path.read_bytes()) == {"version": 1, "requests": []}
+
+    def test_legacy_and_malformed_entries(self, home: Path):
+        path = _credentials(home) / "telegram-pairing.json"
+        path.parent.mkdir(parents=True)
+        now = store.datetime.utcnow().isoformat() + "Z"
+        entries = [{"id": "1", "code": "AAAAAAAA", "created_at": now}, {"code": "BBBBBBBB"}, "junk",
+                   {"id": "2", "code": "CCCCCCCC"}]
+        path.write_bytes(orjson.dumps({"version": 1, "requests": entries}))
+
+        [request] = list_pairing_requests("telegram")
+        assert (request.id, request.last_seen_at, request.meta) == ("1", now, {})
+        assert upsert_pairing_request("telegram", "1", {"username": "ada"}) == ("AAAAAAAA", False)
+        [stored] = orjson.loads(path.read_bytes())["requests"]
+        assert stored["meta"] == {"username": "ada"}
+        assert stored["last_seen_at"] >= now
+
+    def test_file_format(self, home: Path):
+        upsert_pairing_request("whatsapp", "1", {"name": "Zoë"})
+        text = (_credentials(home) / "whatsapp-pairing.json").read_text(encoding="utf-8")
+        assert text.startswith('{\n  "version": 1,\n  "requests": [\n')
+        assert text.endswith("}\n")
+        assert "Zoë" in text
+
+    def test_corrupt_file_is_treated_as_empty(self, home: Path):
+        path = _credentials(home) / "telegram-pairing.json"
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+        assert list_pairing_requests("telegram") == []
+
+
+# ── Parse cache ─────────────────────────────────────────────────────
+
+
+class TestParseCache:
+    def test_unchanged_file_is_not_reparsed(self, monkeypatch):
+        add_allow_from_entry("telegram", "42")
+        assert read_allow_from_store("telegram") == ["42"]
+
+        reads = []
+        original = Path.read_bytes
+        monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self.name) or original(self))
+        assert read_allow_from_store("telegram") == ["42"]
+        assert reads == []
+
+    def test_writes_populate_the_cache(self, monkeypatch):
+        reads = []
+        original = Path.read_bytes
+        monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self.name) or original(self))
+
+        add_allow_from_entry("telegram", "42")
+        add_allow_from_entry("telegram", "7")
+        assert read_allow_from_set("telegram") == {"42", "7"}
+        assert read_allow_from_store("telegram") == ["42", "7"]
+        assert reads == []
+
+    def test_allow_from_set_is_reused_until_changed(self):
+        add_allow_from_entry("telegram", "42")
+        first = read_allow_from_set("telegram")
+        assert read_allow_from_set("telegram") is first
+
+        remove_allow_from_entry("telegram", "42")
+        assert read_allow_from_set("telegram") == frozenset()
+
+    def test_external_change_is_picked_up(self, home: Path):
+        add_allow_from_entry("telegram", "42")
+        assert read_allow_from_store("telegram") == ["42"]
+
+        path = _credentials(home) / "telegram-allowFrom.json"
+        path.write_bytes(orjson.dumps({"version": 1, "allow_from": ["7"]}))
+        assert read_allow_from_store("telegram") == ["7"]
+
+    def test_returned_requests_do_not_share_cached_state(self):
+        upsert_pairing_request("telegram", "42", {"username": "ada"})
+        list_pairing_requests("telegram")[0].meta["username"] = "mallory"
+        assert list_pairing_requests("telegram")[0].meta == {"username": "ada"}
+
+
+    def test_credentials_dir_created_once(self, home: Path, monkeypatch):
+        add_allow_from_entry("telegram", "1")
+        mkdirs = []
+        original = Path.mkdir
+        monkeypatch.setattr(Path, "mkdir", lambda self, *a, **k: mkdirs.append(self) or original(self, *a, **k))
+        read_allow_from_store("telegram")
+        read_allow_from_set("whatsapp")
+        assert mkdirs == []
+
+        shutil.rmtree(_credentials(home))
+        assert add_allow_from_entry("telegram", "2") is True
+        assert read_allow_from_store("telegram") == ["2"]
+
+
+# ── Approval and allow_from ─────────────────────────────────────────
+
+
+class TestApproval:
+    def test_approve_moves_request_to_allow_from(self):
+        code, _ = upsert_pairing_request("telegram", "42")
+        approved = approve_pairing_code("telegram", f" {code.lower()} ")
+        assert approved.id == "42"
+        assert list_pairing_requests("telegram") == []
+        assert read_allow_from_store("telegram") == ["42"]
+
+    def test_unknown_code(self):
+        upsert_pairing_request("telegram", "42")
+        assert approve_pairing_code("telegram", "ZZZZZZZZ") is None
+        assert approve_pairing_code("telegram", "  ") is None
+        assert read_allow_from_store("telegram") == []
+
+    def test_add_and_remove_entries(self):
+        assert add_allow_from_entry("whatsapp", " +100 ") is True
+        assert add_allow_from_entry("whatsapp", "+100") is False
+        assert add_allow_from_entry("whatsapp", "+200") is True
+        assert read_allow_from_store("whatsapp") == ["+100", "+200"]
+
+        assert remove_allow_from_entry("whatsapp", "+100") is True
+        assert remove_allow_from_entry("whatsapp", "+100") is False
+        assert read_allow_from_store("whatsapp") == ["+200"]
+        assert read_allow_from_store("telegram") == []
+
+    def test_concurrent_adds_are_not_lost(self):
+        threads = [threading.Thread(target=add_allow_from_entry, args=("telegram", str(i))) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(read_allow_from_store("telegram"), key=int) == [str(i) for i in range(20)]
+
+    def test_reads_do_not_wait_for_writers(self):
+        add_allow_from_entry("telegram", "42")
+        held, release = threading.Event(), threading.Event()
+
+        def writer():
+            with store._store_lock(store._get_allow_from_path("telegram")):
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            assert held.wait(5)
+            assert read_allow_from_store("telegram") == ["42"]
+        finally:
+            release.set()
+            thread.join()
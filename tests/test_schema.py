@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from flowly.compaction.types import CompactionConfig, MemoryFlushConfig
 from flowly.config.schema import (
     AgentDefaults,
     ChannelsConfig,
@@ -27,6 +28,10 @@ class TestConfig:
         assert config.agents.defaults.temperature == 0.7
         assert config.agents.defaults.max_tokens == 8192
 
+    def test_section_instances_not_copied(self):
+        gateway = GatewayConfig(port=9000)
+        assert Config(gateway=gateway).gateway is gateway
+
     def test_workspace_path_expansion(self):
         config = Config()
         path = config.workspace_path
@@ -61,6 +66,24 @@ class TestConfig:
         config = Config()
         assert config.get_api_base() is None
 
+    def test_get_api_key_full_priority(self):
+        config = Config()
+        order = ("vllm", "zhipu", "gemini", "xai", "openai", "anthropic", "openrouter")
+        for name in order:
+            getattr(config.providers, name).api_key = f"{name}-key"
+            assert config.get_api_key() == f"{name}-key"
+
+    def test_get_api_base_vllm(self):
+        config = Config()
+        config.providers.vllm.api_base = "http://localhost:8000/v1"
+        assert config.get_api_base() == "http://localhost:8000/v1"
+
+    def test_get_api_base_zhipu_without_base(self):
+        config = Config()
+        config.providers.zhipu.api_key = "key"
+        config.providers.vllm.api_base = "http://localhost:8000/v1"
+        assert config.get_api_base() is None
+
     def test_get_api_base_custom(self):
         config = Config()
         config.providers.openrouter.api_key = "key"
@@ -68,6 +91,38 @@ class TestConfig:
         assert config.get_api_base() == "https://custom.api/v1"
 
 
+class TestEnvOverrides:
+    def test_nested_override(self, monkeypatch):
+        monkeypatch.setenv("FLOWLY_GATEWAY__PORT", "9000")
+        monkeypatch.setenv("FLOWLY_PROVIDERS__OPENROUTER__API_KEY", "env-key")
+        config = Config()
+        assert config.gateway.port == 9000
+        assert config.get_api_key() == "env-key"
+
+    def test_case_insensitive(self, monkeypatch):
+        monkeypatch.setenv("flowly_tools__exec__enabled", "true")
+        assert Config().tools.exec.enabled is True
+
+    def test_json_values(self, monkeypatch):
+        monkeypatch.setenv("FLOWLY_CHANNELS__TELEGRAM__ALLOW_FROM", '["alice", "bob"]')
+        monkeypatch.setenv("FLOWLY_AGENTS", '{"defaults": {"model": "env-model"}}')
+        config = Config()
+        assert config.channels.telegram.allow_from == ["alice", "bob"]
+        assert config.agents.defaults.model == "env-model"
+
+    def test_explicit_values_win(self, monkeypatch):
+        monkeypatch.setenv("FLOWLY_GATEWAY__PORT", "9000")
+        monkeypatch.setenv("FLOWLY_GATEWAY__HOST", "0.0.0.0")
+        config = Config.model_validate({"gateway": {"port": 5000}})
+        assert config.gateway.port == 5000
+        assert config.gateway.host == "0.0.0.0"
+
+    def test_unrelated_variables_ignored(self, monkeypatch):
+        monkeypatch.setenv("FLOWLY_LLM_TIMEOUT_SECONDS", "5")
+        monkeypatch.setenv("FLOWLY_TMUX_SOCKET_DIR", "/tmp/x")
+        assert Config().gateway.port == 18790
+
+
 class TestAgentDefaults:
     def test_defaults(self):
         defaults = AgentDefaults()
@@ -82,6 +137,17 @@ class TestAgentDefaults:
         assert defaults.compaction.context_window == 128000
         assert defaults.compaction.reserve_tokens_floor == 20000
 
+    def test_compaction_types_share_schema_defaults(self):
+        # The gateway always passed the schema's memory-flush prompts; the
+        # compaction package now uses the same classes, so its defaults match
+        flush = CompactionConfig().memory_flush
+        assert CompactionConfig is type(AgentDefaults().compaction)
+        assert MemoryFlushConfig is type(flush)
+        assert flush.system_prompt == (
+            "Pre-compaction memory flush turn. "
+            "The session is near auto-compaction; capture durable memories to disk."
+        )
+
 
 class TestChannelsConfig:
     def test_all_disabled_by_default(self):
@@ -106,6 +172,15 @@ class TestChannelsConfig:
         assert slack.dm.enabled is True
         assert slack.dm.policy == "open"
 
+    def test_slack_policy_validated(self):
+        channels = ChannelsConfig.model_validate(
+            {"slack": {"group_policy": "allowlist", "dm": {"policy": "allowlist"}}}
+        )
+        assert channels.slack.group_policy == "allowlist"
+        assert channels.slack.dm.policy == "allowlist"
+        with pytest.raises(ValueError):
+            ChannelsConfig.model_validate({"slack": {"group_policy": "everyone"}})
+
 
 class TestExecToolConfig:
     def test_disabled_by_default(self):
@@ -0,0 +1,168 @@
+"""Tests for JSONL session persistence."""
+
+import os
+from pathlib import Path
+
+import orjson
+import pytest
+
+from flowly.session import manager as manager_module
+from flowly.session.manager import Session, SessionManager
+
+
+@pytest.fixture
+def manager(tmp_path: Path, monkeypatch) -> SessionManager:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return SessionManager(tmp_path / "workspace")
+
+
+def _reload(manager: SessionManager, key: str) -> Session:
+    return SessionManager(manager.workspace).get_or_create(key)
+
+
+# ── Persistence ─────────────────────────────────────────────────────
+
+
+class TestSaveAndLoad:
+    def test_round_trip(self, manager: SessionManager):
+        session = manager.get_or_create("telegram:1")
+        session.add_message("user", "merhaba 👋")
+        session.add_message("assistant", "hi", tool_calls=[{"id": 1}])
+        session.metadata["persona"] = "default"
+        manager.save(session)
+
+        loaded = _reload(manager, "telegram:1")
+        assert loaded.messages == session.messages
+        assert loaded.metadata == {"persona": "default"}
+        assert loaded.created_at == session.created_at
+
+    def test_non_string_keys(self, manager: SessionManager):
+        session = manager.get_or_create("cli:1")
+        session.add_message("tool", "ok", scores={1: "a"})
+        manager.save(session)
+        assert _reload(manager, "cli:1").messages[0]["scores"] == {"1": "a"}
+
+    def test_corrupt_lines_are_skipped(self, manager: SessionManager):
+        session = manager.get_or_create("cli:1")
+        session.add_message("user", "one")
+        session.add_message("user", "two")
+        manager.save(session)
+
+        path = manager.sessions_dir / "cli_1.jsonl"
+        lines = path.read_bytes().splitlines()
+        path.write_bytes(b"\n".join([lines[0], b"{broken", b"\xff\xfe", lines[2]]) + b"\n")
+        assert [m["content"] for m in _reload(manager, "cli:1").messages] == ["two"]
+
+    def test_file_layout(self, manager: SessionManager):
+        session = manager.get_or_create("cli:1")
+        session.add_message("user", "one")
+        manager.save(session)
+
+        first, second = (manager.sessions_dir / "cli_1.jsonl").read_bytes().splitlines()
+        assert orjson.loads(first)["_type"] == "metadata"
+        assert orjson.loads(second)["content"] == "one"
+
+
+    def test_session_filename(self, manager: SessionManager):
+        assert manager._get_session_path("telegram:1") == manager.sessions_dir / "telegram_1.jsonl"
+        assert manager_module._session_filename('web:a/b?"c') == "web_a_b__c.jsonl"
+
+
+# ── Appending saves ─────────────────────────────────────────────────
+
+
+class TestAppend:
+    @pytest.fixture
+    def replaces(self, monkeypatch) -> list:
+        calls = []
+        original = manager_module.os.replace
+        monkeypatch.setattr(manager_module.os, "replace", lambda *a: calls.append(a) or original(*a))
+        return calls
+
+    def _saved_session(self, manager: SessionManager) -> Session:
+        session = manager.get_or_create("cli:1")
+        session.add_message("user", "one")
+        manager.save(session)
+        return session
+
+    def test_new_messages_are_appended(self, manager: SessionManager, replaces: list):
+        session = self._saved_session(manager)
+        path = manager.sessions_dir / "cli_1.jsonl"
+        header = path.read_bytes().splitlines()[0]
+
+        session.add_message("assistant", "two")
+        manager.save(session)
+        manager.save(session)
+        session.add_message("user", "three")
+        manager.save(session)
+
+        assert len(replaces) == 1
+        assert path.read_bytes().splitlines()[0] == header
+        assert [m["content"] for m in _reload(manager, "cli:1").messages] == ["one", "two", "three"]
+
+    def test_metadata_change_rewrites(self, manager: SessionManager, replaces: list):
+        session = self._saved_session(manager)
+        session.metadata["persona"] = "pirate"
+        session.add_message("assistant", "arr")
+        manager.save(session)
+
+        assert len(replaces) == 2
+        loaded = _reload(manager, "cli:1")
+        assert loaded.metadata == {"persona": "pirate"}
+        assert len(loaded.messages) == 2
+
+    def test_clear_rewrites(self, manager: SessionManager):
+        session = self._saved_session(manager)
+        session.clear()
+        session.add_message("user", "fresh")
+        manager.save(session)
+        assert [m["content"] for m in _reload(manager, "cli:1").messages] == ["fresh"]
+
+    def test_file_changed_elsewhere_rewrites(self, manager: SessionManager):
+        session = self._saved_session(manager)
+        path = manager.sessions_dir / "cli_1.jsonl"
+        path.write_bytes(path.read_bytes() + b'{"role": "user", "content": "torn')
+
+        session.add_message("assistant", "two")
+        manager.save(session)
+        assert [m["content"] for m in _reload(manager, "cli:1").messages] == ["one", "two"]
+
+    def test_loaded_session_is_rewritten_first(self, manager: SessionManager, replaces: list):
+        self._saved_session(manager)
+        other = SessionManager(manager.workspace)
+        session = other.get_or_create("cli:1")
+        session.add_message("assistant", "two")
+        other.save(session)
+        assert len(replaces) == 2
+
+
+# ── Listing ─────────────────────────────────────────────────────────
+
+
+class TestListSessions:
+    def test_newest_first(self, manager: SessionManager):
+        for key in ["cli:old", "cli:new"]:
+            session = manager.get_or_create(key)
+            session.add_message("user", key)
+            manager.save(session)
+        (manager.sessions_dir / "junk.jsonl").write_text("not json\n")
+
+        assert [s["key"] for s in manager.list_sessions()] == ["cli:new", "cli:old"]
+
+    def test_appended_session_sorts_as_updated(self, manager: SessionManager):
+        sessions = {}
+        for key in ["cli:old", "cli:new"]:
+            sessions[key] = manager.get_or_create(key)
+            sessions[key].add_message("user", key)
+            manager.save(sessions[key])
+
+        path = manager.sessions_dir / "cli_old.jsonl"
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 5))
+        assert [s["key"] for s in manager.list_sessions()] == ["cli:old", "cli:new"]
+
+    def test_delete(self, manager: SessionManager):
+        session = manager.get_or_create("cli:1")
+        manager.save(session)
+        assert manager.delete("cli:1") is True
+        assert manager.delete("cli:1") is False
+        assert manager.list_sessions() == []